@@ -0,0 +1,72 @@
+"""Capture format benchmark
+
+    python benchmarks/bench_capture.py [--targets 100000]
+
+Writes the same TargetResults (five checks each, see bench_results.py)
+as NDJSON and as a binary capture at a few zlib levels, then reads them
+back: json.loads per line against CaptureReader rebuilding results.
+"""
+
+import argparse
+import json
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_results import CHECKS, make_results  # noqa: E402
+from pulse.core.capture import CaptureReader, CaptureWriter  # noqa: E402
+from pulse.output.encoders import get_encoder  # noqa: E402
+
+
+def report(label: str, elapsed: float, count: int, size: int) -> None:
+    print(
+        f"{label:<22} {elapsed:6.2f}s  {count / elapsed:>9,.0f} targets/s  "
+        f"{size / 2**20:6.1f} MiB"
+    )
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = make_results(args.targets * len(CHECKS))
+    count = len(results)
+    encoder = get_encoder()
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "results.ndjson")
+        start = time.perf_counter()
+        with open(path, "wb") as out:
+            for result in results:
+                out.write(encoder.encode_result(result) + b"\n")
+        elapsed = time.perf_counter() - start
+        report(f"write ndjson ({encoder.name})", elapsed, count, os.path.getsize(path))
+
+        start = time.perf_counter()
+        with open(path, "rb") as f:
+            for line in f:
+                json.loads(line)
+        report("read ndjson (dicts)", time.perf_counter() - start, count, os.path.getsize(path))
+
+        for level in (0, 1, 6):
+            path = os.path.join(tmp, f"results-{level}.bin")
+            start = time.perf_counter()
+            with CaptureWriter(path, level=level) as writer:
+                for result in results:
+                    writer.add(result)
+            elapsed = time.perf_counter() - start
+            report(f"write capture level {level}", elapsed, count, os.path.getsize(path))
+
+            start = time.perf_counter()
+            read = sum(1 for _ in CaptureReader(path))
+            assert read == count
+            elapsed = time.perf_counter() - start
+            report(f"read capture level {level}", elapsed, count, os.path.getsize(path))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,79 @@
+"""Run diff benchmark
+
+    python benchmarks/bench_diff.py [--targets 100000] [--slowdown 15]
+
+Writes a baseline run as NDJSON and a current run as a JSON array and
+as a capture (four checks per target, TLS slowed by --slowdown percent),
+then times pulse diff over each pair and reports peak memory.
+"""
+
+import argparse
+import os
+import random
+import resource
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse.core.capture import CaptureWriter  # noqa: E402
+from pulse.core.diff import diff_runs  # noqa: E402
+from pulse.core.result import CheckResult, Status, TargetResult  # noqa: E402
+from pulse.core.target import Target  # noqa: E402
+from pulse.output.encoders import get_encoder  # noqa: E402
+
+
+CHECKS = (("DNS", 5.0), ("TCP", 20.0), ("TLS", 45.0), ("HTTP", 80.0))
+
+
+def make_run(targets: int, seed: int, slowdown: float = 0.0):
+    """One result per target, lognormal latencies around each check's median"""
+    rng = random.Random(seed)
+    for t in range(targets):
+        checks = []
+        for name, median in CHECKS:
+            scale = 1 + slowdown / 100 if name == "TLS" else 1.0
+            checks.append(
+                CheckResult(name, median * scale * rng.lognormvariate(0, 0.3), Status.SUCCESS)
+            )
+        yield TargetResult(target=Target(f"edge{t}.example.com"), checks=checks)
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=100_000)
+    parser.add_argument("--slowdown", type=float, default=15.0)
+    args = parser.parse_args()
+
+    encoder = get_encoder()
+    with tempfile.TemporaryDirectory() as tmp:
+        baseline = os.path.join(tmp, "baseline.ndjson")
+        with open(baseline, "wb") as out:
+            for result in make_run(args.targets, 1):
+                out.write(encoder.encode_result(result) + b"\n")
+        current_json = os.path.join(tmp, "current.json")
+        with open(current_json, "wb") as out:
+            encoder.write_results(make_run(args.targets, 2, args.slowdown), out)
+        current_capture = os.path.join(tmp, "current.pcap")
+        with CaptureWriter(current_capture) as writer:
+            for result in make_run(args.targets, 2, args.slowdown):
+                writer.add(result)
+
+        pairs = (("ndjson vs json", current_json), ("ndjson vs capture", current_capture))
+        for label, current in pairs:
+            start = time.perf_counter()
+            report = diff_runs(baseline, current)
+            elapsed = time.perf_counter() - start
+            flagged = ", ".join(d.check for d in report.regressions) or "none"
+            print(
+                f"{label:<18} {elapsed:6.2f}s  {report.matched / elapsed:>9,.0f} targets/s  "
+                f"regressed: {flagged}"
+            )
+
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024
+    print(f"peak RSS {peak:.0f} MiB")
+
+
+if __name__ == "__main__":
+    main()
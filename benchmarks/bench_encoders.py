@@ -0,0 +1,61 @@
+"""JSON encoder benchmark
+
+    python benchmarks/bench_encoders.py [--targets 100000]
+
+Serializes the same TargetResults (five checks each, see bench_results.py)
+with the old json.dumps(indent=2) over to_dict(), the compact stdlib
+encoder and orjson when it is installed.
+"""
+
+import argparse
+import io
+import json
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from bench_results import CHECKS, make_results  # noqa: E402
+from pulse.output.encoders import get_encoder  # noqa: E402
+
+
+def baseline(results: list) -> bytes:
+    """The pre-encoder JSON path"""
+    data = [r.to_dict() for r in results]
+    return json.dumps(data, indent=2, ensure_ascii=False).encode("utf-8")
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=100_000)
+    args = parser.parse_args()
+
+    results = make_results(args.targets * len(CHECKS))
+
+    def encode(encoder) -> bytes:
+        out = io.BytesIO()
+        encoder.write_results(results, out)
+        return out.getvalue()
+
+    candidates = [("json.dumps(indent=2)", lambda: baseline(results))]
+    for name in ("json", "orjson"):
+        try:
+            encoder = get_encoder(name)
+        except ValueError:
+            print(f"{name:<22} not installed")
+            continue
+        candidates.append((name, lambda encoder=encoder: encode(encoder)))
+
+    for name, run in candidates:
+        start = time.perf_counter()
+        data = run()
+        elapsed = time.perf_counter() - start
+        print(
+            f"{name:<22} {elapsed:6.2f}s  {len(results) / elapsed:>9,.0f} targets/s  "
+            f"{len(data) / 2**20:6.1f} MiB"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""History store benchmark
+
+    python benchmarks/bench_history.py [--targets 50] [--interval 60]
+
+Records a week of synthetic runs (every --interval seconds, four checks
+per target) into a temporary history database, then times the query
+behind "pulse history HOST --checks tls --since 7d".
+"""
+
+import argparse
+import os
+import random
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse.core.history import HistoryStore  # noqa: E402
+from pulse.core.result import CheckResult, Status, TargetResult  # noqa: E402
+from pulse.core.target import Target  # noqa: E402
+
+
+CHECKS = ("DNS", "TCP", "TLS", "HTTP")
+WEEK = 7 * 86400
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--targets", type=int, default=50)
+    parser.add_argument("--interval", type=float, default=60.0)
+    args = parser.parse_args()
+
+    rng = random.Random(1)
+    targets = [Target(f"host{i}.example.com") for i in range(args.targets)]
+    now = time.time()
+    rounds = int(WEEK / args.interval)
+
+    with tempfile.TemporaryDirectory() as tmp:
+        path = os.path.join(tmp, "history.db")
+        store = HistoryStore(path, batch_size=5000)
+
+        start = time.perf_counter()
+        for round_index in range(rounds):
+            ts = now - WEEK + round_index * args.interval
+            for target in targets:
+                checks = [
+                    CheckResult(name, rng.lognormvariate(3, 0.4), Status.SUCCESS, timestamp=ts)
+                    for name in CHECKS
+                ]
+                store.add(TargetResult(target=target, checks=checks, timestamp=ts))
+        store.flush()
+        elapsed = time.perf_counter() - start
+        samples = rounds * len(targets) * len(CHECKS)
+        print(
+            f"record:  {samples:,} samples in {elapsed:.1f}s "
+            f"({samples / elapsed:,.0f} samples/s), "
+            f"{os.path.getsize(path) / 2**20:.0f} MiB"
+        )
+
+        for label, since, by in (("7d p99", WEEK, None), ("7d by 1h", WEEK, 3600.0)):
+            start = time.perf_counter()
+            report = store.query([targets[0].address], ["TLS"], since=since, until=now, by=by)
+            elapsed = (time.perf_counter() - start) * 1000
+            data = report.series[0].to_dict()
+            print(
+                f"query:   {label:<9} {elapsed:6.1f} ms  "
+                f"({data['count']:,} samples, p99 {data['p99_ms']:.1f} ms)"
+            )
+        store.close()
+
+
+if __name__ == "__main__":
+    main()
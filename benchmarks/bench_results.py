@@ -0,0 +1,90 @@
+"""Result object memory and access microbenchmark
+
+    python benchmarks/bench_results.py [--checks 1000000]
+
+Builds CheckResults grouped five per TargetResult, the way a large run
+holds them until output, and reports memory per check, the cost of the
+status properties formatters call repeatedly, and to_dict throughput.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse.core.result import CheckResult, Status, TargetResult  # noqa: E402
+from pulse.core.target import Target  # noqa: E402
+
+
+CHECKS = ("dns", "tcp", "tls", "http", "http2")
+STATUSES = (Status.SUCCESS, Status.SUCCESS, Status.SUCCESS, Status.WARNING, Status.FAILURE)
+
+
+def make_results(count: int) -> list:
+    """count checks as TargetResults of len(CHECKS) checks each"""
+    results = []
+    per_target = len(CHECKS)
+    for t in range(count // per_target):
+        target = Target(f"host{t}.example.com")
+        checks = []
+        for i, name in enumerate(CHECKS):
+            # Only some checks carry metadata, as in real runs
+            metadata = {"ip": f"10.0.{t & 255}.{i}"} if i < 2 else None
+            checks.append(
+                CheckResult(
+                    name=name,
+                    duration_ms=float(t % 97 + i),
+                    status=STATUSES[(t + i) % len(STATUSES)],
+                    details=f"{name} ok",
+                    **({"metadata": metadata} if metadata else {}),
+                )
+            )
+        results.append(TargetResult(target=target, checks=checks))
+    return results
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--checks", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    tracemalloc.start()
+    start = time.perf_counter()
+    results = make_results(args.checks)
+    elapsed = time.perf_counter() - start
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    checks = len(results) * len(CHECKS)
+    print(
+        f"build:   {checks} checks in {elapsed:.2f}s "
+        f"({elapsed / checks * 1e6:.2f} us/check)"
+    )
+    print(
+        f"memory:  {current / 2**20:.0f} MiB total, "
+        f"{current / checks:.0f} bytes/check (incl. targets and lists)"
+    )
+
+    start = time.perf_counter()
+    for _ in range(3):
+        for result in results:
+            result.has_failures
+            result.has_warnings
+            result.is_healthy
+            result.success_count
+            result.warning_count
+            result.failure_count
+    print(f"status:  3 passes of 6 properties in {time.perf_counter() - start:.2f}s")
+
+    sample = results[:20_000]
+    start = time.perf_counter()
+    for result in sample:
+        result.to_dict()
+    elapsed = time.perf_counter() - start
+    print(f"to_dict: {len(sample) / elapsed:,.0f} targets/s")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""Target parser microbenchmark
+
+    python benchmarks/bench_targets.py [--lines 1000000]
+
+Parses a synthetic target list (repeated hostnames, host:port, IPv4 and
+bracketed IPv6 literals, URLs) and reports throughput and memory per
+Target.
+"""
+
+import argparse
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from pulse.core.target import Target  # noqa: E402
+
+
+def make_lines(count: int) -> list:
+    """Synthetic target list with a realistic mix of forms"""
+    forms = (
+        lambda i: f"host{i % 5000}.example.com",
+        lambda i: f"api{i % 200}.example.com:8443",
+        lambda i: f"10.{(i >> 16) & 255}.{(i >> 8) & 255}.{i & 255}:443",
+        lambda i: f"[2001:db8::{i & 0xffff:x}]:443",
+        lambda i: f"https://www{i % 1000}.example.com/health?x={i}",
+    )
+    return [forms[i % len(forms)](i) for i in range(count)]
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--lines", type=int, default=1_000_000)
+    args = parser.parse_args()
+
+    lines = make_lines(args.lines)
+
+    start = time.perf_counter()
+    targets = [Target(line) for line in lines]
+    elapsed = time.perf_counter() - start
+    literals = sum(1 for t in targets if t.is_ip)
+    print(
+        f"parse:   {args.lines} lines in {elapsed:.2f}s "
+        f"({args.lines / elapsed:,.0f} lines/s, {elapsed / args.lines * 1e6:.2f} us/line)"
+    )
+    print(f"         {literals} IP literals skip DNS")
+
+    start = time.perf_counter()
+    for target in targets:
+        target.address
+        target.url
+    first = time.perf_counter() - start
+    start = time.perf_counter()
+    for target in targets:
+        target.address
+        target.url
+    cached = time.perf_counter() - start
+    print(f"address+url: first {first:.2f}s, cached {cached:.2f}s")
+    del targets
+
+    sample = lines[:100_000]
+    tracemalloc.start()
+    kept = [Target(line) for line in sample]
+    current, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    print(f"memory:  {current / len(kept):.0f} bytes/Target (incl. list slot)")
+
+
+if __name__ == "__main__":
+    main()
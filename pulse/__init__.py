@@ -9,20 +9,42 @@ __author__ = "pulse-team"
 
 import argparse
 import asyncio
+import itertools
 import sys
 from pathlib import Path
-from typing import List, Optional
+from typing import AsyncIterator, Iterator, List, Optional, Tuple
 
 from pulse.core.config import Config
 from pulse.core.engine import PulseEngine
 from pulse.core.target import Target
-from pulse.core.result import BenchmarkResult
+from pulse.core.ranges import expand_targets
+from pulse.core.result import TargetResult
+from pulse.core.sources import STDIN, TargetFeed, read_specs
+from pulse.core.inventory import Inventory, load_inventory
+from pulse.core.result import (
+    BenchmarkResult,
+    DiffReport,
+    HistoryReport,
+    ResolverBenchmarkResult,
+    TcpPingResult,
+)
+from pulse.core.history import DEFAULT_PATH as HISTORY_PATH, HistoryStore, parse_duration
+from pulse.core.capture import CaptureReader, CaptureWriter
+from pulse.core.diff import (
+    DEFAULT_ALPHA,
+    DEFAULT_MIN_DELTA_MS,
+    DEFAULT_THRESHOLD,
+    diff_runs,
+)
+from pulse.core.certs import CertificateIndex
 from pulse.output.formatters import OutputFormatter
 from pulse.utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
+DEFAULT_CHECKS = "dns,tcp,tls,http"
+
 
 def create_parser() -> argparse.ArgumentParser:
     """Create and configure argument parser"""
@@ -36,6 +58,14 @@ Examples:
   pulse https://api.github.com --json
   pulse targets.txt --from-file
   pulse google.com cloudflare.com --compare
+  pulse certs -f hosts.txt --expiring 30 --workers 200
+  pulse resolvers example.com --nameservers system,1.1.1.1,auth
+  pulse example.com:443 --tcp-ping 20 --interval 0.2
+  pulse -f hosts.txt --history pulse-history.db
+  pulse history example.com --checks tls --since 7d
+  pulse -f hosts.txt --capture run.pcap -o ndjson
+  pulse render run.pcap -o html -O report.html
+  pulse diff baseline.ndjson current.ndjson --threshold 5 --percentiles 50,99
         """,
         formatter_class=argparse.RawDescriptionHelpFormatter,
     )
@@ -43,13 +73,30 @@ Examples:
     # Target specification
     target_group = parser.add_argument_group("Target Specification")
     target_group.add_argument(
-        "targets", nargs="*", help="Host[:port], URL, or path to file with targets"
+        "targets",
+        nargs="*",
+        help="Host[:port], URL, CIDR/range (10.0.0.0/24:443, host:8000-8100), "
+        "or - to read targets from stdin",
     )
     target_group.add_argument(
         "--from-file",
         "-f",
         action="store_true",
-        help="Read targets from file (one per line)",
+        help="Treat targets as files (one target per line, gzip ok, - for stdin)",
+    )
+    target_group.add_argument(
+        "--inventory",
+        "-i",
+        metavar="FILE",
+        help="JSON/YAML/TOML inventory with per-target or per-group overrides",
+    )
+    target_group.add_argument(
+        "--shuffle",
+        action="store_true",
+        help="Visit expanded CIDR/address/port ranges in pseudo-random order",
+    )
+    target_group.add_argument(
+        "--seed", type=int, help="Seed for --shuffle (default: random)"
     )
     target_group.add_argument(
         "--compare",
@@ -68,7 +115,7 @@ Examples:
     )
     check_group.add_argument(
         "--checks",
-        default="dns,tcp,tls,http",
+        default=DEFAULT_CHECKS,
         help="Comma-separated list of checks to run (default: dns,tcp,tls,http)",
     )
     check_group.add_argument(
@@ -97,19 +144,53 @@ Examples:
         default=True,
         help="Follow HTTP redirects (default: True)",
     )
+    check_group.add_argument(
+        "--all-ips",
+        action="store_true",
+        help="Run TCP/TLS/HTTP against every resolved address (SNI/Host unchanged)",
+    )
+    check_group.add_argument(
+        "--timing",
+        choices=["wall", "kernel"],
+        default="wall",
+        help="Phase timing source: user-space clock or kernel socket timestamps (Linux)",
+    )
+    check_group.add_argument(
+        "--expect-status",
+        metavar="CODES",
+        help="Comma-separated HTTP status codes that count as success, e.g. 200,401",
+    )
+    check_group.add_argument(
+        "--tls-probe-concurrency",
+        type=int,
+        default=8,
+        help="Concurrent TLS version/cipher probes per host in deep mode (default: 8)",
+    )
 
     # Output options
     output_group = parser.add_argument_group("Output Options")
     output_group.add_argument(
         "--format",
         "-o",
-        choices=["terminal", "json", "csv", "html", "markdown", "yaml"],
+        choices=["terminal", "json", "ndjson", "csv", "html", "markdown", "yaml"],
         default="terminal",
-        help="Output format (default: terminal)",
+        help="Output format (default: terminal); ndjson streams one line per target",
     )
     output_group.add_argument(
         "--output", "-O", type=str, help="Output file path (default: stdout)"
     )
+    output_group.add_argument(
+        "--capture",
+        metavar="FILE",
+        help="Also record results into a compact binary capture; "
+        "pulse render FILE re-renders it in any format without probing",
+    )
+    output_group.add_argument(
+        "--summary",
+        action="store_true",
+        help='Wrap JSON/YAML output as {"results": [...], "summary": {...}} with '
+        "run-level metrics from --pipeline/--metrics",
+    )
     output_group.add_argument(
         "--quiet", "-q", action="store_true", help="Suppress non-error output"
     )
@@ -133,12 +214,188 @@ Examples:
         default=10,
         help="Number of concurrent workers (default: 10)",
     )
+    perf_group.add_argument(
+        "--per-target-concurrency",
+        type=int,
+        default=4,
+        help="Concurrent addresses checked per target with --all-ips (default: 4)",
+    )
+    perf_group.add_argument(
+        "--no-share",
+        action="store_true",
+        help="Do not share DNS/TCP/TLS results between targets on the same host",
+    )
+    perf_group.add_argument(
+        "--no-prefetch",
+        action="store_true",
+        help="Do not resolve hostnames ahead of the connection workers",
+    )
+    perf_group.add_argument(
+        "--dns-workers",
+        type=int,
+        default=20,
+        help="Concurrent DNS prefetch lookups (default: 20)",
+    )
+    perf_group.add_argument(
+        "--prefetch-window",
+        type=int,
+        default=0,
+        help="Targets DNS prefetch may run ahead of the workers (default: 4x workers)",
+    )
+    perf_group.add_argument(
+        "--sweep",
+        action="store_true",
+        help="Fast connect-only sweep for --checks tcp (no TCP_INFO, kernel timing or sharing)",
+    )
+    perf_group.add_argument(
+        "--sweep-window",
+        type=int,
+        default=0,
+        help="Connects in flight for the tcp-only sweep (default: from the fd limit)",
+    )
+    perf_group.add_argument(
+        "--pipeline",
+        action="store_true",
+        help="Run checks as dns/connect/tls/http stages with separate worker pools",
+    )
+    perf_group.add_argument(
+        "--stage-workers",
+        metavar="SPEC",
+        help="Per-stage pool sizes for --pipeline, e.g. dns=50,connect=100,http=20",
+    )
+    perf_group.add_argument(
+        "--stage-queue",
+        type=int,
+        default=0,
+        help="Queue size between pipeline stages (default: 2x stage workers)",
+    )
+    perf_group.add_argument(
+        "--batch-size",
+        type=int,
+        default=0,
+        help="Targets pulled from expanded ranges per batch (default: max(1000, 100x workers))",
+    )
+    perf_group.add_argument(
+        "--metrics",
+        action="store_true",
+        help="Sample event-loop lag, executor load, in-flight checks and sockets",
+    )
+    perf_group.add_argument(
+        "--metrics-interval",
+        type=float,
+        default=0.1,
+        help="Seconds between runtime metric samples (default: 0.1)",
+    )
     perf_group.add_argument(
         "--benchmark",
         "-b",
         action="store_true",
         help="Run benchmark mode (10 iterations)",
     )
+    perf_group.add_argument(
+        "--keep-runs",
+        action="store_true",
+        help="Benchmark: keep every run's full check results in the output",
+    )
+
+    # TCP ping
+    ping_group = parser.add_argument_group("TCP Ping")
+    ping_group.add_argument(
+        "--tcp-ping",
+        type=int,
+        default=0,
+        metavar="N",
+        help="Send N bare TCP handshakes per target and report latency/loss",
+    )
+    ping_group.add_argument(
+        "--interval",
+        type=float,
+        default=1.0,
+        help="Seconds between TCP ping probes (default: 1.0)",
+    )
+
+    # Certificate inventory (pulse certs ...)
+    cert_group = parser.add_argument_group("Certificate Inventory (pulse certs)")
+    cert_group.add_argument(
+        "--expiring",
+        type=float,
+        metavar="DAYS",
+        help="Only report certificates expiring within DAYS days",
+    )
+    cert_group.add_argument(
+        "--group-by",
+        choices=["issuer", "san"],
+        help="Group certificates by issuer or subjectAltName",
+    )
+
+    # Resolver benchmark (pulse resolvers ...)
+    resolver_group = parser.add_argument_group("Resolver Benchmark (pulse resolvers)")
+    resolver_group.add_argument(
+        "--nameservers",
+        default="system,auth",
+        help="Comma-separated servers: system, auth, IP or IP:port (default: system,auth)",
+    )
+    resolver_group.add_argument(
+        "--samples",
+        type=int,
+        default=20,
+        help="Queries per name per server (default: 20)",
+    )
+    resolver_group.add_argument(
+        "--record-type", default="A", help="Record type to query (default: A)"
+    )
+
+    # History (record with --history, query with pulse history ...)
+    history_group = parser.add_argument_group("History (pulse history)")
+    history_group.add_argument(
+        "--history",
+        metavar="DB",
+        help="Record results into this SQLite history file; "
+        f"pulse history reads it (default there: {HISTORY_PATH})",
+    )
+    history_group.add_argument(
+        "--since",
+        default="24h",
+        help="History window, e.g. 30m, 12h, 7d (default: 24h)",
+    )
+    history_group.add_argument(
+        "--by", help="Also break the window into buckets of this size, e.g. 1h"
+    )
+    history_group.add_argument(
+        "--retention",
+        type=float,
+        default=7.0,
+        metavar="DAYS",
+        help="Days of raw samples to keep when recording; rollups live longer (default: 7)",
+    )
+
+    # Run comparison (pulse diff BASELINE CURRENT)
+    diff_group = parser.add_argument_group("Run Diff (pulse diff)")
+    diff_group.add_argument(
+        "--percentiles",
+        default="50,99",
+        help="Percentiles compared per check (default: 50,99)",
+    )
+    diff_group.add_argument(
+        "--threshold",
+        type=float,
+        default=DEFAULT_THRESHOLD,
+        metavar="PCT",
+        help=f"Regression: a percentile slower by more than PCT%% (default: {DEFAULT_THRESHOLD:g})",
+    )
+    diff_group.add_argument(
+        "--min-delta",
+        type=float,
+        default=DEFAULT_MIN_DELTA_MS,
+        metavar="MS",
+        help=f"...and by at least MS milliseconds (default: {DEFAULT_MIN_DELTA_MS:g})",
+    )
+    diff_group.add_argument(
+        "--alpha",
+        type=float,
+        default=DEFAULT_ALPHA,
+        help=f"...and Mann-Whitney U significant at this level (default: {DEFAULT_ALPHA:g})",
+    )
 
     # Config
     config_group = parser.add_argument_group("Configuration")
@@ -154,37 +411,192 @@ Examples:
     return parser
 
 
-def load_targets(args) -> List[Target]:
-    """Load targets from arguments or file"""
-    targets = []
+def _target_sources(args) -> Tuple[List[str], List[str]]:
+    """Files to read targets from and targets given inline
 
-    if args.from_file and args.targets:
-        # Read from file
-        file_path = Path(args.targets[0])
-        if file_path.exists():
-            with open(file_path, "r") as f:
-                for line in f:
-                    line = line.strip()
-                    if line and not line.startswith("#"):
-                        targets.append(Target(line))
-        else:
-            logger.error(f"File not found: {file_path}")
-            sys.exit(2)
-    elif args.targets:
-        # Parse from command line
-        for target_str in args.targets:
-            targets.append(Target(target_str))
-    else:
+    With --from-file every positional is a file; otherwise only - (stdin)
+    is read and the rest are target specs.
+    """
+    if not args.targets:
         logger.error("No targets specified")
         sys.exit(2)
 
-    return targets
+    paths = [t for t in args.targets if args.from_file or t == STDIN]
+    specs = [t for t in args.targets if not (args.from_file or t == STDIN)]
+    for path in paths:
+        if path != STDIN and not Path(path).exists():
+            logger.error(f"File not found: {path}")
+            sys.exit(2)
+    return paths, specs
+
+
+def load_targets(args) -> Iterator[Target]:
+    """Load targets from arguments or files
+
+    CIDR blocks and address/port ranges are expanded lazily, so the
+    returned iterator never holds more than one target at a time.
+    """
+    paths, specs = _target_sources(args)
+    return expand_targets(
+        itertools.chain(specs, read_specs(paths)), shuffle=args.shuffle, seed=args.seed
+    )
+
+
+def target_feed(args) -> TargetFeed:
+    """Background reader over the same sources as load_targets"""
+    paths, specs = _target_sources(args)
+    return TargetFeed(paths, specs=specs, shuffle=args.shuffle, seed=args.seed)
+
+
+def load_inventory_targets(args, config: Config) -> Inventory:
+    """Compile --inventory; positional targets join it with default settings"""
+    try:
+        inventory = load_inventory(args.inventory, config)
+    except (OSError, ValueError) as e:
+        logger.error(f"Invalid inventory {args.inventory}: {e}")
+        sys.exit(2)
+
+    for spec in args.targets:
+        inventory.add(spec)
+    if not len(inventory):
+        logger.error("No valid targets to check")
+        sys.exit(2)
+
+    logger.info(
+        f"Inventory: {len(inventory)} entries, {len(inventory.profiles)} settings profiles"
+    )
+    return inventory
+
+
+def _target_exit_code(result: TargetResult) -> int:
+    if result.has_failures:
+        return 2
+    if result.has_warnings:
+        return 1
+    return 0
+
+
+async def _write_ndjson(
+    results: AsyncIterator[TargetResult], formatter: OutputFormatter, path: Optional[str]
+) -> Tuple[int, int]:
+    """Write each result as it completes; returns (count, exit code)"""
+    sys.stdout.flush()
+    out = open(path, "wb") if path else sys.stdout.buffer
+    count = exit_code = 0
+    try:
+        async for result in results:
+            out.write(formatter.encode_line(result) + b"\n")
+            count += 1
+            exit_code = max(exit_code, _target_exit_code(result))
+        if formatter.config.include_summary and formatter.summary:
+            out.write(formatter.encode_line({"summary": formatter.summary}) + b"\n")
+        out.flush()
+    finally:
+        if path:
+            out.close()
+    return count, exit_code
+
+
+async def _recorded(
+    results: AsyncIterator[TargetResult], store: HistoryStore, retention_days: float
+) -> AsyncIterator[TargetResult]:
+    """Pass results through, appending each to the history store"""
+    try:
+        async for result in results:
+            store.add(result)
+            yield result
+    finally:
+        store.flush()
+        store.prune({"raw": retention_days * 86400})
+        store.close()
+
+
+async def _captured(
+    results: AsyncIterator[TargetResult], writer: CaptureWriter, summary: dict
+) -> AsyncIterator[TargetResult]:
+    """Pass results through, appending each to a capture file
+
+    summary is the engine's run summary, filled in as the run ends.
+    """
+    try:
+        async for result in results:
+            writer.add(result)
+            yield result
+    finally:
+        if summary:
+            writer.add_summary(summary)
+        writer.close()
+
+
+def replay_captures(paths: List[str], summary: dict) -> Iterator[TargetResult]:
+    """pulse render: results from each capture in turn, read block by block
+
+    Each capture's run summary is merged into summary once it is read.
+    """
+    for path in paths:
+        reader = CaptureReader(path)
+        yield from reader
+        if reader.summary:
+            summary.update(reader.summary)
+
+
+async def _replayed(results: Iterator[TargetResult]) -> AsyncIterator[TargetResult]:
+    for result in results:
+        yield result
+
+
+def query_history(args, config: Config, targets: List[Target]) -> HistoryReport:
+    """pulse history: stored statistics for the targets"""
+    store = HistoryStore(args.history or HISTORY_PATH, readonly=True)
+    try:
+        # Without an explicit --checks, report every check recorded
+        return store.query(
+            [t.address for t in targets],
+            checks=None if args.checks == DEFAULT_CHECKS else config.checks,
+            since=parse_duration(args.since),
+            by=parse_duration(args.by) if args.by else None,
+        )
+    finally:
+        store.close()
+
+
+def diff_results(args, config: Config) -> DiffReport:
+    """pulse diff: per-check latency changes from a baseline run to the current one"""
+    try:
+        percentiles = [float(q) for q in args.percentiles.split(",") if q.strip()]
+    except ValueError:
+        percentiles = []
+    if not percentiles or not all(0 <= q <= 100 for q in percentiles):
+        raise ValueError(f"Invalid --percentiles '{args.percentiles}' (use e.g. 50,90,99)")
+    baseline, current = args.targets
+    # Without an explicit --checks, compare every check recorded
+    return diff_runs(
+        baseline,
+        current,
+        checks=None if args.checks == DEFAULT_CHECKS else config.checks,
+        percentiles=percentiles,
+        threshold=args.threshold,
+        min_delta_ms=args.min_delta,
+        alpha=args.alpha,
+    )
+
+
+# Sub-commands selected by the first positional argument
+COMMANDS = ("certs", "resolvers", "history", "render", "diff")
+
+# Sub-commands whose positional arguments are files, with their usage
+FILE_COMMANDS = {
+    "render": ("pulse render CAPTURE...", None),
+    "diff": ("pulse diff BASELINE CURRENT", 2),
+}
 
 
 async def main_async():
     """Main async entry point"""
     parser = create_parser()
-    args = parser.parse_args()
+    argv = sys.argv[1:]
+    command = argv[0] if argv and argv[0] in COMMANDS else None
+    args = parser.parse_args(argv[1:] if command else argv)
 
     # Load configuration
     config = Config.from_args(args)
@@ -198,44 +610,141 @@ async def main_async():
             print(f"Configuration saved to {args.save_config}")
         return
 
-    # Load targets
-    targets = load_targets(args)
-
-    if not targets:
-        logger.error("No valid targets to check")
-        sys.exit(2)
+    # Load targets: the normal check mode streams them from a background
+    # reader (or the inventory), every other mode needs the whole list
+    streaming = not (command or args.tcp_ping or args.compare or args.benchmark)
+
+    # --history and --capture record per-target check results; the other
+    # modes produce a single report (pulse history reads --history instead)
+    if not (streaming or command == "render"):
+        mode = f"pulse {command}" if command else (
+            "--tcp-ping" if args.tcp_ping else "--compare" if args.compare else "--benchmark"
+        )
+        for option, value in (("--capture", args.capture), ("--history", args.history)):
+            if value and not (option == "--history" and command == "history"):
+                logger.error(f"{option} cannot be used with {mode}")
+                sys.exit(2)
+
+    inventory = load_inventory_targets(args, config) if args.inventory else None
+    if command in FILE_COMMANDS:
+        # Positional arguments are result files, not targets
+        usage, count = FILE_COMMANDS[command]
+        if not args.targets or (count and len(args.targets) != count):
+            logger.error(f"Usage: {usage}")
+            sys.exit(2)
+    elif inventory is not None:
+        targets = inventory.targets(shuffle=args.shuffle, seed=args.seed)
+        if not streaming:
+            targets = list(targets)
+    elif streaming:
+        feed = target_feed(args)
+    else:
+        targets = list(load_targets(args))
+        if not targets:
+            logger.error("No valid targets to check")
+            sys.exit(2)
 
     # Create engine and run checks
-    engine = PulseEngine(config)
+    engine = PulseEngine(config, inventory)
+    if command == "render":
+        # Replayed results take the normal output path, streamed for ndjson
+        stream = _replayed(replay_captures(args.targets, engine.run_summary))
+    elif streaming:
+        stream = (
+            engine.stream_targets(targets)
+            if inventory is not None
+            else engine.stream_batches(feed.batches(engine.batch_size))
+        )
+    if streaming or command == "render":
+        if args.history:
+            stream = _recorded(stream, HistoryStore(args.history), args.retention)
+        if args.capture:
+            stream = _captured(stream, CaptureWriter(args.capture), engine.run_summary)
 
     try:
-        if args.compare and len(targets) > 1:
+        if command == "certs":
+            # Certificate inventory mode
+            results = await engine.collect_certificates(targets)
+        elif command == "history":
+            # Stored statistics, no probing
+            results = query_history(args, config, targets)
+        elif command == "diff":
+            # Two stored runs, no probing
+            results = diff_results(args, config)
+        elif command == "resolvers":
+            # Nameserver comparison mode
+            results = await engine.benchmark_resolvers(targets)
+        elif args.tcp_ping:
+            # Handshake-only latency and loss
+            results = await engine.tcp_ping(targets)
+        elif args.compare and len(targets) > 1:
             # Compare mode
             results = await engine.compare_targets(targets)
         elif args.benchmark:
             # Benchmark mode
             results = await engine.benchmark(targets[0], iterations=10)
+        elif config.format == "ndjson":
+            # Normal mode (or a replayed capture), streamed end to end: bounded
+            # memory for any input size
+            formatter = OutputFormatter(config)
+            formatter.summary = engine.run_summary
+            count, exit_code = await _write_ndjson(stream, formatter, args.output)
+            if not count:
+                logger.error("No valid targets to check")
+                sys.exit(2)
+            if args.output and not args.quiet:
+                print(f"Results saved to {args.output}", file=sys.stderr)
+            sys.exit(exit_code)
         else:
-            # Normal mode
-            results = await engine.check_targets(targets)
+            # Normal mode, fed batch by batch as targets are read
+            results = [result async for result in stream]
+            if not results:
+                logger.error("No valid targets to check")
+                sys.exit(2)
 
         # Format and output results
         formatter = OutputFormatter(config)
-        output = formatter.format(results)
-
-        if args.output:
-            with open(args.output, "w", encoding="utf-8") as f:
-                f.write(output)
-            if not args.quiet:
-                print(f"Results saved to {args.output}")
-        else:
-            print(output)
+        formatter.write(results, args.output, summary=engine.run_summary or None)
+        if args.output and not args.quiet:
+            print(f"Results saved to {args.output}")
 
         # Exit codes: 0 = all healthy, 1 = warnings, 2 = failures
         exit_code = 0
 
         # Handle different result types
-        if isinstance(results, BenchmarkResult):
+        if isinstance(results, CertificateIndex):
+            # For certificate inventory, expired or unreachable is a failure
+            warn_days = config.cert_expiring_days or 30
+            if results.errors or results.expired():
+                exit_code = 2
+            elif results.expiring_within(warn_days):
+                exit_code = 1
+        elif isinstance(results, ResolverBenchmarkResult):
+            # Unreachable servers fail, timeouts or disagreement warn
+            for server in results.servers:
+                if server.sent and not server.answered:
+                    exit_code = 2
+                    break
+                elif server.timeouts or server.consistency < 100:
+                    exit_code = 1
+        elif isinstance(results, HistoryReport):
+            # Nothing recorded for the targets is an error
+            exit_code = 0 if results.series else 2
+        elif isinstance(results, DiffReport):
+            # New failures (or no targets in common) exit 2, latency regressions 1
+            if results.new_failures or not results.matched:
+                exit_code = 2
+            elif results.regressions:
+                exit_code = 1
+        elif isinstance(results, TcpPingResult):
+            # No handshake at all fails; partial loss or errors warn
+            for series in results.targets:
+                if series.sent and not series.received:
+                    exit_code = 2
+                    break
+                elif series.loss > 0 or series.errors:
+                    exit_code = 1
+        elif isinstance(results, BenchmarkResult):
             # For benchmark, check success rate
             if results.success_rate < 50:
                 exit_code = 2
@@ -243,12 +752,7 @@ async def main_async():
                 exit_code = 1
         elif isinstance(results, list):
             # For list of TargetResult
-            for result in results:
-                if result.has_failures:
-                    exit_code = 2
-                    break
-                elif result.has_warnings:
-                    exit_code = 1
+            exit_code = max((_target_exit_code(r) for r in results), default=0)
         else:
             # Single TargetResult
             if results.has_failures:
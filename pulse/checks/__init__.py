@@ -1,7 +1,7 @@
 """Base checker class"""
 
 from abc import ABC, abstractmethod
-from typing import Any
+from typing import Any, Tuple
 
 from ..core.target import Target
 from ..core.result import CheckResult
@@ -12,6 +12,12 @@ class BaseChecker(ABC):
 
     name = "base"
 
+    # Checks (engine keys) that must finish before this one starts
+    depends_on: Tuple[str, ...] = ()
+
+    # Whether a failure makes every dependent check pointless
+    critical = False
+
     def __init__(self, config: Any):
         self.config = config
 
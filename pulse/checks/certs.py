@@ -0,0 +1,138 @@
+"""Handshake-only certificate collection"""
+
+import asyncio
+import ssl
+import time
+import warnings
+from typing import Optional
+
+from . import BaseChecker
+from ..core.certs import CertificateIndex
+from ..core.target import Target
+from ..core.result import CheckResult, Status
+from ..utils.logger import get_logger
+from ..utils.x509 import CertificateParseError
+
+
+logger = get_logger(__name__)
+
+
+class CertChecker(BaseChecker):
+    """Collect the peer certificate with a bare TLS handshake
+
+    Verification is disabled so that expired, self-signed and mismatched
+    certificates are still inventoried. No HTTP request is sent.
+    """
+
+    name = "CERT"
+    depends_on = ("tcp",)
+
+    # Days before expiry that turn the result into a warning
+    EXPIRY_WARNING_DAYS = 30
+
+    def __init__(self, config, index: Optional[CertificateIndex] = None):
+        super().__init__(config)
+        self.index = index if index is not None else CertificateIndex()
+        self._context = self._create_context()
+
+    @staticmethod
+    def _create_context() -> ssl.SSLContext:
+        """One shared client context, accepting any certificate"""
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+        try:
+            # Legacy servers still need an inventory entry
+            with warnings.catch_warnings():
+                warnings.simplefilter("ignore", DeprecationWarning)
+                context.minimum_version = ssl.TLSVersion.TLSv1
+            context.set_ciphers("ALL:@SECLEVEL=0")
+        except (ValueError, ssl.SSLError):
+            pass
+        return context
+
+    async def fetch_certificate(self, target: Target) -> bytes:
+        """Handshake with target and return the DER peer certificate"""
+        _, writer = await asyncio.wait_for(
+            asyncio.open_connection(
+                target.connect_host,
+                target.port,
+                ssl=self._context,
+                server_hostname=target.host,
+            ),
+            timeout=self.config.timeout,
+        )
+
+        try:
+            der = writer.get_extra_info("ssl_object").getpeercert(binary_form=True)
+        finally:
+            writer.close()
+
+        if not der:
+            raise ssl.SSLError("Server sent no certificate")
+
+        return der
+
+    async def check(self, target: Target) -> CheckResult:
+        """Fetch, de-duplicate and index the certificate for target"""
+        start_time = time.time()
+
+        try:
+            der = await self.fetch_certificate(target)
+            duration = (time.time() - start_time) * 1000
+            info = self.index.add(der, target.address)
+        except asyncio.TimeoutError:
+            duration = (time.time() - start_time) * 1000
+            error = f"Timeout after {self.config.timeout}s"
+            self.index.add_error(target.address, error)
+            return CheckResult(
+                name=self.name,
+                duration_ms=duration,
+                status=Status.FAILURE,
+                details="Handshake timeout",
+                error=error,
+            )
+        except CertificateParseError as e:
+            duration = (time.time() - start_time) * 1000
+            self.index.add_error(target.address, str(e))
+            return CheckResult(
+                name=self.name,
+                duration_ms=duration,
+                status=Status.FAILURE,
+                details="Unparseable certificate",
+                error=str(e),
+            )
+        except Exception as e:
+            duration = (time.time() - start_time) * 1000
+            self.index.add_error(target.address, str(e))
+            return CheckResult(
+                name=self.name,
+                duration_ms=duration,
+                status=Status.FAILURE,
+                details="Handshake failed",
+                error=str(e),
+            )
+
+        days = info.days_until_expiry()
+
+        if days < 0:
+            status = Status.FAILURE
+            details = f"→ {info.common_name} (EXPIRED {-days} days ago)"
+        elif days < self.EXPIRY_WARNING_DAYS:
+            status = Status.WARNING
+            details = f"→ {info.common_name} (expires in {days} days)"
+        else:
+            status = Status.SUCCESS
+            details = f"→ {info.common_name} (expires in {days} days)"
+
+        return CheckResult(
+            name=self.name,
+            duration_ms=duration,
+            status=status,
+            details=details,
+            metadata={
+                "fingerprint": info.fingerprint,
+                "issuer": info.issuer_name,
+                "days_until_expiry": days,
+            },
+        )
@@ -3,7 +3,7 @@
 import asyncio
 import socket
 import time
-from typing import List, Optional
+from typing import Any, Dict, List, Optional
 
 from . import BaseChecker
 from ..core.target import Target
@@ -18,9 +18,48 @@ class DNSChecker(BaseChecker):
     """Check DNS resolution"""
 
     name = "DNS"
+    critical = True
+
+    # Record types collected in deep mode
+    RECORD_TYPES = ["A", "AAAA", "MX", "NS", "TXT", "CAA", "SOA"]
+
+    # One async resolver (and one resolv.conf read) per process
+    _resolver: Any = None
+
+    @classmethod
+    def get_resolver(cls):
+        """Shared dnspython async resolver, or None if dnspython is missing"""
+        if cls._resolver is None:
+            try:
+                import dns.asyncresolver
+            except ImportError:
+                logger.debug("dnspython not available for advanced DNS checks")
+                return None
+            cls._resolver = dns.asyncresolver.Resolver()
+        return cls._resolver
+
+    def _literal(self, target: Target) -> CheckResult:
+        """IP literals resolve to themselves without a lookup"""
+        ipv6 = ":" in target.host
+        return CheckResult(
+            name=self.name,
+            duration_ms=0.0,
+            status=Status.SUCCESS,
+            details=f"→ {target.host} ({'IPv6' if ipv6 else 'IPv4'} literal)",
+            metadata={
+                "ips": [target.host],
+                "ipv4_count": 0 if ipv6 else 1,
+                "ipv6_count": 1 if ipv6 else 0,
+                "primary_ip": target.host,
+                "literal": True,
+            },
+        )
 
     async def check(self, target: Target) -> CheckResult:
         """Resolve DNS for target"""
+        if target.is_ip:
+            return self._literal(target)
+
         start_time = time.time()
 
         try:
@@ -49,8 +88,9 @@ class DNSChecker(BaseChecker):
                     error="Empty DNS response",
                 )
 
-            # Extract unique IPs
-            ips = list(set([addr[4][0] for addr in addrs]))
+            # Extract unique IPs, keeping getaddrinfo's (RFC 6724) order
+            # so primary_ip is stable
+            ips = list(dict.fromkeys(addr[4][0] for addr in addrs))
 
             # Determine IP version preference
             ipv4_ips = [str(ip) for ip in ips if "." in str(ip)]
@@ -70,17 +110,27 @@ class DNSChecker(BaseChecker):
             if len(ips) > 1:
                 details += f" +{len(ips) - 1} more"
 
+            metadata: Dict[str, Any] = {
+                "ips": ips,
+                "ipv4_count": len(ipv4_ips),
+                "ipv6_count": len(ipv6_ips),
+                "primary_ip": primary_ip,
+            }
+
+            # Collect the full record set in deep mode
+            if self.config.deep_mode:
+                records = await self.collect_records(target.host)
+                if records:
+                    metadata["records"] = records
+                    if records["CNAME"]["records"]:
+                        details += f" via {records['CNAME']['records'][-1]}"
+
             return CheckResult(
                 name=self.name,
                 duration_ms=duration,
                 status=Status.SUCCESS,
                 details=details,
-                metadata={
-                    "ips": ips,
-                    "ipv4_count": len(ipv4_ips),
-                    "ipv6_count": len(ipv6_ips),
-                    "primary_ip": primary_ip,
-                },
+                metadata=metadata,
             )
 
         except socket.gaierror as e:
@@ -102,17 +152,87 @@ class DNSChecker(BaseChecker):
                 error=str(e),
             )
 
-    async def get_dns_records(self, host: str, record_type: str = "A") -> List[str]:
-        """Get specific DNS records"""
+    async def _query(self, host: str, record_type: str) -> Dict[str, Any]:
+        """Query one record type, recording latency and TTL"""
+        import dns.exception
+        import dns.rdatatype
+        import dns.resolver
+
+        resolver = self.get_resolver()
+        start_time = time.time()
         try:
-            import dns.resolver
+            answer = await resolver.resolve(
+                host, record_type, raise_on_no_answer=False, lifetime=self.config.timeout
+            )
+            latency = (time.time() - start_time) * 1000
+        except (dns.resolver.NXDOMAIN, dns.resolver.NoNameservers) as e:
+            return {
+                "records": [],
+                "ttl": None,
+                "latency_ms": round((time.time() - start_time) * 1000, 2),
+                "error": str(e),
+            }
+        except dns.exception.Timeout:
+            return {
+                "records": [],
+                "ttl": None,
+                "latency_ms": round((time.time() - start_time) * 1000, 2),
+                "error": f"Timeout after {self.config.timeout}s",
+            }
+
+        rrset = answer.rrset
+        result: Dict[str, Any] = {
+            "records": [str(rdata) for rdata in rrset] if rrset else [],
+            "ttl": rrset.ttl if rrset else None,
+            "latency_ms": round(latency, 2),
+        }
+
+        # The CNAME chain comes for free with the A answer
+        if record_type == "A":
+            chain = [
+                rrset
+                for rrset in answer.response.answer
+                if rrset.rdtype == dns.rdatatype.CNAME
+            ]
+            result["cname"] = {
+                "records": [str(rdata.target).rstrip(".") for rrset in chain for rdata in rrset],
+                "ttl": min((rrset.ttl for rrset in chain), default=None),
+                "latency_ms": result["latency_ms"],
+            }
+
+        return result
+
+    async def collect_records(self, host: str) -> Dict[str, Dict[str, Any]]:
+        """Fetch all RECORD_TYPES for host concurrently"""
+        if self.get_resolver() is None:
+            return {}
+
+        results = await asyncio.gather(
+            *(self._query(host, rtype) for rtype in self.RECORD_TYPES),
+            return_exceptions=True,
+        )
+
+        records: Dict[str, Dict[str, Any]] = {}
+        for rtype, result in zip(self.RECORD_TYPES, results):
+            if isinstance(result, Exception):
+                logger.debug(f"DNS {rtype} query failed: {result}")
+                result = {"records": [], "ttl": None, "latency_ms": None, "error": str(result)}
+            records[rtype] = result
+
+        records["CNAME"] = records["A"].pop(
+            "cname", {"records": [], "ttl": None, "latency_ms": records["A"]["latency_ms"]}
+        )
+
+        return records
 
-            resolver = dns.resolver.Resolver()
-            answers = resolver.resolve(host, record_type)
-            return [str(rdata) for rdata in answers]
-        except ImportError:
-            logger.debug("dnspython not available for advanced DNS checks")
+    async def get_dns_records(self, host: str, record_type: str = "A") -> List[str]:
+        """Get specific DNS records"""
+        if self.get_resolver() is None:
             return []
+
+        try:
+            result = await self._query(host, record_type)
+            return result["records"]
         except Exception as e:
             logger.debug(f"DNS query failed: {e}")
             return []
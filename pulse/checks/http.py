@@ -2,6 +2,7 @@
 
 import asyncio
 import http.client
+import socket
 import time
 from typing import Dict, Any, Optional
 from urllib.parse import urlparse
@@ -9,7 +10,9 @@ from urllib.parse import urlparse
 from . import BaseChecker
 from ..core.target import Target
 from ..core.result import CheckResult, Status
+from ..utils import timestamps
 from ..utils.logger import get_logger
+from ..utils.tcpinfo import probe_socket, read_tcp_info
 
 
 logger = get_logger(__name__)
@@ -19,6 +22,7 @@ class HTTPChecker(BaseChecker):
     """Check HTTP/HTTPS connectivity"""
 
     name = "HTTP"
+    depends_on = ("tcp",)
 
     # HTTP status categories
     STATUS_CATEGORIES = {
@@ -37,6 +41,13 @@ class HTTPChecker(BaseChecker):
         start_time = time.time()
         self.redirect_history = []
 
+        # The ALPN probe uses its own connection, so run it alongside the request
+        http2_probe = (
+            asyncio.ensure_future(self._check_http2(target))
+            if self.config.check_http2
+            else None
+        )
+
         try:
             loop = asyncio.get_event_loop()
 
@@ -46,16 +57,22 @@ class HTTPChecker(BaseChecker):
 
             # Make HTTP request
             def do_http_check():
-                if target.use_tls:
-                    conn = http.client.HTTPSConnection(
-                        target.host, target.port, timeout=self.config.timeout
-                    )
-                else:
-                    conn = http.client.HTTPConnection(
-                        target.host, target.port, timeout=self.config.timeout
-                    )
+                conn = self._create_connection(target)
+                probe = None
 
                 try:
+                    conn.connect()
+                    probe = probe_socket(conn.sock)
+                    tcp_connect = read_tcp_info(probe) if probe else None
+
+                    # TLS records hide the plaintext socket, so only plain
+                    # HTTP gets a kernel-stamped time to first byte
+                    stamped = (
+                        self.config.timing == "kernel"
+                        and not target.use_tls
+                        and timestamps.enable(conn.sock)
+                    )
+
                     headers = {
                         "User-Agent": "pulse-network-diagnostics/2.0",
                         "Accept": "*/*",
@@ -64,6 +81,14 @@ class HTTPChecker(BaseChecker):
                     }
 
                     conn.request("GET", target.path, headers=headers)
+
+                    kernel_ttfb = None
+                    if stamped:
+                        sent = timestamps.tx_timestamps(conn.sock)
+                        first_byte = timestamps.peek_rx_timestamp(conn.sock)
+                        if sent and first_byte:
+                            kernel_ttfb = (first_byte - sent[0]) * 1000
+
                     response = conn.getresponse()
 
                     result = {
@@ -71,8 +96,15 @@ class HTTPChecker(BaseChecker):
                         "reason": response.reason,
                         "headers": dict(response.headers),
                         "body_length": len(response.read()),
+                        "kernel_ttfb_ms": kernel_ttfb,
                     }
 
+                    if tcp_connect:
+                        result["tcp_info"] = {
+                            "connect": tcp_connect,
+                            "response": read_tcp_info(probe),
+                        }
+
                     # Check for redirects
                     if self.config.follow_redirects and response.status in [
                         301,
@@ -88,15 +120,29 @@ class HTTPChecker(BaseChecker):
 
                 finally:
                     conn.close()
+                    if probe is not None:
+                        probe.close()
 
             http_info = await loop.run_in_executor(None, do_http_check)
             duration = (time.time() - start_time) * 1000
 
+            wall_ms = duration
+            timing_source = "wall"
+            if http_info.get("kernel_ttfb_ms") is not None:
+                duration = http_info["kernel_ttfb_ms"]
+                timing_source = "kernel"
+
             status_code = http_info["status"]
             reason = http_info["reason"]
 
             # Determine status
-            if status_code in self.STATUS_CATEGORIES["success"]:
+            if self.config.expect_status:
+                expected = status_code in self.config.expect_status
+                check_status = Status.SUCCESS if expected else Status.FAILURE
+                details = f"→ GET {target.path} → {status_code} {reason}"
+                if not expected:
+                    details += f" (expected {','.join(map(str, self.config.expect_status))})"
+            elif status_code in self.STATUS_CATEGORIES["success"]:
                 check_status = Status.SUCCESS
                 details = f"→ GET {target.path} → {status_code} {reason}"
             elif status_code in self.STATUS_CATEGORIES["redirect"]:
@@ -112,8 +158,8 @@ class HTTPChecker(BaseChecker):
                 details = f"→ GET {target.path} → {status_code} {reason}"
 
             # Check HTTP/2 if requested
-            if self.config.check_http2:
-                http2_supported = await self._check_http2(target)
+            if http2_probe is not None:
+                http2_supported = await http2_probe
                 if http2_supported:
                     details += " [HTTP/2]"
                 else:
@@ -125,7 +171,12 @@ class HTTPChecker(BaseChecker):
                 "reason": reason,
                 "path": target.path,
                 "response_size": http_info.get("body_length", 0),
+                "timing_source": timing_source,
             }
+            if timing_source != "wall":
+                metadata["wall_ms"] = round(wall_ms, 3)
+            if http_info.get("tcp_info"):
+                metadata["tcp_info"] = http_info["tcp_info"]
 
             # Add response headers in deep mode
             if self.config.deep_mode:
@@ -156,6 +207,8 @@ class HTTPChecker(BaseChecker):
 
         except Exception as e:
             duration = (time.time() - start_time) * 1000
+            if http2_probe is not None:
+                http2_probe.cancel()
             return CheckResult(
                 name=self.name,
                 duration_ms=duration,
@@ -164,11 +217,31 @@ class HTTPChecker(BaseChecker):
                 error=str(e),
             )
 
+    def _create_connection(self, target: Target) -> http.client.HTTPConnection:
+        """HTTP(S) connection for target, pinned to target.ip when set
+
+        The Host header and SNI come from target.host either way.
+        """
+        if target.use_tls:
+            conn = http.client.HTTPSConnection(
+                target.host, target.port, timeout=self.config.timeout
+            )
+        else:
+            conn = http.client.HTTPConnection(
+                target.host, target.port, timeout=self.config.timeout
+            )
+
+        if target.ip:
+            conn._create_connection = lambda address, *args, **kwargs: (
+                socket.create_connection((target.ip, address[1]), *args, **kwargs)
+            )
+
+        return conn
+
     async def _check_http2(self, target: Target) -> bool:
         """Check if HTTP/2 is supported"""
         try:
             import ssl
-            import socket
 
             loop = asyncio.get_event_loop()
 
@@ -176,7 +249,7 @@ class HTTPChecker(BaseChecker):
                 context = ssl.create_default_context()
                 context.set_alpn_protocols(["h2", "http/1.1"])
 
-                sock = socket.create_connection((target.host, target.port), timeout=5.0)
+                sock = socket.create_connection((target.connect_host, target.port), timeout=5.0)
 
                 try:
                     with context.wrap_socket(
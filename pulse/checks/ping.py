@@ -0,0 +1,101 @@
+"""TCP ping: repeated handshakes at a steady rate"""
+
+import asyncio
+import socket
+import time
+from typing import List, Optional, Tuple
+
+from ..core.result import PingSeries, TcpPingResult
+from ..core.target import Target
+from ..utils.logger import get_logger
+from ..utils.tcpinfo import read_tcp_info
+
+
+logger = get_logger(__name__)
+
+
+class TCPPing:
+    """Measure path quality with bare TCP handshakes
+
+    Probes are launched from an absolute schedule (start + seq * interval),
+    so a slow or lost probe never delays the next one and the send rate
+    stays constant. Each probe opens a connection and closes it right after
+    the handshake; no raw-socket privileges are needed.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+    async def _resolve(self, target: Target) -> Tuple[int, tuple]:
+        """Resolve once up front so probes time only the handshake"""
+        loop = asyncio.get_running_loop()
+        infos = await loop.getaddrinfo(
+            target.connect_host, target.port, type=socket.SOCK_STREAM
+        )
+        preferred = socket.AF_INET6 if self.config.prefer_ipv6 else socket.AF_INET
+        for family, _, _, _, sockaddr in infos:
+            if family == preferred:
+                return family, sockaddr
+        family, _, _, _, sockaddr = infos[0]
+        return family, sockaddr
+
+    async def _probe(
+        self, family: int, sockaddr: tuple
+    ) -> Tuple[Optional[float], Optional[str]]:
+        """One handshake, return (rtt_ms, error)"""
+        loop = asyncio.get_running_loop()
+        sock = socket.socket(family, socket.SOCK_STREAM)
+        sock.setblocking(False)
+        start_time = time.perf_counter()
+        try:
+            await asyncio.wait_for(loop.sock_connect(sock, sockaddr), self.config.timeout)
+            rtt = (time.perf_counter() - start_time) * 1000
+            if self.config.timing == "kernel":
+                tcp_info = read_tcp_info(sock)
+                if tcp_info and tcp_info["rtt_ms"]:
+                    rtt = tcp_info["rtt_ms"]
+            return rtt, None
+        except asyncio.TimeoutError:
+            return None, "timeout"
+        except OSError as e:
+            return None, e.strerror or str(e)
+        finally:
+            sock.close()
+
+    async def ping(self, target: Target, count: int, interval: float) -> PingSeries:
+        """Send count probes to target, interval seconds apart"""
+        series = PingSeries(target=str(target), address=target.connect_host, port=target.port)
+
+        try:
+            family, sockaddr = await self._resolve(target)
+        except OSError as e:
+            logger.debug(f"Could not resolve {target}: {e}")
+            series.samples = [None] * count
+            series.sent_at = [i * interval * 1000 for i in range(count)]
+            series.errors = count
+            return series
+        series.address = sockaddr[0]
+
+        loop = asyncio.get_running_loop()
+        start = loop.time()
+        probes: List[asyncio.Future] = []
+        for seq in range(count):
+            delay = start + seq * interval - loop.time()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            series.sent_at.append((loop.time() - start) * 1000)
+            probes.append(asyncio.ensure_future(self._probe(family, sockaddr)))
+
+        for rtt, error in await asyncio.gather(*probes):
+            series.samples.append(rtt)
+            if error == "timeout":
+                series.timeouts += 1
+            elif error:
+                series.errors += 1
+
+        return series
+
+    async def run(self, targets: List[Target], count: int, interval: float) -> TcpPingResult:
+        """Ping every target concurrently"""
+        series = await asyncio.gather(*(self.ping(t, count, interval) for t in targets))
+        return TcpPingResult(count=count, interval=interval, targets=list(series))
@@ -0,0 +1,180 @@
+"""Nameserver comparison and resolver benchmarking"""
+
+import asyncio
+import time
+from collections import Counter
+from typing import Dict, List, Optional, Tuple
+
+from .dns import DNSChecker
+from ..core.result import NameserverStats, ResolverBenchmarkResult
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+class NameserverBenchmark:
+    """Send identical queries to several nameservers and compare them
+
+    Server specs are ``system`` (the local stub resolver configuration),
+    ``auth`` (the authoritative servers of each queried zone) or explicit
+    ``IP``/``IP:port``/``[IPv6]:port`` addresses.
+    """
+
+    def __init__(self, config):
+        self.config = config
+
+    @staticmethod
+    def parse_server(spec: str) -> Tuple[str, int]:
+        """Split an explicit server spec into (address, port)"""
+        spec = spec.strip()
+        if spec.startswith("["):
+            address, _, rest = spec[1:].partition("]")
+            port = int(rest[1:]) if rest.startswith(":") else 53
+            return address, port
+        if spec.count(":") == 1:
+            address, port = spec.split(":")
+            return address, int(port)
+        return spec, 53
+
+    async def _authoritative_servers(self, host: str) -> List[Tuple[str, str, int]]:
+        """Find the zone for host and resolve its NS names to addresses"""
+        resolver = DNSChecker.get_resolver()
+        labels = host.rstrip(".").split(".")
+
+        for i in range(len(labels) - 1):
+            zone = ".".join(labels[i:])
+            try:
+                answer = await resolver.resolve(zone, "NS", raise_on_no_answer=False)
+            except Exception as e:
+                logger.debug(f"NS lookup for {zone} failed: {e}")
+                continue
+            if not answer.rrset:
+                continue
+
+            servers = []
+            for rdata in answer.rrset:
+                ns_name = str(rdata.target).rstrip(".")
+                try:
+                    addrs = await resolver.resolve(ns_name, "A")
+                except Exception as e:
+                    logger.debug(f"Could not resolve nameserver {ns_name}: {e}")
+                    continue
+                servers.extend((f"auth:{ns_name}", str(a), 53) for a in addrs)
+            return servers
+
+        return []
+
+    async def resolve_servers(
+        self, specs: List[str], hosts: List[str]
+    ) -> List[Tuple[str, str, int]]:
+        """Expand server specs into (label, address, port) tuples"""
+        servers: List[Tuple[str, str, int]] = []
+
+        for spec in specs:
+            spec = spec.strip()
+            if not spec:
+                continue
+            if spec == "system":
+                resolver = DNSChecker.get_resolver()
+                servers.extend(
+                    (f"system:{ns}", ns, resolver.port) for ns in resolver.nameservers
+                )
+            elif spec == "auth":
+                seen = set()
+                for host in hosts:
+                    for server in await self._authoritative_servers(host):
+                        if server not in seen:
+                            seen.add(server)
+                            servers.append(server)
+            else:
+                address, port = self.parse_server(spec)
+                servers.append((spec, address, port))
+
+        return servers
+
+    async def _query(
+        self, host: str, record_type: str, address: str, port: int
+    ) -> Tuple[Optional[float], Optional[Tuple[str, ...]], Optional[str]]:
+        """Send one query, return (latency_ms, answer, error)"""
+        import dns.asyncquery
+        import dns.exception
+        import dns.message
+
+        query = dns.message.make_query(host, record_type)
+        start_time = time.perf_counter()
+        try:
+            response = await dns.asyncquery.udp(
+                query, address, timeout=self.config.timeout, port=port
+            )
+        except dns.exception.Timeout:
+            return None, None, "timeout"
+        except Exception as e:
+            return None, None, str(e)
+
+        latency = (time.perf_counter() - start_time) * 1000
+        answer = tuple(
+            sorted(
+                str(rdata)
+                for rrset in response.answer
+                if rrset.rdtype == query.question[0].rdtype
+                for rdata in rrset
+            )
+        )
+        return latency, answer, None
+
+    async def run(
+        self,
+        hosts: List[str],
+        specs: List[str],
+        samples: int = 20,
+        record_type: str = "A",
+    ) -> ResolverBenchmarkResult:
+        """Benchmark every server with samples queries per host"""
+        if DNSChecker.get_resolver() is None:
+            raise RuntimeError("Resolver benchmark requires dnspython (pip install dnspython)")
+
+        servers = await self.resolve_servers(specs, hosts)
+        stats = [NameserverStats(label, address, port) for label, address, port in servers]
+        answers: List[List[Tuple[str, Tuple[str, ...]]]] = [[] for _ in servers]
+        semaphores = [asyncio.Semaphore(self.config.workers) for _ in servers]
+
+        async def sample(index: int, host: str) -> None:
+            server = stats[index]
+            async with semaphores[index]:
+                latency, answer, error = await self._query(
+                    host, record_type, server.address, server.port
+                )
+            server.sent += 1
+            if error == "timeout":
+                server.timeouts += 1
+            elif error:
+                server.errors += 1
+            else:
+                server.latencies_ms.append(latency)
+                answers[index].append((host, answer))
+
+        # Interleave so every server sees the same query at the same moment
+        tasks = [
+            sample(index, host)
+            for _ in range(samples)
+            for host in hosts
+            for index in range(len(stats))
+        ]
+        await asyncio.gather(*tasks)
+
+        # Majority answer per host across all servers and samples
+        counts: Dict[str, Counter] = {}
+        for server_answers in answers:
+            for host, answer in server_answers:
+                counts.setdefault(host, Counter())[answer] += 1
+        majority = {host: c.most_common(1)[0][0] for host, c in counts.items()}
+
+        for server, server_answers in zip(stats, answers):
+            server.consistent = sum(
+                1 for host, answer in server_answers if majority.get(host) == answer
+            )
+
+        return ResolverBenchmarkResult(
+            queries=hosts, record_type=record_type, samples=samples, servers=stats
+        )
@@ -8,6 +8,7 @@ from . import BaseChecker
 from ..core.target import Target
 from ..core.result import CheckResult, Status
 from ..utils.logger import get_logger
+from ..utils.tcpinfo import read_tcp_info
 
 
 logger = get_logger(__name__)
@@ -17,6 +18,8 @@ class TCPChecker(BaseChecker):
     """Check TCP connectivity"""
 
     name = "TCP"
+    depends_on = ("dns",)
+    critical = True
 
     async def check(self, target: Target) -> CheckResult:
         """Check TCP connection to target"""
@@ -29,13 +32,22 @@ class TCPChecker(BaseChecker):
             sock = await loop.run_in_executor(
                 None,
                 lambda: socket.create_connection(
-                    (target.host, target.port), timeout=self.config.timeout
+                    (target.connect_host, target.port), timeout=self.config.timeout
                 ),
             )
 
             duration = (time.time() - start_time) * 1000
+            tcp_info = read_tcp_info(sock)
             sock.close()
 
+            # The SYN is never stamped; the kernel's handshake RTT sample is
+            # the loop-independent equivalent
+            wall_ms = duration
+            timing_source = "wall"
+            if self.config.timing == "kernel" and tcp_info and tcp_info["rtt_ms"]:
+                duration = tcp_info["rtt_ms"]
+                timing_source = "kernel"
+
             # Determine connection quality
             if duration < 50:
                 quality = "fast"
@@ -44,16 +56,25 @@ class TCPChecker(BaseChecker):
             else:
                 quality = "slow"
 
+            metadata = {
+                "host": target.host,
+                "port": target.port,
+                "quality": quality,
+                "timing_source": timing_source,
+            }
+            if timing_source != "wall":
+                metadata["wall_ms"] = round(wall_ms, 3)
+            if target.ip:
+                metadata["ip"] = target.ip
+            if tcp_info:
+                metadata["tcp_info"] = tcp_info
+
             return CheckResult(
                 name=self.name,
                 duration_ms=duration,
                 status=Status.SUCCESS,
                 details=f"Connected ({quality})",
-                metadata={
-                    "host": target.host,
-                    "port": target.port,
-                    "quality": quality,
-                },
+                metadata=metadata,
             )
 
         except socket.timeout:
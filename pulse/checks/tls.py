@@ -4,22 +4,34 @@ import asyncio
 import ssl
 import socket
 import time
+import warnings
 from datetime import datetime
-from typing import Dict, Any, Optional
+from functools import lru_cache
+from typing import Dict, Any, List, Optional, Tuple
 
 from . import BaseChecker
 from ..core.target import Target
 from ..core.result import CheckResult, Status
+from ..utils import timestamps
 from ..utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
 
+@lru_cache(maxsize=1)
+def _local_ciphers() -> Tuple[dict, ...]:
+    """Every cipher suite the local OpenSSL can offer"""
+    context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+    context.set_ciphers("ALL:@SECLEVEL=0")
+    return tuple(context.get_ciphers())
+
+
 class TLSChecker(BaseChecker):
     """Check TLS/SSL connectivity and certificate"""
 
     name = "TLS"
+    depends_on = ("tcp",)
 
     # TLS version ratings
     TLS_VERSIONS = {
@@ -31,6 +43,24 @@ class TLSChecker(BaseChecker):
         "SSLv2": ("critical", 3),
     }
 
+    # Protocol versions probed in deep mode, newest first
+    PROBE_VERSIONS = [
+        ("TLSv1.3", "TLSv1_3"),
+        ("TLSv1.2", "TLSv1_2"),
+        ("TLSv1.1", "TLSv1_1"),
+        ("TLSv1", "TLSv1"),
+    ]
+
+    # OpenSSL cipher "protocol" labels usable with each pinned version
+    CIPHER_PROTOCOLS = {
+        "TLSv1.2": ("SSLv3", "TLSv1.0", "TLSv1.2"),
+        "TLSv1.1": ("SSLv3", "TLSv1.0"),
+        "TLSv1": ("SSLv3", "TLSv1.0"),
+    }
+
+    # Cipher families that need out-of-band credentials and never match
+    UNPROBED_AUTH = ("auth-psk", "auth-srp")
+
     async def check(self, target: Target) -> CheckResult:
         """Check TLS connection and certificate"""
         start_time = time.time()
@@ -46,10 +76,13 @@ class TLSChecker(BaseChecker):
             # Try to connect and get TLS info
             def do_tls_check():
                 sock = socket.create_connection(
-                    (target.host, target.port), timeout=self.config.timeout
+                    (target.connect_host, target.port), timeout=self.config.timeout
                 )
 
                 try:
+                    if self.config.timing == "kernel" and timestamps.enable(sock):
+                        return self._timed_handshake(sock, context, target.host)
+
                     with context.wrap_socket(
                         sock, server_hostname=target.host
                     ) as tls_sock:
@@ -68,6 +101,12 @@ class TLSChecker(BaseChecker):
             tls_info = await loop.run_in_executor(None, do_tls_check)
             duration = (time.time() - start_time) * 1000
 
+            wall_ms = duration
+            timing_source = "wall"
+            if tls_info.get("kernel_ms") is not None:
+                duration = tls_info["kernel_ms"]
+                timing_source = "kernel"
+
             # Analyze results
             version = tls_info.get("version", "Unknown")
             cipher_tuple = tls_info.get("cipher")
@@ -95,9 +134,21 @@ class TLSChecker(BaseChecker):
                 "version": version,
                 "cipher": cipher_name,
                 "version_rating": version_rating[0],
+                "timing_source": timing_source,
             }
+            if timing_source != "wall":
+                metadata["wall_ms"] = round(wall_ms, 3)
 
             # Add certificate info in deep mode
+            if self.config.deep_mode:
+                metadata["cipher_security"] = self._get_cipher_security(cipher_name)
+                matrix = await self.enumerate_protocols(target)
+                metadata["tls_matrix"] = matrix
+
+                if status == Status.SUCCESS and matrix["grade"] not in ("A", "B"):
+                    status = Status.WARNING
+                details += f" [grade {matrix['grade']}]"
+
             if self.config.deep_mode and cert:
                 cert_info = self._parse_certificate(cert)
                 metadata["certificate"] = cert_info
@@ -136,6 +187,211 @@ class TLSChecker(BaseChecker):
                 error=str(e),
             )
 
+    def _timed_handshake(
+        self, sock: socket.socket, context: ssl.SSLContext, server_hostname: str
+    ) -> Dict[str, Any]:
+        """Handshake over memory BIOs so every read carries a kernel RX stamp
+
+        kernel_ms spans the ClientHello leaving the host to the arrival of
+        the server's last handshake flight. It is omitted when either stamp
+        is missing.
+        """
+        incoming = ssl.MemoryBIO()
+        outgoing = ssl.MemoryBIO()
+        tls = context.wrap_bio(incoming, outgoing, server_hostname=server_hostname)
+        last_rx = None
+
+        while True:
+            try:
+                tls.do_handshake()
+                break
+            except ssl.SSLWantReadError:
+                pending = outgoing.read()
+                if pending:
+                    sock.sendall(pending)
+                data, stamp = timestamps.recv_stamped(sock, 65536)
+                if not data:
+                    raise ConnectionError("Connection closed during TLS handshake")
+                incoming.write(data)
+                last_rx = stamp or last_rx
+
+        # Client Finished (and anything else queued) completes the handshake
+        pending = outgoing.read()
+        if pending:
+            sock.sendall(pending)
+
+        sent = timestamps.tx_timestamps(sock)
+        info = {"version": tls.version(), "cipher": tls.cipher(), "cert": tls.getpeercert()}
+        if sent and last_rx:
+            info["kernel_ms"] = (last_rx - sent[0]) * 1000
+        return info
+
+    def _pinned_context(self, version: str, ciphers: Optional[str] = None) -> ssl.SSLContext:
+        """Client context that can only negotiate one protocol version"""
+        context = ssl.SSLContext(ssl.PROTOCOL_TLS_CLIENT)
+        context.check_hostname = False
+        context.verify_mode = ssl.CERT_NONE
+
+        with warnings.catch_warnings():
+            warnings.simplefilter("ignore", DeprecationWarning)
+            tls_version = getattr(ssl.TLSVersion, dict(self.PROBE_VERSIONS)[version])
+            context.minimum_version = tls_version
+            context.maximum_version = tls_version
+
+        # SECLEVEL=0 lets the local OpenSSL offer legacy suites at all
+        context.set_ciphers(f"{ciphers or 'ALL'}:@SECLEVEL=0")
+        return context
+
+    async def _probe(
+        self,
+        target: Target,
+        version: str,
+        cipher: Optional[str],
+        semaphore: asyncio.Semaphore,
+    ) -> Optional[Tuple[str, str]]:
+        """Attempt one handshake, return (version, cipher) if accepted"""
+        try:
+            context = self._pinned_context(version, cipher)
+        except (ValueError, ssl.SSLError):
+            # Not supported by the local OpenSSL build
+            return None
+
+        async with semaphore:
+            try:
+                _, writer = await asyncio.wait_for(
+                    asyncio.open_connection(
+                        target.connect_host,
+                        target.port,
+                        ssl=context,
+                        server_hostname=target.host,
+                    ),
+                    timeout=self.config.timeout,
+                )
+            except (OSError, ssl.SSLError, asyncio.TimeoutError):
+                return None
+
+        try:
+            ssl_object = writer.get_extra_info("ssl_object")
+            return ssl_object.version(), ssl_object.cipher()[0]
+        finally:
+            writer.close()
+
+    def _candidate_ciphers(self, version: str) -> Dict[str, List[str]]:
+        """Local cipher suites worth probing for a pinned version, by auth family"""
+        families: Dict[str, List[str]] = {}
+        for cipher in _local_ciphers():
+            if cipher["protocol"] not in self.CIPHER_PROTOCOLS[version]:
+                continue
+            auth = cipher.get("auth", "")
+            if auth in self.UNPROBED_AUTH:
+                continue
+            families.setdefault(auth, []).append(cipher["name"])
+
+        return families
+
+    async def enumerate_protocols(self, target: Target) -> Dict[str, Any]:
+        """Enumerate accepted protocol versions and cipher suites
+
+        Every probe gets its own pinned SSLContext; probes for one host share
+        a semaphore so a scan never opens more than tls_probe_concurrency
+        connections to it. Versions are probed first, and cipher suites are
+        only probed for versions the server accepted.
+
+        Suites are grouped by authentication family (RSA, ECDSA, DSS,
+        anonymous). One probe per family offers all of its suites at once;
+        only families the server accepted there are probed suite by suite,
+        so a server with both RSA and ECDSA keys gets both families listed.
+        """
+        semaphore = asyncio.Semaphore(self.config.tls_probe_concurrency)
+        versions = [name for name, _ in self.PROBE_VERSIONS]
+
+        negotiated = await asyncio.gather(
+            *(self._probe(target, version, None, semaphore) for version in versions)
+        )
+        accepted = {
+            version: result for version, result in zip(versions, negotiated) if result
+        }
+
+        # Representative probe per (version, auth family)
+        families = {
+            version: self._candidate_ciphers(version)
+            for version in ("TLSv1.2", "TLSv1.1", "TLSv1")
+            if version in accepted
+        }
+        family_probes = [
+            (version, auth, ":".join(names))
+            for version, by_auth in families.items()
+            for auth, names in by_auth.items()
+        ]
+        family_results = await asyncio.gather(
+            *(
+                self._probe(target, version, ciphers, semaphore)
+                for version, _, ciphers in family_probes
+            )
+        )
+
+        # Suite by suite, only within families the server accepted; the
+        # suite the representative probe negotiated is already known
+        known: Dict[str, List[str]] = {}
+        probes: List[Tuple[str, str]] = []
+        for (version, auth, _), result in zip(family_probes, family_results):
+            if not result:
+                continue
+            known.setdefault(version, []).append(result[1])
+            probes.extend(
+                (version, cipher)
+                for cipher in families[version][auth]
+                if cipher != result[1]
+            )
+
+        cipher_results = await asyncio.gather(
+            *(self._probe(target, version, cipher, semaphore) for version, cipher in probes)
+        )
+
+        matrix: Dict[str, Any] = {}
+        for version in versions:
+            entry: Dict[str, Any] = {
+                "accepted": version in accepted,
+                "rating": self.TLS_VERSIONS.get(version, ("unknown", 0))[0],
+                "ciphers": {},
+            }
+            if version == "TLSv1.3" and version in accepted:
+                # TLS 1.3 suites cannot be pinned; report the negotiated one
+                suite = accepted[version][1]
+                entry["ciphers"][suite] = self._get_cipher_security(suite)
+            matrix[version] = entry
+
+        for version, suites in known.items():
+            for cipher in suites:
+                matrix[version]["ciphers"][cipher] = self._get_cipher_security(cipher)
+        for (version, cipher), result in zip(probes, cipher_results):
+            if result:
+                matrix[version]["ciphers"][cipher] = self._get_cipher_security(cipher)
+
+        return {
+            "versions": matrix,
+            "grade": self._grade_matrix(matrix),
+            "probes": len(versions) + len(family_probes) + len(probes),
+        }
+
+    def _grade_matrix(self, matrix: Dict[str, Any]) -> str:
+        """Overall A-F grade for an enumeration matrix"""
+        accepted = [v for v, entry in matrix.items() if entry["accepted"]]
+        if not accepted:
+            return "F"
+
+        ratings = {
+            rating for entry in matrix.values() for rating in entry["ciphers"].values()
+        }
+
+        if "insecure" in ratings:
+            return "F"
+        if "TLSv1" in accepted or "TLSv1.1" in accepted:
+            return "C"
+        if "weak" in ratings:
+            return "B"
+        return "A"
+
     def _parse_certificate(self, cert: dict) -> dict:
         """Parse certificate info"""
         result = {}
@@ -176,8 +432,9 @@ class TLSChecker(BaseChecker):
 
     def _get_cipher_security(self, cipher: str) -> str:
         """Get cipher security rating"""
-        insecure = ["NULL", "EXPORT", "DES", "MD5", "RC4"]
+        insecure = ["NULL", "EXPORT", "DES", "MD5", "RC4", "ADH", "AECDH", "ANON"]
         weak = ["3DES", "CBC"]
+        aead = ["GCM", "CHACHA20", "CCM"]
 
         cipher_upper = cipher.upper()
 
@@ -189,7 +446,13 @@ class TLSChecker(BaseChecker):
             if patt in cipher_upper:
                 return "weak"
 
-        if "AES_256_GCM" in cipher_upper or "CHACHA20" in cipher_upper:
+        # OpenSSL-style names ("ECDHE-RSA-AES128-SHA") omit "CBC"
+        if "-" in cipher_upper and not any(patt in cipher_upper for patt in aead):
+            return "weak"
+
+        if any(
+            patt in cipher_upper for patt in ("AES_256_GCM", "AES256-GCM", "CHACHA20")
+        ):
             return "strong"
 
         return "good"
@@ -4,5 +4,14 @@ from .config import Config
 from .engine import PulseEngine
 from .target import Target
 from .result import CheckResult, TargetResult
+from .certs import CertificateIndex, CertificateInfo
 
-__all__ = ["Config", "PulseEngine", "Target", "CheckResult", "TargetResult"]
+__all__ = [
+    "Config",
+    "PulseEngine",
+    "Target",
+    "CheckResult",
+    "TargetResult",
+    "CertificateIndex",
+    "CertificateInfo",
+]
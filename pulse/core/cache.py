@@ -0,0 +1,59 @@
+"""Run-scoped memoization of check sub-results"""
+
+import asyncio
+from typing import Any, Awaitable, Callable, Dict, Hashable, Tuple
+
+
+class RunCache:
+    """Memoize sub-results for the length of one run
+
+    The first caller for a key runs the factory; concurrent callers for the
+    same key await the same in-flight future instead of repeating the work.
+    Each entry remembers which target produced it so shared copies can be
+    labeled. Failed factories are not cached.
+    """
+
+    def __init__(self):
+        self._entries: Dict[Hashable, Tuple[asyncio.Future, str]] = {}
+        self.hits = 0
+        self.misses = 0
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    def __contains__(self, key: Hashable) -> bool:
+        return key in self._entries
+
+    async def get_or_run(
+        self, key: Hashable, owner: str, factory: Callable[[], Awaitable[Any]]
+    ) -> Tuple[Any, str, bool]:
+        """Return (result, owner, shared) for key, running factory at most once"""
+        entry = self._entries.get(key)
+        if entry is not None:
+            self.hits += 1
+            future, first_owner = entry
+            # shield: a cancelled waiter must not cancel the shared work
+            return await asyncio.shield(future), first_owner, True
+
+        self.misses += 1
+        future = asyncio.get_running_loop().create_future()
+        self._entries[key] = (future, owner)
+
+        try:
+            result = await factory()
+        except BaseException as e:
+            del self._entries[key]
+            if isinstance(e, asyncio.CancelledError):
+                future.cancel()
+            else:
+                future.set_exception(e)
+                # Mark retrieved so an unawaited future does not warn
+                future.exception()
+            raise
+
+        future.set_result(result)
+        return result, owner, False
+
+    def stats(self) -> dict:
+        """Hit/miss counters for the run summary"""
+        return {"entries": len(self._entries), "hits": self.hits, "misses": self.misses}
@@ -0,0 +1,337 @@
+"""Binary record-and-replay capture of check results
+
+A capture is a file header followed by compressed blocks:
+
+    header  b"PULSECAP", version (u8), codec (u8)
+    block   stored size (u32), raw size (u32), payload
+
+A block's raw payload is a run of length-prefixed records, each
+    length (u32, excluding these 5 bytes), kind (u8), body
+
+Host names, check names, schemes, paths and tags go into a string table
+built up in the record stream itself: a STRING record assigns the next
+id (ids start at 1; 0 means None), and later records refer to it. The
+file is therefore append-only and read front to back in one pass, one
+block in memory at a time. Only the block being filled is lost if a
+run dies; a reader stops at a torn final block.
+
+Unknown record kinds are skipped by length, so newer writers can add
+kinds without breaking older readers.
+"""
+
+import json
+import struct
+import zlib
+from typing import Any, BinaryIO, Dict, Iterator, List, Optional, Tuple
+
+from ..utils.logger import get_logger
+from .result import CheckResult, Status, TargetResult
+from .target import Target
+
+
+logger = get_logger(__name__)
+
+MAGIC = b"PULSECAP"
+VERSION = 1
+
+CODEC_NONE = 0
+CODEC_ZLIB = 1
+
+# Raw bytes collected before a block is compressed and written
+BLOCK_SIZE = 256 * 1024
+
+# Record kinds
+STRING = 1
+RESULT = 2
+SUMMARY = 3
+
+_FILE_HEADER = struct.Struct("<8sBB")
+_BLOCK = struct.Struct("<II")
+_RECORD = struct.Struct("<IB")
+# raw, host, port, scheme, path, ip, is_url, profile, tag count
+_TARGET = struct.Struct("<IIHIIIBIH")
+# total_duration_ms, timestamp, check count, address count
+_BODY = struct.Struct("<ddHH")
+# name, status, duration_ms, timestamp, details, error, metadata sizes
+_CHECK = struct.Struct("<IBddIiI")
+_U32 = struct.Struct("<I")
+
+# Metadata as JSON text; decoded from str, skipping json.loads' byte sniffing
+_decode = json.JSONDecoder().decode
+
+_STATUSES = list(Status)
+_STATUS_CODES = {status: i for i, status in enumerate(_STATUSES)}
+
+
+def _ids(view: memoryview, offset: int, count: int) -> Tuple[int, ...]:
+    return struct.unpack_from(f"<{count}I", view, offset) if count else ()
+
+
+class CaptureError(ValueError):
+    """Not a capture file, or one written by a newer pulse"""
+
+
+def is_capture(path: str) -> bool:
+    """Whether path starts with the capture magic"""
+    try:
+        with open(path, "rb") as f:
+            return f.read(len(MAGIC)) == MAGIC
+    except OSError:
+        return False
+
+
+class CaptureWriter:
+    """Append TargetResults to a capture file
+
+    With append=True an existing capture is read once to recover its
+    string table and new blocks are added after it. level is the zlib
+    level; 0 stores blocks uncompressed.
+    """
+
+    def __init__(
+        self,
+        path: str,
+        append: bool = False,
+        level: int = 1,
+        block_size: int = BLOCK_SIZE,
+    ):
+        self.path = path
+        self.level = level
+        self.block_size = block_size
+        self.codec = CODEC_ZLIB if level else CODEC_NONE
+        self.count = 0
+        self._strings: Dict[str, int] = {}
+        self._buffer = bytearray()
+
+        end = 0
+        if append:
+            try:
+                reader = CaptureReader(path)
+            except FileNotFoundError:
+                reader = None
+            if reader is not None:
+                for _ in reader.records():
+                    pass
+                self._strings = {s: i for i, s in enumerate(reader.strings) if i}
+                self.codec = reader.codec
+                end = reader.end
+        self._out: BinaryIO = open(path, "r+b" if end else "wb")
+        if end:
+            # Drop a torn block left by an interrupted run
+            self._out.seek(end)
+            self._out.truncate()
+        else:
+            self._out.write(_FILE_HEADER.pack(MAGIC, VERSION, self.codec))
+
+    def _string(self, text: Optional[str]) -> int:
+        if text is None:
+            return 0
+        id = self._strings.get(text)
+        if id is None:
+            id = self._strings[text] = len(self._strings) + 1
+            self._record(STRING, text.encode("utf-8"))
+        return id
+
+    def _record(self, kind: int, body: bytes) -> None:
+        self._buffer += _RECORD.pack(len(body), kind)
+        self._buffer += body
+
+    def _body(self, result: TargetResult, out: bytearray) -> None:
+        string = self._string
+        out += _BODY.pack(
+            result.total_duration_ms, result.timestamp, len(result.checks), len(result.addresses)
+        )
+        for check in result.checks:
+            details = check.details.encode("utf-8")
+            error = check.error.encode("utf-8") if check.error is not None else b""
+            metadata = (
+                json.dumps(check.metadata, separators=(",", ":"), default=str).encode("utf-8")
+                if check.metadata
+                else b""
+            )
+            out += _CHECK.pack(
+                string(check.name),
+                _STATUS_CODES[check.status],
+                check.duration_ms,
+                check.timestamp,
+                len(details),
+                len(error) if check.error is not None else -1,
+                len(metadata),
+            )
+            out += details
+            out += error
+            out += metadata
+        for ip, per_ip in result.addresses.items():
+            out += _U32.pack(string(ip))
+            self._body(per_ip, out)
+
+    def add(self, result: TargetResult) -> None:
+        """Append one result (written once a block fills up)"""
+        target = result.target
+        string = self._string
+        tags = getattr(target, "tags", ()) or ()
+        out = bytearray(
+            _TARGET.pack(
+                string(target.raw),
+                string(target.host),
+                target.port,
+                string(target.scheme),
+                string(target.path),
+                string(target.ip),
+                target.is_url,
+                target.profile,
+                len(tags),
+            )
+        )
+        for tag in tags:
+            out += _U32.pack(string(tag))
+        self._body(result, out)
+        self._record(RESULT, bytes(out))
+        self.count += 1
+        if len(self._buffer) >= self.block_size:
+            self.flush()
+
+    def add_summary(self, summary: Dict[str, Any]) -> None:
+        """Record the run summary (pipeline stages, runtime metrics)"""
+        self._record(SUMMARY, json.dumps(summary, default=str).encode("utf-8"))
+
+    def flush(self) -> None:
+        """Compress and write the pending block"""
+        if not self._buffer:
+            return
+        raw = bytes(self._buffer)
+        self._buffer.clear()
+        payload = zlib.compress(raw, self.level) if self.codec == CODEC_ZLIB else raw
+        self._out.write(_BLOCK.pack(len(payload), len(raw)))
+        self._out.write(payload)
+
+    def close(self) -> None:
+        self.flush()
+        self._out.close()
+
+    def __enter__(self) -> "CaptureWriter":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+
+class CaptureReader:
+    """Stream TargetResults back out of a capture file
+
+    Iterating yields results in the order they were written; summary is
+    set once the record holding it has been read (normally the last).
+    """
+
+    def __init__(self, path: str):
+        self.path = path
+        self.summary: Optional[Dict[str, Any]] = None
+        # Offset just past the last complete block
+        self.end = 0
+        self.strings: List[Optional[str]] = [None]
+        with open(path, "rb") as f:
+            header = f.read(_FILE_HEADER.size)
+        if len(header) < _FILE_HEADER.size or header[: len(MAGIC)] != MAGIC:
+            raise CaptureError(f"{path} is not a pulse capture")
+        _, self.version, self.codec = _FILE_HEADER.unpack(header)
+        if self.version > VERSION or self.codec not in (CODEC_NONE, CODEC_ZLIB):
+            raise CaptureError(f"{path} was written by a newer pulse (format {self.version})")
+
+    def _blocks(self) -> Iterator[bytes]:
+        with open(self.path, "rb") as f:
+            f.seek(_FILE_HEADER.size)
+            self.end = _FILE_HEADER.size
+            while True:
+                head = f.read(_BLOCK.size)
+                if not head:
+                    return
+                if len(head) < _BLOCK.size:
+                    break
+                stored, size = _BLOCK.unpack(head)
+                payload = f.read(stored)
+                if len(payload) < stored:
+                    break
+                if self.codec == CODEC_ZLIB:
+                    try:
+                        payload = zlib.decompress(payload)
+                    except zlib.error:
+                        break
+                if len(payload) != size:
+                    break
+                self.end = f.tell()
+                yield payload
+        logger.warning(f"{self.path}: ignoring a truncated block at offset {self.end}")
+
+    def records(self) -> Iterator[Tuple[int, memoryview]]:
+        """(kind, body) for every record; STRING records update strings"""
+        strings = self.strings
+        for block in self._blocks():
+            view = memoryview(block)
+            offset, end = 0, len(block)
+            while offset < end:
+                size, kind = _RECORD.unpack_from(view, offset)
+                offset += _RECORD.size
+                body = view[offset : offset + size]
+                offset += size
+                if kind == STRING:
+                    strings.append(str(body, "utf-8"))
+                elif kind == SUMMARY:
+                    self.summary = json.loads(bytes(body))
+                else:
+                    yield kind, body
+
+    def _target(self, view: memoryview, offset: int) -> Tuple[Target, int]:
+        fields = _TARGET.unpack_from(view, offset)
+        offset += _TARGET.size
+        tags = _ids(view, offset, fields[8])
+        offset += 4 * fields[8]
+        strings = self.strings
+        target = Target(
+            raw=strings[fields[0]],
+            host=strings[fields[1]],
+            port=fields[2],
+            scheme=strings[fields[3]],
+            path=strings[fields[4]],
+            ip=strings[fields[5]],
+            is_url=bool(fields[6]),
+            profile=fields[7],
+            tags=tuple(strings[i] for i in tags),
+        )
+        return target, offset
+
+    def _body(self, view: memoryview, offset: int, target: Target) -> Tuple[TargetResult, int]:
+        strings = self.strings
+        total, timestamp, check_count, address_count = _BODY.unpack_from(view, offset)
+        offset += _BODY.size
+        checks = []
+        for _ in range(check_count):
+            name, status, duration, ts, details_size, error_size, metadata_size = (
+                _CHECK.unpack_from(view, offset)
+            )
+            offset += _CHECK.size
+            details = str(view[offset : offset + details_size], "utf-8")
+            offset += details_size
+            error = None
+            if error_size >= 0:
+                error = str(view[offset : offset + error_size], "utf-8")
+                offset += error_size
+            metadata = None
+            if metadata_size:
+                metadata = _decode(str(view[offset : offset + metadata_size], "utf-8"))
+                offset += metadata_size
+            checks.append(
+                CheckResult(
+                    strings[name], duration, _STATUSES[status], details, error, metadata, ts
+                )
+            )
+        addresses = {}
+        for _ in range(address_count):
+            ip = strings[_U32.unpack_from(view, offset)[0]]
+            addresses[ip], offset = self._body(view, offset + 4, target.with_ip(ip))
+        return TargetResult(target, checks, total, timestamp, addresses), offset
+
+    def __iter__(self) -> Iterator[TargetResult]:
+        for kind, body in self.records():
+            if kind == RESULT:
+                target, offset = self._target(body, 0)
+                yield self._body(body, offset, target)[0]
@@ -0,0 +1,172 @@
+"""Certificate inventory and expiry index"""
+
+import bisect
+import time
+from dataclasses import dataclass, field
+from typing import Dict, Iterator, List, Optional, Tuple
+
+from ..utils.x509 import fingerprint, parse_certificate
+
+
+SECONDS_PER_DAY = 86400
+
+
+@dataclass
+class CertificateInfo:
+    """A distinct certificate seen during an inventory run"""
+
+    fingerprint: str
+    subject: Dict[str, str]
+    issuer: Dict[str, str]
+    serial: str
+    not_before: float
+    not_after: float
+    san: List[str] = field(default_factory=list)
+    # Hosts serving it, in the order seen (a dict keeps adds O(1))
+    hosts: Dict[str, None] = field(default_factory=dict)
+
+    @property
+    def common_name(self) -> str:
+        return self.subject.get("commonName", "")
+
+    @property
+    def issuer_name(self) -> str:
+        return self.issuer.get("organizationName") or self.issuer.get("commonName", "Unknown")
+
+    def days_until_expiry(self, now: Optional[float] = None) -> int:
+        """Whole days until notAfter (negative once expired)"""
+        now = time.time() if now is None else now
+        return int((self.not_after - now) // SECONDS_PER_DAY)
+
+    def is_expired(self, now: Optional[float] = None) -> bool:
+        now = time.time() if now is None else now
+        return self.not_after < now
+
+    def to_dict(self, now: Optional[float] = None) -> dict:
+        """Convert to dictionary"""
+        return {
+            "fingerprint": self.fingerprint,
+            "common_name": self.common_name,
+            "subject": self.subject,
+            "issuer": self.issuer,
+            "serial": self.serial,
+            "not_before": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.not_before)),
+            "not_after": time.strftime("%Y-%m-%dT%H:%M:%SZ", time.gmtime(self.not_after)),
+            "days_until_expiry": self.days_until_expiry(now),
+            "expired": self.is_expired(now),
+            "san": self.san,
+            "hosts": list(self.hosts),
+        }
+
+
+class CertificateIndex:
+    """Fingerprint-deduplicated certificates ordered by expiry
+
+    Each distinct certificate is parsed once; later sightings only add the
+    host to the existing entry. The expiry order is maintained on insert so
+    range queries are a bisect rather than a scan.
+    """
+
+    def __init__(self):
+        self._by_fingerprint: Dict[str, CertificateInfo] = {}
+        self._expiry: List[Tuple[float, str]] = []
+        self.errors: Dict[str, str] = {}
+        self.handshakes = 0
+
+    def add(self, der: bytes, host: str) -> CertificateInfo:
+        """Record a DER certificate served by host"""
+        self.handshakes += 1
+        fp = fingerprint(der)
+        info = self._by_fingerprint.get(fp)
+
+        if info is None:
+            parsed = parse_certificate(der)
+            info = CertificateInfo(fingerprint=fp, **parsed)
+            self._by_fingerprint[fp] = info
+            bisect.insort(self._expiry, (info.not_after, fp))
+
+        info.hosts[host] = None
+
+        return info
+
+    def add_error(self, host: str, error: str) -> None:
+        """Record a host whose certificate could not be collected"""
+        self.handshakes += 1
+        self.errors[host] = error
+
+    def get(self, fp: str) -> Optional[CertificateInfo]:
+        return self._by_fingerprint.get(fp)
+
+    def __len__(self) -> int:
+        return len(self._expiry)
+
+    def __iter__(self) -> Iterator[CertificateInfo]:
+        """Iterate certificates, soonest expiry first"""
+        for _, fp in self._expiry:
+            yield self._by_fingerprint[fp]
+
+    def expiring_before(self, timestamp: float) -> List[CertificateInfo]:
+        """Certificates whose notAfter is before timestamp"""
+        end = bisect.bisect_left(self._expiry, (timestamp,))
+        return [self._by_fingerprint[fp] for _, fp in self._expiry[:end]]
+
+    def expiring_within(self, days: float, now: Optional[float] = None) -> List[CertificateInfo]:
+        """Certificates expiring within the given number of days (incl. expired)"""
+        now = time.time() if now is None else now
+        return self.expiring_before(now + days * SECONDS_PER_DAY)
+
+    def expired(self, now: Optional[float] = None) -> List[CertificateInfo]:
+        """Certificates already past notAfter"""
+        return self.expiring_before(time.time() if now is None else now)
+
+    def group_by_issuer(self) -> Dict[str, List[CertificateInfo]]:
+        """Group certificates by issuer name, each group in expiry order"""
+        groups: Dict[str, List[CertificateInfo]] = {}
+        for info in self:
+            groups.setdefault(info.issuer_name, []).append(info)
+        return groups
+
+    def group_by_san(self) -> Dict[str, List[CertificateInfo]]:
+        """Group certificates by each subjectAltName entry"""
+        groups: Dict[str, List[CertificateInfo]] = {}
+        for info in self:
+            for name in info.san or [info.common_name]:
+                groups.setdefault(name, []).append(info)
+        return groups
+
+    def select(
+        self, expiring_within: Optional[float] = None, now: Optional[float] = None
+    ) -> List[CertificateInfo]:
+        """All certificates, or those expiring within a number of days"""
+        if expiring_within is None:
+            return list(self)
+        return self.expiring_within(expiring_within, now)
+
+    def to_dict(
+        self,
+        expiring_within: Optional[float] = None,
+        group_by: Optional[str] = None,
+        now: Optional[float] = None,
+    ) -> dict:
+        """Convert to dictionary"""
+        now = time.time() if now is None else now
+        selected = self.select(expiring_within, now)
+
+        data: dict = {
+            "handshakes": self.handshakes,
+            "unique_certificates": len(self),
+            "expired": len(self.expired(now)),
+            "certificates": [info.to_dict(now) for info in selected],
+            "errors": self.errors,
+        }
+
+        if group_by:
+            wanted = {info.fingerprint for info in selected}
+            groups = self.group_by_san() if group_by == "san" else self.group_by_issuer()
+            data["groups"] = {
+                key: [info.fingerprint for info in infos if info.fingerprint in wanted]
+                for key, infos in groups.items()
+                if any(info.fingerprint in wanted for info in infos)
+            }
+
+        return data
@@ -3,7 +3,7 @@
 import json
 from dataclasses import dataclass, asdict
 from pathlib import Path
-from typing import Optional, List
+from typing import Dict, Optional, List
 
 
 @dataclass
@@ -18,6 +18,10 @@ class Config:
     prefer_ipv6: bool = False
     check_http2: bool = False
     follow_redirects: bool = True
+    tls_probe_concurrency: int = 8
+    all_ips: bool = False
+    timing: str = "wall"  # "wall" or "kernel" (SO_TIMESTAMPING / TCP_INFO)
+    expect_status: Optional[List[int]] = None  # HTTP codes that count as success
 
     # Output options
     format: str = "terminal"
@@ -25,20 +29,70 @@ class Config:
     quiet: bool = False
     no_color: bool = False
     verbose: int = 0
+    include_summary: bool = False  # wrap JSON/YAML as {"results", "summary"}
 
     # Performance
     workers: int = 10
+    per_target_concurrency: int = 4
+    share_results: bool = True
+    dns_prefetch: bool = True
+    dns_workers: int = 20
+    prefetch_window: int = 0  # 0 = 4x workers
+    pipeline: bool = False
+    sweep: bool = False  # selector fast path for --checks tcp
+    sweep_window: int = 0  # 0 = from the file-descriptor limit
+    stage_workers: Dict[str, int] = None  # e.g. {"dns": 50, "http": 20}
+    stage_queue_size: int = 0  # 0 = 2x stage workers
+    batch_size: int = 0  # targets per streamed batch, 0 = max(1000, 100x workers)
     benchmark_mode: bool = False
+    keep_runs: bool = False  # benchmark: keep every run's full results
+    metrics: bool = False
+    metrics_interval: float = 0.1
+
+    # TCP ping
+    tcp_ping_count: int = 0
+    ping_interval: float = 1.0
 
     # Comparison
     compare_mode: bool = False
 
+    # Target expansion
+    shuffle: bool = False  # visit expanded ranges in pseudo-random order
+    shuffle_seed: Optional[int] = None
+
+    # Certificate inventory
+    cert_expiring_days: Optional[float] = None
+    cert_group_by: Optional[str] = None
+
+    # Resolver benchmark
+    nameservers: List[str] = None
+    dns_samples: int = 20
+    dns_record_type: str = "A"
+
     def __post_init__(self):
         if self.checks is None:
             self.checks = ["dns", "tcp", "tls", "http"]
         elif isinstance(self.checks, str):
             self.checks = [c.strip() for c in self.checks.split(",")]
 
+        if isinstance(self.expect_status, str):
+            self.expect_status = [int(s) for s in self.expect_status.split(",") if s.strip()]
+
+        if self.stage_workers is None:
+            self.stage_workers = {}
+        elif isinstance(self.stage_workers, str):
+            self.stage_workers = {
+                name.strip(): int(count)
+                for name, _, count in (
+                    spec.partition("=") for spec in self.stage_workers.split(",") if spec.strip()
+                )
+            }
+
+        if self.nameservers is None:
+            self.nameservers = ["system", "auth"]
+        elif isinstance(self.nameservers, str):
+            self.nameservers = [n.strip() for n in self.nameservers.split(",")]
+
     @classmethod
     def from_args(cls, args) -> "Config":
         """Create config from argparse args"""
@@ -52,14 +106,42 @@ class Config:
             prefer_ipv6=args.ipv6,
             check_http2=args.http2,
             follow_redirects=args.follow_redirects,
+            tls_probe_concurrency=args.tls_probe_concurrency,
+            all_ips=args.all_ips,
+            timing=args.timing,
+            expect_status=args.expect_status,
             format=args.format,
             output_file=args.output,
             quiet=args.quiet,
             no_color=args.no_color,
             verbose=args.verbose,
+            include_summary=args.summary,
             workers=args.workers,
+            per_target_concurrency=args.per_target_concurrency,
+            share_results=not args.no_share,
+            dns_prefetch=not args.no_prefetch,
+            dns_workers=args.dns_workers,
+            prefetch_window=args.prefetch_window,
+            pipeline=args.pipeline,
+            sweep=args.sweep,
+            sweep_window=args.sweep_window,
+            stage_workers=args.stage_workers,
+            stage_queue_size=args.stage_queue,
+            batch_size=args.batch_size,
             benchmark_mode=args.benchmark,
+            keep_runs=args.keep_runs,
+            metrics=args.metrics,
+            metrics_interval=args.metrics_interval,
             compare_mode=args.compare,
+            shuffle=args.shuffle,
+            shuffle_seed=args.seed,
+            tcp_ping_count=args.tcp_ping,
+            ping_interval=args.interval,
+            cert_expiring_days=args.expiring,
+            cert_group_by=args.group_by,
+            nameservers=args.nameservers,
+            dns_samples=args.samples,
+            dns_record_type=args.record_type,
         )
 
     @classmethod
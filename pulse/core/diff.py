@@ -0,0 +1,292 @@
+"""Latency regression detection between two runs (pulse diff)
+
+Each side is a pulse JSON, NDJSON or capture file, read one result at a
+time (JSON arrays are decoded element by element, never as a whole
+document). The baseline is loaded into per-check columns of target ids
+and durations; the current run is then streamed past it and joined on
+the target as it was given on the command line (the "target" field).
+Memory is a dozen bytes per sample plus one dict entry per baseline
+target, so 100k-target runs diff comfortably.
+
+Per check, the durations of targets present in both runs are compared
+with a one-sided Mann-Whitney U test. A check regresses when the test is
+significant at alpha and at least one reported percentile rose by more
+than threshold percent and by at least min_delta_ms. Targets with
+MIN_SAMPLES or more samples on both sides (files holding several runs)
+are tested one by one as well. Failed checks carry no usable latency:
+they are counted, and targets whose check fails now but never failed in
+the baseline are listed as new failures.
+"""
+
+import itertools
+import json
+import re
+from array import array
+from collections import Counter
+from typing import Callable, Dict, Iterator, List, Optional, Sequence, Set, Tuple
+
+from ..utils.stats import mann_whitney_u, percentile
+from .capture import CaptureReader, is_capture
+from .result import CheckDiff, DiffReport
+
+
+DEFAULT_PERCENTILES = (50.0, 99.0)
+DEFAULT_THRESHOLD = 10.0  # percent
+DEFAULT_MIN_DELTA_MS = 1.0
+DEFAULT_ALPHA = 0.01
+
+# Samples a target needs on both sides before it is tested on its own
+MIN_SAMPLES = 8
+
+# (check name, duration_ms, status value)
+Sample = Tuple[str, float, str]
+
+_CHUNK = 1 << 16
+_WRAPPED = re.compile(r'\s*\{\s*"results"\s*:\s*\[')
+_SEPARATORS = re.compile(r"[\s,]*")
+
+
+def _json_items(f, head: str) -> Iterator[dict]:
+    """Objects of a JSON array (or {"results": [...]}), one at a time"""
+    decode = json.JSONDecoder().raw_decode
+    wrapped = _WRAPPED.match(head)
+    buf = head
+    pos = wrapped.end() if wrapped else head.index("[") + 1
+    while True:
+        pos = _SEPARATORS.match(buf, pos).end()
+        if pos == len(buf):
+            more = f.read(_CHUNK)
+            if not more:
+                raise ValueError("JSON array is not terminated")
+            buf, pos = more, 0
+            continue
+        if buf[pos] == "]":
+            return
+        try:
+            item, pos = decode(buf, pos)
+        except json.JSONDecodeError:
+            # Most likely an object cut off by the chunk boundary
+            more = f.read(_CHUNK)
+            if not more:
+                raise
+            buf, pos = buf[pos:] + more, 0
+            continue
+        yield item
+
+
+def _line_decoder() -> Callable[[str], dict]:
+    """orjson.loads when it is installed, the stdlib decoder otherwise"""
+    try:
+        import orjson
+    except ImportError:
+        return json.JSONDecoder().decode
+    return orjson.loads
+
+
+def _ndjson_items(f, head: str) -> Iterator[dict]:
+    decode = _line_decoder()
+    # Complete the line the first chunk cut through
+    for line in itertools.chain((head + f.readline()).splitlines(), f):
+        if line.strip():
+            yield decode(line)
+
+
+def read_samples(path: str) -> Iterator[Tuple[str, List[Sample]]]:
+    """(target, [(check, duration_ms, status)]) for each result in a file
+
+    Reads captures, NDJSON and JSON arrays (plain or --summary wrapped);
+    summary lines and other non-result objects are skipped.
+    """
+    if is_capture(path):
+        for result in CaptureReader(path):
+            yield str(result.target), [
+                (c.name, c.duration_ms, c.status.value) for c in result.checks
+            ]
+        return
+
+    with open(path, encoding="utf-8") as f:
+        head = f.read(_CHUNK)
+        first = head.lstrip()[:1]
+        if first == "[" or _WRAPPED.match(head):
+            items = _json_items(f, head)
+        elif first == "{":
+            items = _ndjson_items(f, head)
+        else:
+            raise ValueError(f"{path} is not pulse JSON, NDJSON or a capture")
+        for item in items:
+            checks = item.get("checks")
+            if checks is None:
+                continue
+            yield item["target"], [(c["name"], c["duration_ms"], c["status"]) for c in checks]
+
+
+class _Columns:
+    """One run's samples per check: target ids and durations side by side"""
+
+    __slots__ = ("ids", "durations", "failed")
+
+    def __init__(self):
+        self.ids: Dict[str, array] = {}
+        self.durations: Dict[str, array] = {}
+        # check -> ids of targets it failed for, once per failure
+        self.failed: Dict[str, array] = {}
+
+    def add(self, target_id: int, samples: Sequence[Sample], wanted: Optional[Set[str]]) -> None:
+        for check, duration_ms, status in samples:
+            if wanted is not None and check.lower() not in wanted:
+                continue
+            if status == "failure":
+                failed = self.failed.get(check)
+                if failed is None:
+                    failed = self.failed[check] = array("I")
+                failed.append(target_id)
+            elif status != "skipped":
+                ids = self.ids.get(check)
+                if ids is None:
+                    ids = self.ids[check] = array("I")
+                    self.durations[check] = array("d")
+                ids.append(target_id)
+                self.durations[check].append(duration_ms)
+
+    @property
+    def checks(self) -> Set[str]:
+        return set(self.ids) | set(self.failed)
+
+
+def _grouped(ids: array, durations: array, keep: Callable[[int], bool]) -> Dict[int, array]:
+    """Durations per target, for kept targets with at least MIN_SAMPLES"""
+    if len(ids) < MIN_SAMPLES:
+        return {}
+    groups = {
+        t: array("d") for t, count in Counter(ids).items() if count >= MIN_SAMPLES and keep(t)
+    }
+    if groups:
+        for t, duration_ms in zip(ids, durations):
+            group = groups.get(t)
+            if group is not None:
+                group.append(duration_ms)
+    return groups
+
+
+class RunDiff:
+    """Compares a baseline run file with a current one; see diff_runs()"""
+
+    def __init__(
+        self,
+        percentiles: Sequence[float] = DEFAULT_PERCENTILES,
+        threshold: float = DEFAULT_THRESHOLD,
+        min_delta_ms: float = DEFAULT_MIN_DELTA_MS,
+        alpha: float = DEFAULT_ALPHA,
+        checks: Optional[Sequence[str]] = None,
+        use_numpy: Optional[bool] = None,
+    ):
+        self.percentiles = tuple(percentiles)
+        self.threshold = threshold
+        self.min_delta_ms = min_delta_ms
+        self.alpha = alpha
+        self.wanted = {c.lower() for c in checks} if checks else None
+        self.use_numpy = use_numpy
+
+    def _beyond(self, delta_ms: Optional[float], delta_pct: Optional[float]) -> bool:
+        if delta_ms is None or delta_ms < self.min_delta_ms:
+            return False
+        # A zero baseline has no relative change; the absolute floor decides
+        return delta_pct is None or delta_pct > self.threshold
+
+    def compare(
+        self, check: str, target: Optional[str], before: Sequence[float], after: Sequence[float]
+    ) -> CheckDiff:
+        """Percentiles and the U test for one check's two samples"""
+        diff = CheckDiff(check, target, len(before), len(after))
+        ordered_before, ordered_after = sorted(before), sorted(after)
+        for q in self.percentiles:
+            diff.baseline[q] = percentile(ordered_before, q)
+            diff.current[q] = percentile(ordered_after, q)
+        if before and after:
+            diff.p_value = mann_whitney_u(before, after, self.use_numpy)[1]
+            diff.regressed = diff.p_value < self.alpha and any(
+                self._beyond(*diff.delta(q)) for q in self.percentiles
+            )
+        return diff
+
+    def run(self, baseline: str, current: str) -> DiffReport:
+        """Stream both files and build the report"""
+        report = DiffReport(
+            baseline,
+            current,
+            self.percentiles,
+            self.threshold,
+            self.min_delta_ms,
+            self.alpha,
+        )
+
+        # Build side: every baseline target gets an id
+        names: List[str] = []
+        ids: Dict[str, int] = {}
+        before = _Columns()
+        for target, samples in read_samples(baseline):
+            target_id = ids.get(target)
+            if target_id is None:
+                target_id = ids[target] = len(names)
+                names.append(target)
+            before.add(target_id, samples, self.wanted)
+
+        # Probe side: the current run, one result at a time
+        seen = bytearray(len(names))
+        new: Set[str] = set()
+        after = _Columns()
+        for target, samples in read_samples(current):
+            target_id = ids.get(target)
+            if target_id is None:
+                new.add(target)
+                continue
+            seen[target_id] = 1
+            after.add(target_id, samples, self.wanted)
+
+        report.matched = seen.count(1)
+        report.new_targets = len(new)
+        report.missing_targets = len(names) - report.matched
+
+        regressed: List[CheckDiff] = []
+        failing: List[CheckDiff] = []
+        for check in sorted(before.checks | after.checks):
+            base_ids = before.ids.get(check, array("I"))
+            base_durations = before.durations.get(check, array("d"))
+            # Only targets present in both runs are compared
+            kept = array("d", (d for t, d in zip(base_ids, base_durations) if seen[t]))
+            durations = after.durations.get(check, array("d"))
+            diff = self.compare(check, None, kept, durations)
+
+            base_failed = [t for t in before.failed.get(check, ()) if seen[t]]
+            failures = Counter(after.failed.get(check, ()))
+            newly = sorted(set(failures) - set(base_failed))
+            diff.baseline_failures = len(base_failed)
+            diff.current_failures = sum(failures.values())
+            diff.new_failures = len(newly)
+            report.checks.append(diff)
+
+            for t in newly:
+                failing.append(
+                    CheckDiff(check, names[t], current_failures=failures[t], new_failures=1)
+                )
+
+            base_groups = _grouped(base_ids, base_durations, seen.__getitem__)
+            if base_groups:
+                groups = _grouped(
+                    after.ids.get(check, array("I")), durations, base_groups.__contains__
+                )
+                for t, group in groups.items():
+                    target_diff = self.compare(check, names[t], base_groups[t], group)
+                    if target_diff.regressed:
+                        regressed.append(target_diff)
+
+        # Largest regressions first
+        first = self.percentiles[0] if self.percentiles else 50.0
+        regressed.sort(key=lambda d: -(d.delta(first)[0] or 0.0))
+        report.targets = regressed + failing
+        return report
+
+
+def diff_runs(baseline: str, current: str, **options) -> DiffReport:
+    """Compare two run files; options are RunDiff's"""
+    return RunDiff(**options).run(baseline, current)
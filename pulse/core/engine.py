@@ -1,23 +1,61 @@
 """Async engine for running network checks"""
 
 import asyncio
-from typing import List, Optional, Dict, Any, Callable
+import itertools
+import socket
+from typing import AsyncIterable, AsyncIterator, Iterable, List, Optional, Dict, Any, Callable
 from concurrent.futures import ThreadPoolExecutor
 import time
 
 from .config import Config
 from .target import Target
-from .result import CheckResult, TargetResult, BenchmarkResult, Status
+from .result import (
+    CheckResult,
+    TargetResult,
+    BenchmarkResult,
+    ResolverBenchmarkResult,
+    Status,
+    TcpPingResult,
+)
+from .cache import RunCache
+from .inventory import Inventory, Profile
+from .metrics import RuntimeMetrics
+from .pipeline import StagedPipeline
+from .sweep import OPEN, ConnectSweep, SweepResult
+from .certs import CertificateIndex
+from ..checks.certs import CertChecker
 from ..checks.dns import DNSChecker
 from ..checks.tcp import TCPChecker
 from ..checks.tls import TLSChecker
 from ..checks.http import HTTPChecker
+from ..checks.ping import TCPPing
+from ..checks.resolvers import NameserverBenchmark
 from ..utils.logger import get_logger
 
 
 logger = get_logger(__name__)
 
 
+class _PrefetchWindow:
+    """Bounds how far the DNS prefetch stage may run ahead of the workers"""
+
+    def __init__(self, size: int):
+        self.size = max(1, size)
+        self.started = 0
+        self._advanced = asyncio.Condition()
+
+    async def advance(self) -> None:
+        """A connection worker picked up the next target"""
+        async with self._advanced:
+            self.started += 1
+            self._advanced.notify_all()
+
+    async def wait_for_slot(self, index: int) -> None:
+        """Block until target number index is inside the look-ahead window"""
+        async with self._advanced:
+            await self._advanced.wait_for(lambda: index - self.started < self.size)
+
+
 class PulseEngine:
     """Main engine for running network diagnostics"""
 
@@ -26,13 +64,19 @@ class PulseEngine:
         "tcp": TCPChecker,
         "tls": TLSChecker,
         "http": HTTPChecker,
+        "certs": CertChecker,
     }
 
-    def __init__(self, config: Config):
+    def __init__(self, config: Config, inventory: Optional[Inventory] = None):
         self.config = config
         self._executor = ThreadPoolExecutor(max_workers=config.workers)
         self._checkers: Dict[str, Any] = {}
         self._init_checkers()
+        self._profiles = inventory.profiles if inventory else [Profile(0, config)]
+        self._init_profiles()
+        self.run_summary: Dict[str, Any] = {}
+        self.metrics = RuntimeMetrics(config.metrics_interval, self._executor)
+        self._pipeline: Optional[StagedPipeline] = None
 
     def _init_checkers(self):
         """Initialize checkers based on config"""
@@ -42,45 +86,287 @@ class PulseEngine:
             else:
                 logger.warning(f"Unknown check: {check_name}")
 
-    async def check_target(self, target: Target) -> TargetResult:
-        """Run all checks for a single target"""
+    def _init_profiles(self):
+        """Build checkers once per inventory profile; profile 0 is the run config"""
+        self._profiles[0].checkers = self._checkers
+        for profile in self._profiles[1:]:
+            profile.checkers = {
+                name: self.CHECKERS[name](profile.config)
+                for name in profile.config.checks
+                if name in self.CHECKERS
+            }
+
+    def _profile(self, target: Target) -> Profile:
+        return self._profiles[target.profile]
+
+    @property
+    def check_names(self) -> List[str]:
+        """Checks run for any target, in declaration order"""
+        names: List[str] = []
+        for profile in self._profiles:
+            names.extend(
+                n for n in profile.config.checks if n in profile.checkers and n not in names
+            )
+        return names
+
+    async def check_target(
+        self, target: Target, cache: Optional[RunCache] = None
+    ) -> TargetResult:
+        """Run all checks for a single target
+
+        When a run cache is given, DNS/TCP/TLS sub-results are shared with
+        other targets of the same run that resolve to the same key.
+        """
         logger.debug(f"Checking target: {target}")
 
-        checks = []
         start_time = time.time()
 
-        # Run checks sequentially for a single target
-        for check_name in self.config.checks:
-            if check_name not in self._checkers:
-                continue
+        if self.config.all_ips:
+            return await self._check_all_ips(target, start_time, cache)
 
-            checker = self._checkers[check_name]
+        checks = await self._run_checks(target, self._profile(target).config.checks, cache)
+        total_duration = (time.time() - start_time) * 1000
 
-            # Skip TLS for non-TLS targets
-            if check_name == "tls" and not target.use_tls:
-                checks.append(
-                    CheckResult(
-                        name="TLS",
-                        duration_ms=0,
-                        status=Status.SKIPPED,
-                        details="Skipped (non-TLS target)",
-                    )
-                )
+        return TargetResult(
+            target=target, checks=checks, total_duration_ms=total_duration
+        )
+
+    async def _run_checks(
+        self, target: Target, check_names: List[str], cache: Optional[RunCache] = None
+    ) -> List[CheckResult]:
+        """Run the named checks for a single target as a dependency graph
+
+        Each check starts as soon as the checks it depends on have finished,
+        so independent checks (TLS, HTTP, certs) overlap. A failed critical
+        check drops everything downstream of it. Results keep the declared
+        order.
+        """
+        checkers = self._profile(target).checkers
+        names = [n for n in check_names if n in checkers]
+        nodes: Dict[str, asyncio.Future] = {}
+
+        async def run_node(check_name: str) -> Optional[CheckResult]:
+            for dep in self._dependencies(check_name, names):
+                dep_result = await nodes[dep]
+                if dep_result is None:
+                    return None
+                if self._stops_chain(dep, dep_result):
+                    logger.debug(f"Critical check {dep} failed, skipping {check_name}")
+                    return None
+
+            return await self._run_one(check_name, target, cache)
+
+        for check_name in names:
+            nodes[check_name] = asyncio.ensure_future(run_node(check_name))
+
+        try:
+            outcomes = await asyncio.gather(*nodes.values())
+        except BaseException:
+            for node in nodes.values():
+                node.cancel()
+            raise
+
+        return [result for result in outcomes if result is not None]
+
+    def _dependencies(self, check_name: str, check_names: List[str]) -> List[str]:
+        """Checks of this run that check_name has to wait for
+
+        A declared dependency that is not part of the run is replaced by its
+        own dependencies, so TLS still waits for DNS when TCP is not run.
+        """
+        deps: List[str] = []
+        pending = list(self._declaration(check_name).depends_on)
+        seen = set()
+        while pending:
+            dep = pending.pop(0)
+            if dep in seen:
                 continue
+            seen.add(dep)
+            if dep in check_names:
+                deps.append(dep)
+            elif dep in self.CHECKERS:
+                pending.extend(self._declaration(dep).depends_on)
+        return deps
+
+    def _declaration(self, check_name: str):
+        """Configured checker for check_name, or its class when not configured"""
+        return self._checkers.get(check_name) or self.CHECKERS[check_name]
+
+    async def _run_one(
+        self, check_name: str, target: Target, cache: Optional[RunCache] = None
+    ) -> CheckResult:
+        """Run one named check for target, with retries and sharing"""
+        # Skip TLS for non-TLS targets
+        if check_name == "tls" and not target.use_tls:
+            return CheckResult(
+                name="TLS",
+                duration_ms=0,
+                status=Status.SKIPPED,
+                details="Skipped (non-TLS target)",
+            )
+
+        profile = self._profile(target)
+        checker = profile.checkers[check_name]
+        with self.metrics.track(check_name):
+            if profile.semaphore is None:
+                return await self._run_shared(check_name, checker, target, cache)
+            async with profile.semaphore:
+                return await self._run_shared(check_name, checker, target, cache)
+
+    def _stops_chain(self, check_name: str, result: CheckResult) -> bool:
+        """Whether a failed check makes its dependents pointless"""
+        return result.is_failure and self._declaration(check_name).critical
+
+    def _share_key(self, check_name: str, target: Target) -> Optional[tuple]:
+        """Run cache key for a check, None if the check is per-target
+
+        Keys include the inventory profile: targets with different timeouts
+        or retries must not reuse each other's results.
+        """
+        if check_name == "dns":
+            # Without sharing, prefetch still resolves ahead, but per target
+            if self.config.share_results:
+                return ("dns", target.host, target.profile)
+            return ("dns", target.host, target.raw)
+        elif not self.config.share_results:
+            return None
+        elif check_name == "tcp":
+            return ("tcp", target.connect_host, target.port, target.profile)
+        elif check_name == "tls":
+            return ("tls", target.connect_host, target.port, target.host, target.profile)
+        return None
+
+    async def _run_shared(
+        self, check_name: str, checker, target: Target, cache: Optional[RunCache]
+    ) -> CheckResult:
+        """Run a check with retries, reusing a result shared within the run"""
+        key = self._share_key(check_name, target) if cache is not None else None
+        if key is None:
+            return await self._run_check_with_retries(checker, target)
+
+        result, owner, shared = await cache.get_or_run(
+            key, target.raw, lambda: self._run_check_with_retries(checker, target)
+        )
+        if not shared:
+            return result
 
-            # Run check with retries
-            result = await self._run_check_with_retries(checker, target)
-            checks.append(result)
+        if owner == target.raw:
+            # Resolved ahead of time by the prefetch stage on our behalf
+            return result.copy(metadata={**result.metadata, "prefetched": True})
 
-            # If check failed and it's critical, stop early
-            if result.is_failure and check_name in ["dns", "tcp"]:
-                logger.debug(f"Critical check {check_name} failed, stopping early")
-                break
+        return result.copy(
+            details=f"{result.details} (shared)",
+            metadata={**result.metadata, "shared": True, "shared_from": owner},
+        )
 
-        total_duration = (time.time() - start_time) * 1000
+    async def _check_all_ips(
+        self, target: Target, start_time: float, cache: Optional[RunCache] = None
+    ) -> TargetResult:
+        """Resolve target, then run the downstream chain against every address"""
+        profile = self._profile(target)
+        names = [n for n in profile.config.checks if n in profile.checkers]
+        if "dns" not in names:
+            names.insert(0, "dns")
+            dns_checker = profile.checkers.get("dns") or DNSChecker(profile.config)
+        else:
+            dns_checker = profile.checkers["dns"]
+        downstream = [n for n in names if n != "dns"]
+
+        dns_result = await self._run_shared("dns", dns_checker, target, cache)
+        checks = [dns_result] if "dns" in profile.config.checks else []
+
+        if dns_result.is_failure or not downstream:
+            return TargetResult(
+                target=target,
+                checks=checks or [dns_result],
+                total_duration_ms=(time.time() - start_time) * 1000,
+            )
+
+        ips = sorted(dns_result.metadata.get("ips", []))
+        semaphore = asyncio.Semaphore(self.config.per_target_concurrency)
+
+        async def check_ip(ip: str) -> TargetResult:
+            async with semaphore:
+                ip_start = time.time()
+                pinned = target.with_ip(ip)
+                ip_checks = await self._run_checks(pinned, downstream, cache)
+                return TargetResult(
+                    target=pinned,
+                    checks=ip_checks,
+                    total_duration_ms=(time.time() - ip_start) * 1000,
+                )
+
+        per_ip = await asyncio.gather(*(check_ip(ip) for ip in ips))
+        addresses = dict(zip(ips, per_ip))
+
+        for check_name in downstream:
+            rollup = self._rollup_check(check_name, addresses)
+            if rollup:
+                checks.append(rollup)
 
         return TargetResult(
-            target=target, checks=checks, total_duration_ms=total_duration
+            target=target,
+            checks=checks,
+            total_duration_ms=(time.time() - start_time) * 1000,
+            addresses=addresses,
+        )
+
+    def _rollup_check(
+        self, check_name: str, addresses: Dict[str, TargetResult]
+    ) -> Optional[CheckResult]:
+        """Combine one check across all addresses of a target"""
+        display_name = self._declaration(check_name).name
+        by_ip = {}
+        for ip, result in addresses.items():
+            check = result.get_check(display_name)
+            if check is not None:
+                by_ip[ip] = check
+
+        if not by_ip:
+            # Every address stopped before reaching this check
+            return CheckResult(
+                name=display_name,
+                duration_ms=0,
+                status=Status.SKIPPED,
+                details="Not reached on any address",
+            )
+
+        statuses = [c.status for c in by_ip.values()]
+        failed = [ip for ip, c in by_ip.items() if c.is_failure]
+        ok = sum(1 for s in statuses if s in (Status.SUCCESS, Status.WARNING))
+
+        if all(s == Status.SKIPPED for s in statuses):
+            status = Status.SKIPPED
+        elif failed:
+            status = Status.FAILURE
+        elif Status.WARNING in statuses:
+            status = Status.WARNING
+        else:
+            status = Status.SUCCESS
+
+        details = f"{ok}/{len(addresses)} addresses OK"
+        if status == Status.SKIPPED:
+            details = next(iter(by_ip.values())).details
+        elif failed:
+            details += f" (failed: {', '.join(failed[:3])}"
+            details += f" +{len(failed) - 3} more)" if len(failed) > 3 else ")"
+
+        return CheckResult(
+            name=display_name,
+            duration_ms=max(c.duration_ms for c in by_ip.values()),
+            status=status,
+            details=details,
+            error=by_ip[failed[0]].error if failed else None,
+            metadata={
+                "by_ip": {
+                    ip: {
+                        "status": c.status.value,
+                        "duration_ms": round(c.duration_ms, 2),
+                        "details": c.details,
+                    }
+                    for ip, c in by_ip.items()
+                }
+            },
         )
 
     async def _run_check_with_retries(self, checker, target: Target) -> CheckResult:
@@ -89,7 +375,8 @@ class PulseEngine:
             name=checker.name, duration_ms=0, status=Status.FAILURE, error="No result"
         )
 
-        for attempt in range(self.config.retries):
+        retries = checker.config.retries
+        for attempt in range(retries):
             try:
                 result = await checker.check(target)
                 if result.is_success:
@@ -104,21 +391,222 @@ class PulseEngine:
                     error=str(e),
                 )
 
-            if attempt < self.config.retries - 1:
+            if attempt < retries - 1:
                 await asyncio.sleep(0.5 * (attempt + 1))  # Exponential backoff
 
         return last_result
 
+    async def _prefetch_dns(
+        self, targets: List[Target], cache: RunCache, window: _PrefetchWindow
+    ) -> None:
+        """Resolve hostnames ahead of the connection workers
+
+        Results land in the run cache, where each target's DNS step picks
+        them up (or joins the in-flight lookup) instead of resolving again.
+        """
+        fallback: Dict[int, DNSChecker] = {}
+        semaphore = asyncio.Semaphore(self.config.dns_workers)
+        seen = set()
+        tasks = []
+
+        async def resolve(target: Target, key: tuple, checker) -> None:
+            async def lookup() -> CheckResult:
+                async with semaphore:
+                    return await self._run_check_with_retries(checker, target)
+
+            await cache.get_or_run(key, target.raw, lookup)
+
+        for index, target in enumerate(targets):
+            await window.wait_for_slot(index)
+            profile = self._profile(target)
+            checker = profile.checkers.get("dns")
+            if checker is None:
+                if not self.config.all_ips:
+                    # This target's profile never looks at DNS
+                    continue
+                if profile.index not in fallback:
+                    fallback[profile.index] = DNSChecker(profile.config)
+                checker = fallback[profile.index]
+            key = self._share_key("dns", target)
+            if key in seen:
+                continue
+            seen.add(key)
+            tasks.append(asyncio.ensure_future(resolve(target, key, checker)))
+
+        await asyncio.gather(*tasks, return_exceptions=True)
+
     async def check_targets(self, targets: List[Target]) -> List[TargetResult]:
         """Run checks for multiple targets concurrently"""
+        if self.config.metrics:
+            self.metrics.start()
+
+        try:
+            return await self._check_batch(targets)
+        finally:
+            if self.config.metrics:
+                await self.metrics.stop()
+                self.run_summary["runtime"] = self.metrics.summary()
+
+    @property
+    def batch_size(self) -> int:
+        """Targets per streamed batch"""
+        return self.config.batch_size or max(1000, self.config.workers * 100)
+
+    async def stream_targets(self, targets: Iterable[Target]) -> AsyncIterator[TargetResult]:
+        """check_targets over a lazy target source, yielding results in order
+
+        Targets are pulled batch_size at a time, so an expanded /8 never
+        exists as a list; only one batch of targets and results is alive at
+        once. Each batch runs through the same sweep/pipeline/worker-pool
+        paths as check_targets.
+        """
+        iterator = iter(targets)
+
+        async def batches() -> AsyncIterator[List[Target]]:
+            while True:
+                batch = list(itertools.islice(iterator, self.batch_size))
+                if not batch:
+                    return
+                yield batch
+
+        async for result in self.stream_batches(batches()):
+            yield result
+
+    async def stream_batches(
+        self, batches: AsyncIterable[List[Target]]
+    ) -> AsyncIterator[TargetResult]:
+        """Check each batch of targets as it arrives (see TargetFeed)"""
+        if self.config.metrics:
+            self.metrics.start()
+
+        try:
+            async for batch in batches:
+                for result in await self._check_batch(batch):
+                    yield result
+        finally:
+            if self.config.metrics:
+                await self.metrics.stop()
+                self.run_summary["runtime"] = self.metrics.summary()
+
+    async def _check_batch(self, targets: List[Target]) -> List[TargetResult]:
+        if self._can_sweep():
+            return await self._check_swept(targets)
+        if self.config.pipeline and not self.config.all_ips:
+            return await self._check_pipelined(targets)
+        return await self._check_concurrently(targets)
+
+    def _can_sweep(self) -> bool:
+        """Whether to use the connect sweep (opt-in with --sweep)
+
+        The sweep skips per-connection extras (TCP_INFO, kernel timing,
+        run-cache sharing, in-flight tracking), so it is only picked for
+        plain connect-only runs.
+        """
+        return (
+            self.config.sweep
+            and self.config.checks == ["tcp"]
+            and not self.config.all_ips
+            and not self.config.pipeline
+            and self.config.timing == "wall"
+            and len(self._profiles) == 1
+        )
+
+    async def _resolve_for_sweep(self, targets: List[Target]) -> List[Optional[str]]:
+        """One address per target; IP literals skip resolution"""
+        loop = asyncio.get_running_loop()
+        semaphore = asyncio.Semaphore(self.config.dns_workers)
+        preferred = socket.AF_INET6 if self.config.prefer_ipv6 else socket.AF_INET
+        resolved: Dict[str, Optional[str]] = {}
+
+        async def resolve(host: str) -> None:
+            async with semaphore:
+                try:
+                    infos = await loop.getaddrinfo(host, None, type=socket.SOCK_STREAM)
+                except OSError as e:
+                    logger.debug(f"Could not resolve {host}: {e}")
+                    resolved[host] = None
+                    return
+            matching = [info for info in infos if info[0] == preferred] or infos
+            resolved[host] = matching[0][4][0]
+
+        hosts = {t.host for t in targets if not (t.ip or t.is_ip)}
+        await asyncio.gather(*(resolve(h) for h in hosts))
+
+        return [resolved.get(t.connect_host, t.connect_host) for t in targets]
+
+    async def _check_swept(self, targets: List[Target]) -> List[TargetResult]:
+        """check_targets for --checks tcp through the selector sweep"""
+        addresses = await self._resolve_for_sweep(targets)
+        sweep = ConnectSweep(self.config.timeout, self.config.sweep_window)
+
+        loop = asyncio.get_running_loop()
+        result = await loop.run_in_executor(
+            self._executor, sweep.run, SweepResult(targets, addresses)
+        )
+
+        for attempt in range(1, self.config.retries):
+            failed = [
+                i
+                for i in range(len(result))
+                if result.status[i] != OPEN and addresses[i] is not None
+            ]
+            if not failed:
+                break
+            await asyncio.sleep(0.5 * attempt)
+            await loop.run_in_executor(self._executor, sweep.run, result, failed)
+
+        rate = len(result) / (result.wall_ms / 1000) if result.wall_ms else 0.0
+        logger.info(
+            f"Swept {len(result)} targets in {result.wall_ms:.0f}ms "
+            f"({rate:.0f} connects/s, window {sweep.window}): {result.counts()}"
+        )
+        return list(result.target_results(self.config.timeout))
+
+    async def _check_pipelined(self, targets: List[Target]) -> List[TargetResult]:
+        """check_targets through the staged pipeline"""
+        # The DNS stage takes the place of the prefetcher. One pipeline is
+        # kept per engine so stage stats add up across streamed batches.
+        cache = RunCache()
+        if self._pipeline is None:
+            self._pipeline = StagedPipeline(self)
+        pipeline = self._pipeline
+        pipeline.cache = cache
+        results = await pipeline.run(targets)
+        self.run_summary["pipeline"] = pipeline.summary()
+        logger.info(f"Shared sub-results: {cache.stats()}")
+        return results
+
+    async def _check_concurrently(self, targets: List[Target]) -> List[TargetResult]:
+        """check_targets with one worker pool across all checks"""
         semaphore = asyncio.Semaphore(self.config.workers)
+        prefetch = self.config.dns_prefetch and (
+            "dns" in self.check_names or self.config.all_ips
+        )
+        cache = RunCache() if self.config.share_results or prefetch else None
+        window = _PrefetchWindow(self.config.prefetch_window or self.config.workers * 4)
 
         async def check_with_limit(target: Target) -> TargetResult:
+            queued_at = time.time()
             async with semaphore:
-                return await self.check_target(target)
+                self.metrics.record_wait((time.time() - queued_at) * 1000)
+                await window.advance()
+                return await self.check_target(target, cache)
+
+        prefetcher = (
+            asyncio.ensure_future(self._prefetch_dns(targets, cache, window))
+            if prefetch
+            else None
+        )
 
         tasks = [check_with_limit(t) for t in targets]
-        results = await asyncio.gather(*tasks, return_exceptions=True)
+        try:
+            results = await asyncio.gather(*tasks, return_exceptions=True)
+        finally:
+            if prefetcher is not None:
+                prefetcher.cancel()
+
+        if cache is not None:
+            logger.info(f"Shared sub-results: {cache.stats()}")
 
         # Filter out exceptions
         valid_results = []
@@ -143,17 +631,63 @@ class PulseEngine:
 
         return valid_results
 
-    async def benchmark(self, target: Target, iterations: int = 10) -> BenchmarkResult:
-        """Run benchmark mode with multiple iterations"""
+    async def benchmark(
+        self, target: Target, iterations: int = 10, keep_runs: Optional[bool] = None
+    ) -> BenchmarkResult:
+        """Run benchmark mode with multiple iterations
+
+        Runs are reduced to per-phase samples; full per-run results are
+        kept only with keep_runs (default: config.keep_runs).
+        """
         logger.info(f"Running benchmark for {target} ({iterations} iterations)")
 
-        results = []
+        if keep_runs is None:
+            keep_runs = self.config.keep_runs
+        benchmark = BenchmarkResult(target=target, iterations=iterations, keep_runs=keep_runs)
         for i in range(iterations):
             logger.debug(f"Benchmark iteration {i + 1}/{iterations}")
-            result = await self.check_target(target)
-            results.append(result)
+            benchmark.add(await self.check_target(target))
+
+        return benchmark
+
+    async def benchmark_resolvers(self, targets: List[Target]) -> ResolverBenchmarkResult:
+        """Compare nameservers on the target hostnames"""
+        hosts = list(dict.fromkeys(t.host for t in targets))
+        logger.info(
+            f"Benchmarking resolvers {self.config.nameservers} on {len(hosts)} names "
+            f"({self.config.dns_samples} samples)"
+        )
+        return await NameserverBenchmark(self.config).run(
+            hosts,
+            self.config.nameservers,
+            samples=self.config.dns_samples,
+            record_type=self.config.dns_record_type,
+        )
+
+    async def tcp_ping(self, targets: List[Target]) -> TcpPingResult:
+        """Repeated bare TCP handshakes against every target"""
+        logger.info(
+            f"TCP ping: {self.config.tcp_ping_count} probes every "
+            f"{self.config.ping_interval}s to {len(targets)} targets"
+        )
+        return await TCPPing(self.config).run(
+            targets, self.config.tcp_ping_count, self.config.ping_interval
+        )
+
+    async def collect_certificates(self, targets: List[Target]) -> CertificateIndex:
+        """Handshake-only certificate inventory for many targets"""
+        logger.info(f"Collecting certificates from {len(targets)} targets")
+
+        index = CertificateIndex()
+        checker = CertChecker(self.config, index)
+        semaphore = asyncio.Semaphore(self.config.workers)
+
+        async def collect_with_limit(target: Target) -> None:
+            async with semaphore:
+                await checker.check(target)
 
-        return BenchmarkResult(target=target, iterations=iterations, results=results)
+        await asyncio.gather(*(collect_with_limit(t) for t in targets))
+        return index
 
     async def compare_targets(self, targets: List[Target]) -> List[TargetResult]:
         """Compare multiple targets side by side"""
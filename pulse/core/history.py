@@ -0,0 +1,302 @@
+"""SQLite history of check results with time rollups
+
+Every recorded check lands in a raw samples table and is folded into
+1m/1h/1d rollups, one row per (resolution, target, check, bucket)
+holding the bucket's DDSketch. Queries read rollups only and merge
+their sketches, so "p99 TLS for a host over 7 days" is 168 small rows
+whatever the sample rate was. Targets are keyed by address (host:port).
+
+The database runs in WAL mode and results are written in batched
+transactions, so a reader (pulse history) never blocks a recording run.
+Each batch takes the write lock up front and merges into the rollups as
+stored, so overlapping runs on one file add up rather than overwrite.
+"""
+
+import sqlite3
+import time
+from pathlib import Path
+from typing import Dict, Iterable, List, Optional, Sequence, Tuple
+
+from ..utils.sketch import DDSketch
+from .result import HistoryReport, HistorySeries, Status, TargetResult
+
+
+DEFAULT_PATH = "pulse-history.db"
+
+# Rollup resolutions in seconds
+RESOLUTIONS = {"1m": 60, "1h": 3600, "1d": 86400}
+
+# Seconds kept per table; raw samples are only needed for recent detail
+DEFAULT_RETENTION = {
+    "raw": 7 * 86400,
+    60: 30 * 86400,
+    3600: 400 * 86400,
+    86400: None,  # forever
+}
+
+# Queries use the finest resolution that needs at most this many buckets
+MAX_QUERY_BUCKETS = 1000
+
+_UNITS = {"s": 1, "m": 60, "h": 3600, "d": 86400, "w": 7 * 86400}
+
+_SCHEMA = """
+CREATE TABLE IF NOT EXISTS names (
+    id INTEGER PRIMARY KEY,
+    name TEXT NOT NULL UNIQUE
+);
+CREATE TABLE IF NOT EXISTS samples (
+    ts REAL NOT NULL,
+    target INTEGER NOT NULL,
+    check_name INTEGER NOT NULL,
+    duration_ms REAL NOT NULL,
+    status INTEGER NOT NULL
+);
+CREATE INDEX IF NOT EXISTS samples_series ON samples (target, check_name, ts);
+CREATE INDEX IF NOT EXISTS samples_ts ON samples (ts);
+CREATE TABLE IF NOT EXISTS rollups (
+    resolution INTEGER NOT NULL,
+    target INTEGER NOT NULL,
+    check_name INTEGER NOT NULL,
+    bucket INTEGER NOT NULL,
+    count INTEGER NOT NULL,
+    failures INTEGER NOT NULL,
+    sketch BLOB NOT NULL,
+    PRIMARY KEY (resolution, target, check_name, bucket)
+) WITHOUT ROWID;
+CREATE INDEX IF NOT EXISTS rollups_bucket ON rollups (resolution, bucket);
+"""
+
+# Status stored as a small integer
+_STATUS_CODES = {status: i for i, status in enumerate(Status)}
+
+
+def parse_duration(text: str) -> float:
+    """'90s', '30m', '12h', '7d', '2w' (or plain seconds) -> seconds"""
+    text = text.strip().lower()
+    unit = _UNITS.get(text[-1:])
+    try:
+        if unit is None:
+            return float(text)
+        return float(text[:-1]) * unit
+    except ValueError:
+        raise ValueError(f"Invalid duration '{text}' (use e.g. 30m, 12h, 7d)")
+
+
+class HistoryStore:
+    """Append-only check history in one SQLite file
+
+    With readonly=True the file must already exist and is only queried.
+    """
+
+    def __init__(self, path: str = DEFAULT_PATH, batch_size: int = 1000, readonly: bool = False):
+        self.path = path
+        self.batch_size = batch_size
+        if readonly:
+            if not Path(path).is_file():
+                raise FileNotFoundError(f"No history database at {path}")
+            self._db = sqlite3.connect(f"{Path(path).resolve().as_uri()}?mode=ro", uri=True)
+        else:
+            self._db = sqlite3.connect(path)
+            self._db.execute("PRAGMA journal_mode=WAL")
+            self._db.execute("PRAGMA synchronous=NORMAL")
+            self._db.executescript(_SCHEMA)
+        self._names: Dict[str, int] = {}
+        self._load_names()
+        self._pending: List[Tuple[float, str, str, float, Status]] = []
+
+    def _load_names(self) -> None:
+        rows = self._db.execute("SELECT id, name FROM names")
+        self._names = dict((name, id) for id, name in rows)
+
+    def _name_id(self, name: str) -> int:
+        id = self._names.get(name)
+        if id is None:
+            # Another run may have added the name since it was loaded
+            self._db.execute("INSERT OR IGNORE INTO names (name) VALUES (?)", (name,))
+            id = self._db.execute("SELECT id FROM names WHERE name = ?", (name,)).fetchone()[0]
+            self._names[name] = id
+        return id
+
+    def add(self, result: TargetResult) -> None:
+        """Queue a result's checks; written once batch_size are pending
+
+        Skipped checks never ran and carry no latency, so they are left out.
+        """
+        address = result.target.address
+        for check in result.checks:
+            if check.status is Status.SKIPPED:
+                continue
+            self._pending.append(
+                (check.timestamp, address, check.name, check.duration_ms, check.status)
+            )
+        if len(self._pending) >= self.batch_size:
+            self.flush()
+
+    def record(self, results: Iterable[TargetResult]) -> None:
+        """Add every result and write them"""
+        for result in results:
+            self.add(result)
+        self.flush()
+
+    def flush(self) -> None:
+        """Write pending samples and their rollups in one transaction"""
+        if not self._pending:
+            return
+        pending, self._pending = self._pending, []
+
+        try:
+            with self._db:
+                # Take the write lock before reading any rollup to merge into
+                self._db.execute("BEGIN IMMEDIATE")
+                rows = []
+                # Finest rollup built from the samples, coarser ones by merging it
+                finest = min(RESOLUTIONS.values())
+                groups: Dict[Tuple[int, int, int, int], list] = {}
+                for ts, address, check, duration_ms, status in pending:
+                    target_id = self._name_id(address)
+                    check_id = self._name_id(check)
+                    rows.append((ts, target_id, check_id, duration_ms, _STATUS_CODES[status]))
+                    key = (finest, target_id, check_id, int(ts // finest) * finest)
+                    group = groups.get(key)
+                    if group is None:
+                        group = groups[key] = [DDSketch(), 0]
+                    group[0].add(duration_ms)
+                    group[1] += status is Status.FAILURE
+
+                fine = list(groups.items())
+                for resolution in RESOLUTIONS.values():
+                    if resolution == finest:
+                        continue
+                    for (_, target_id, check_id, bucket), (sketch, failures) in fine:
+                        key = (resolution, target_id, check_id, bucket // resolution * resolution)
+                        group = groups.get(key)
+                        if group is None:
+                            group = groups[key] = [DDSketch(), 0]
+                        group[0].merge(sketch)
+                        group[1] += failures
+
+                self._db.executemany("INSERT INTO samples VALUES (?, ?, ?, ?, ?)", rows)
+                self._merge_rollups(groups)
+        except sqlite3.Error:
+            # Keep the batch for the next flush; cached ids may name rows
+            # that were rolled back
+            self._pending = pending + self._pending
+            self._load_names()
+            raise
+
+    def _stored(self, key: Tuple[int, int, int, int]) -> Tuple[DDSketch, int]:
+        """Rollup row for key as stored, or a new one"""
+        row = self._db.execute(
+            "SELECT sketch, failures FROM rollups "
+            "WHERE resolution = ? AND target = ? AND check_name = ? AND bucket = ?",
+            key,
+        ).fetchone()
+        if row is None:
+            return DDSketch(), 0
+        return DDSketch.from_bytes(row[0]), row[1]
+
+    def _merge_rollups(self, groups: Dict[Tuple[int, int, int, int], list]) -> None:
+        updates = []
+        for key, (sketch, failures) in groups.items():
+            stored, stored_failures = self._stored(key)
+            stored.merge(sketch)
+            failures += stored_failures
+            updates.append((*key, stored.count, failures, stored.to_bytes()))
+
+        self._db.executemany("INSERT OR REPLACE INTO rollups VALUES (?, ?, ?, ?, ?, ?, ?)", updates)
+
+    def prune(self, retention: Optional[Dict] = None, now: Optional[float] = None) -> int:
+        """Delete rows past their retention; returns rows removed"""
+        retention = {**DEFAULT_RETENTION, **(retention or {})}
+        now = time.time() if now is None else now
+        removed = 0
+        with self._db:
+            if retention["raw"] is not None:
+                removed += self._db.execute(
+                    "DELETE FROM samples WHERE ts < ?", (now - retention["raw"],)
+                ).rowcount
+            for resolution in RESOLUTIONS.values():
+                keep = retention.get(resolution)
+                if keep is not None:
+                    removed += self._db.execute(
+                        "DELETE FROM rollups WHERE resolution = ? AND bucket < ?",
+                        (resolution, now - keep),
+                    ).rowcount
+        return removed
+
+    def close(self) -> None:
+        """Flush and close the database"""
+        try:
+            self.flush()
+        finally:
+            self._db.close()
+
+    def __enter__(self) -> "HistoryStore":
+        return self
+
+    def __exit__(self, *exc) -> None:
+        self.close()
+
+    @staticmethod
+    def resolution_for(span: float, by: Optional[float] = None) -> int:
+        """Coarsest rollup no finer than needed for span (or bucket size by)"""
+        if by is not None:
+            fitting = [r for r in RESOLUTIONS.values() if r <= by and by % r == 0]
+            if not fitting:
+                raise ValueError("--by must be a multiple of 1m")
+            return max(fitting)
+        for resolution in RESOLUTIONS.values():
+            if span / resolution <= MAX_QUERY_BUCKETS:
+                return resolution
+        return max(RESOLUTIONS.values())
+
+    def query(
+        self,
+        addresses: Sequence[str],
+        checks: Optional[Sequence[str]] = None,
+        since: float = 86400,
+        until: Optional[float] = None,
+        by: Optional[float] = None,
+    ) -> HistoryReport:
+        """Merged statistics per (target, check) over [now - since, until]
+
+        since is a span in seconds; checks match case-insensitively and
+        default to every check recorded. With by, each series also holds
+        one point per by-second bucket.
+        """
+        self.flush()
+        # Names other runs recorded since this store was opened
+        self._load_names()
+        end = time.time() if until is None else until
+        start = end - since
+        resolution = self.resolution_for(since, by)
+        sql = (
+            "SELECT names.name, bucket, failures, sketch FROM rollups "
+            "JOIN names ON names.id = rollups.check_name "
+            "WHERE resolution = ? AND target = ? AND bucket >= ? AND bucket <= ?"
+        )
+        check_ids: List[int] = []
+        if checks:
+            wanted = {c.lower() for c in checks}
+            check_ids = [id for name, id in self._names.items() if name.lower() in wanted]
+            if not check_ids:
+                return HistoryReport(since=start, until=end, resolution=resolution, by=by)
+            sql += f" AND check_name IN ({', '.join('?' * len(check_ids))})"
+        sql += " ORDER BY names.name, bucket"
+
+        report = HistoryReport(since=start, until=end, resolution=resolution, by=by)
+        for address in addresses:
+            target_id = self._names.get(address)
+            if target_id is None:
+                continue
+            rows = self._db.execute(
+                sql, (resolution, target_id, int(start // resolution) * resolution, end, *check_ids)
+            )
+            series: Dict[str, HistorySeries] = {}
+            for check, bucket, failures, blob in rows:
+                entry = series.get(check)
+                if entry is None:
+                    entry = series[check] = HistorySeries(address, check)
+                entry.add(bucket, failures, DDSketch.from_bytes(blob), by)
+            report.series.extend(series.values())
+        return report
@@ -0,0 +1,220 @@
+"""Structured target inventories with per-target overrides
+
+An inventory is a JSON, YAML or TOML document:
+
+    defaults:                 # applied to every entry
+      timeout: 5
+    groups:
+      legacy:
+        timeout: 30
+        retries: 3
+        checks: [tcp, tls]
+        max_concurrency: 2
+        tags: [legacy]
+        targets: [old1.example.com, old2.example.com:8443]
+    targets:
+      - example.com
+      - target: api.example.com
+        expect_status: [200, 401]
+        tags: [billing]
+      - target: 10.20.0.0/24:22
+        group: legacy
+        checks: [tcp]
+
+Precedence is command line < defaults < group < entry; tags accumulate.
+Every distinct set of overrides is compiled once into a Profile, and
+targets carry their profile index, so per-check lookups never re-merge.
+"""
+
+import asyncio
+import json
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any, Dict, Iterator, List, Optional, Tuple
+
+from .config import Config
+from .ranges import expand_targets
+from .target import Target
+
+
+# Inventory keys and the Config field each one overrides
+OVERRIDES = {
+    "checks": "checks",
+    "timeout": "timeout",
+    "retries": "retries",
+    "deep": "deep_mode",
+    "http2": "check_http2",
+    "follow_redirects": "follow_redirects",
+    "expect_status": "expect_status",
+    "max_concurrency": None,  # per-profile cap, not a Config field
+}
+
+# Keys that describe an entry rather than override settings
+_ENTRY_KEYS = ("target", "group", "tags", "targets")
+
+
+@dataclass
+class Profile:
+    """Effective settings shared by every target with the same overrides"""
+
+    index: int
+    config: Config
+    max_concurrency: Optional[int] = None
+    checkers: Dict[str, Any] = field(default_factory=dict)
+    _semaphore: Optional[asyncio.Semaphore] = field(default=None, repr=False)
+
+    @property
+    def semaphore(self) -> Optional[asyncio.Semaphore]:
+        """Cap on checks in flight against this profile's targets"""
+        if self.max_concurrency and self._semaphore is None:
+            self._semaphore = asyncio.Semaphore(self.max_concurrency)
+        return self._semaphore
+
+
+def _freeze(value: Any) -> Any:
+    if isinstance(value, (list, tuple)):
+        return tuple(_freeze(v) for v in value)
+    return value
+
+
+class Inventory:
+    """Target specs with the index of their compiled Profile"""
+
+    def __init__(self, base: Config):
+        self.base = base
+        self.profiles: List[Profile] = [Profile(0, base)]
+        self._profile_index: Dict[tuple, int] = {(): 0}
+        self.entries: List[Tuple[str, int, Tuple[str, ...]]] = []
+
+    def compile(self, overrides: Dict[str, Any]) -> int:
+        """Index of the profile for a set of overrides, compiling it once"""
+        key = tuple(sorted((k, _freeze(v)) for k, v in overrides.items()))
+        index = self._profile_index.get(key)
+        if index is not None:
+            return index
+
+        fields = {OVERRIDES[k]: v for k, v in overrides.items() if OVERRIDES[k]}
+        if isinstance(fields.get("checks"), str):
+            fields["checks"] = [c.strip() for c in fields["checks"].split(",")]
+        if "checks" in fields:
+            fields["checks"] = list(fields["checks"])
+
+        index = len(self.profiles)
+        self.profiles.append(
+            Profile(
+                index,
+                replace(self.base, **fields),
+                max_concurrency=overrides.get("max_concurrency"),
+            )
+        )
+        self._profile_index[key] = index
+        return index
+
+    def add(
+        self,
+        spec: str,
+        overrides: Optional[Dict[str, Any]] = None,
+        tags: Tuple[str, ...] = (),
+    ) -> None:
+        """Add a target spec (host, URL or range) with its overrides"""
+        self.entries.append((spec, self.compile(overrides or {}), tuple(tags)))
+
+    def targets(self, shuffle: bool = False, seed: Optional[int] = None) -> Iterator[Target]:
+        """Every target, ranges expanded lazily, tagged with its profile"""
+        for spec, profile, tags in self.entries:
+            for target in expand_targets([spec], shuffle, seed):
+                target.profile = profile
+                target.tags = tags
+                yield target
+
+    def __len__(self) -> int:
+        return len(self.entries)
+
+
+def _read_document(path: Path) -> Any:
+    """Parse JSON, YAML or TOML by file extension"""
+    suffix = path.suffix.lower()
+    if suffix in (".yaml", ".yml"):
+        try:
+            import yaml
+        except ImportError:
+            raise ValueError("YAML inventories need PyYAML (pip install PyYAML)")
+        with open(path, "r", encoding="utf-8") as f:
+            return yaml.safe_load(f)
+    if suffix == ".toml":
+        try:
+            import tomllib
+        except ImportError:
+            try:
+                import tomli as tomllib
+            except ImportError:
+                raise ValueError("TOML inventories need Python 3.11+ or tomli")
+        with open(path, "rb") as f:
+            return tomllib.load(f)
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def _settings(source: str, data: Dict[str, Any]) -> Dict[str, Any]:
+    """Override keys of a mapping, rejecting unknown ones"""
+    unknown = set(data) - set(OVERRIDES) - set(_ENTRY_KEYS)
+    if unknown:
+        raise ValueError(f"{source}: unknown inventory keys: {', '.join(sorted(unknown))}")
+    return {k: v for k, v in data.items() if k in OVERRIDES}
+
+
+def _tags(value: Any) -> Tuple[str, ...]:
+    if not value:
+        return ()
+    if isinstance(value, str):
+        return (value,)
+    return tuple(str(v) for v in value)
+
+
+def load_inventory(path: str, base: Config) -> Inventory:
+    """Load and compile an inventory file (see module docstring)"""
+    file_path = Path(path)
+    data = _read_document(file_path)
+    if isinstance(data, list):
+        data = {"targets": data}
+    if not isinstance(data, dict):
+        raise ValueError(f"{path}: inventory must be a mapping or a list of targets")
+
+    inventory = Inventory(base)
+    defaults = _settings(f"{path} defaults", data.get("defaults") or {})
+    default_tags = _tags((data.get("defaults") or {}).get("tags"))
+
+    groups: Dict[str, Tuple[Dict[str, Any], Tuple[str, ...]]] = {}
+    for name, group in (data.get("groups") or {}).items():
+        group = group or {}
+        groups[name] = (
+            {**defaults, **_settings(f"{path} group {name}", group)},
+            default_tags + _tags(group.get("tags")),
+        )
+
+    def add_entry(item: Any, settings: Dict[str, Any], tags: Tuple[str, ...], source: str) -> None:
+        if isinstance(item, str):
+            inventory.add(item, settings, tags)
+            return
+        if not isinstance(item, dict) or "target" not in item:
+            raise ValueError(f"{source}: entries need a 'target' key")
+        group = item.get("group")
+        if group is not None:
+            if group not in groups:
+                raise ValueError(f"{source}: unknown group '{group}'")
+            settings, tags = groups[group]
+        inventory.add(
+            str(item["target"]),
+            {**settings, **_settings(source, item)},
+            tags + _tags(item.get("tags")),
+        )
+
+    for name, group in (data.get("groups") or {}).items():
+        settings, tags = groups[name]
+        for item in (group or {}).get("targets") or []:
+            add_entry(item, settings, tags, f"{path} group {name}")
+
+    for item in data.get("targets") or []:
+        add_entry(item, defaults, default_tags, path)
+
+    return inventory
@@ -0,0 +1,180 @@
+"""Runtime instrumentation: is pulse itself the bottleneck?"""
+
+import asyncio
+import os
+import sys
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import contextmanager
+from typing import Any, Dict, Iterator, List, Optional
+
+from ..utils.stats import mean, percentile
+
+
+def _executor_load(executor: Optional[ThreadPoolExecutor]) -> Optional[Dict[str, int]]:
+    """Queued work items and busy threads of a thread pool"""
+    if executor is None:
+        return None
+    threads = len(getattr(executor, "_threads", ()))
+    idle = getattr(getattr(executor, "_idle_semaphore", None), "_value", 0)
+    queue = getattr(executor, "_work_queue", None)
+    return {
+        "queued": queue.qsize() if queue is not None else 0,
+        "busy": max(0, threads - idle),
+        "threads": threads,
+    }
+
+
+def open_socket_count() -> Optional[int]:
+    """Sockets currently open in this process, None where unsupported"""
+    if not sys.platform.startswith("linux"):
+        return None
+    count = 0
+    try:
+        for fd in os.listdir("/proc/self/fd"):
+            try:
+                if os.readlink(f"/proc/self/fd/{fd}").startswith("socket:"):
+                    count += 1
+            except OSError:
+                continue
+    except OSError:
+        return None
+    return count
+
+
+# Counting sockets walks /proc/self/fd, so it runs at most this often
+SOCKET_SAMPLE_INTERVAL = 1.0
+
+
+def _distribution(values: List[float]) -> Dict[str, Optional[float]]:
+    ordered = sorted(values)
+    avg = mean(ordered)
+    return {
+        "avg": round(avg, 3) if avg is not None else None,
+        "p50": round(percentile(ordered, 50), 3) if ordered else None,
+        "p99": round(percentile(ordered, 99), 3) if ordered else None,
+        "max": round(ordered[-1], 3) if ordered else None,
+    }
+
+
+class RuntimeMetrics:
+    """Counters updated by the engine plus a periodic sampler
+
+    In-flight counters are always maintained (plain integer updates);
+    semaphore waits are only kept while sampling. The sampler task measures
+    event-loop lag and snapshots counters and executors between start() and
+    stop(). Open sockets are counted on a private thread, at most once per
+    SOCKET_SAMPLE_INTERVAL, so the walk over /proc never adds loop lag.
+    """
+
+    def __init__(self, interval: float = 0.1, executor: Optional[ThreadPoolExecutor] = None):
+        self.interval = interval
+        self.executor = executor
+        self.in_flight: Dict[str, int] = {}
+        self.semaphore_waits_ms: List[float] = []
+        self.samples: List[Dict[str, Any]] = []
+        self._task: Optional[asyncio.Task] = None
+        self._socket_counter: Optional[ThreadPoolExecutor] = None
+        self._socket_count: Optional[asyncio.Future] = None
+        self._open_sockets: Optional[int] = None
+
+    @contextmanager
+    def track(self, stage: str) -> Iterator[None]:
+        """Count the enclosed work as in flight for stage"""
+        self.in_flight[stage] = self.in_flight.get(stage, 0) + 1
+        try:
+            yield
+        finally:
+            self.in_flight[stage] -= 1
+
+    def record_wait(self, wait_ms: float) -> None:
+        """Time a target spent waiting for a worker slot"""
+        if self._task is not None:
+            self.semaphore_waits_ms.append(wait_ms)
+
+    def start(self) -> None:
+        """Start sampling on the running loop"""
+        if self._task is None:
+            self._socket_counter = ThreadPoolExecutor(max_workers=1)
+            self._task = asyncio.ensure_future(self._sample_loop())
+
+    async def stop(self) -> None:
+        """Stop sampling and take a final snapshot"""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+            # No lag figure: the final wakeup was not a scheduled one
+            self.samples.append(self._snapshot(asyncio.get_running_loop(), None))
+            self._socket_counter.shutdown(wait=False)
+            self._socket_counter = None
+
+    async def _sample_loop(self) -> None:
+        loop = asyncio.get_running_loop()
+        next_socket_count = loop.time()
+        while True:
+            scheduled = loop.time() + self.interval
+            await asyncio.sleep(self.interval)
+            lag_ms = max(0.0, (loop.time() - scheduled) * 1000)
+            self.samples.append(self._snapshot(loop, lag_ms))
+
+            if loop.time() >= next_socket_count and (
+                self._socket_count is None or self._socket_count.done()
+            ):
+                next_socket_count = loop.time() + SOCKET_SAMPLE_INTERVAL
+                self._socket_count = loop.run_in_executor(
+                    self._socket_counter, open_socket_count
+                )
+                self._socket_count.add_done_callback(self._store_socket_count)
+
+    def _store_socket_count(self, future: asyncio.Future) -> None:
+        if not future.cancelled() and future.exception() is None:
+            self._open_sockets = future.result()
+
+    def _snapshot(
+        self, loop: asyncio.AbstractEventLoop, lag_ms: Optional[float]
+    ) -> Dict[str, Any]:
+        return {
+            "loop_lag_ms": lag_ms,
+            "in_flight": dict(self.in_flight),
+            "engine_executor": _executor_load(self.executor),
+            "default_executor": _executor_load(getattr(loop, "_default_executor", None)),
+            "open_sockets": self._open_sockets,
+        }
+
+    def summary(self) -> Dict[str, Any]:
+        """Aggregate the samples for the run summary"""
+        stages = sorted({stage for s in self.samples for stage in s["in_flight"]})
+        in_flight = {}
+        for stage in stages:
+            counts = [s["in_flight"].get(stage, 0) for s in self.samples]
+            in_flight[stage] = {"avg": round(mean(counts), 2), "max": max(counts)}
+
+        executors = {}
+        for name in ("engine_executor", "default_executor"):
+            loads = [s[name] for s in self.samples if s[name] is not None]
+            if loads:
+                executors[name] = {
+                    "threads": max(load["threads"] for load in loads),
+                    "max_busy": max(load["busy"] for load in loads),
+                    "max_queued": max(load["queued"] for load in loads),
+                    "avg_queued": round(mean([load["queued"] for load in loads]), 2),
+                }
+
+        sockets = [s["open_sockets"] for s in self.samples if s["open_sockets"] is not None]
+
+        return {
+            "interval_ms": round(self.interval * 1000, 1),
+            "samples": len(self.samples),
+            "loop_lag_ms": _distribution(
+                [s["loop_lag_ms"] for s in self.samples if s["loop_lag_ms"] is not None]
+            ),
+            "in_flight": in_flight,
+            "executors": executors,
+            "semaphore_wait_ms": _distribution(self.semaphore_waits_ms),
+            "open_sockets": {"avg": round(mean(sockets), 1), "max": max(sockets)}
+            if sockets
+            else None,
+        }
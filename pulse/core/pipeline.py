@@ -0,0 +1,225 @@
+"""Staged pipeline execution with per-stage worker pools"""
+
+import asyncio
+import time
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional
+
+from .cache import RunCache
+from .result import CheckResult, Status, TargetResult
+from .target import Target
+from ..utils.logger import get_logger
+
+
+logger = get_logger(__name__)
+
+
+# Pipeline stages in execution order and the checks each one runs
+STAGES = [
+    ("dns", ["dns"]),
+    ("connect", ["tcp"]),
+    ("tls", ["tls", "certs"]),
+    ("http", ["http"]),
+]
+
+
+@dataclass
+class StageStats:
+    """Queue and service-time metrics for one stage"""
+
+    name: str
+    workers: int
+    queue_size: int
+    processed: int = 0
+    service_total_ms: float = 0.0
+    service_max_ms: float = 0.0
+    wait_total_ms: float = 0.0
+    depth_samples: int = 0
+    depth_total: int = 0
+    depth_max: int = 0
+
+    def sample_depth(self, depth: int) -> None:
+        self.depth_samples += 1
+        self.depth_total += depth
+        self.depth_max = max(self.depth_max, depth)
+
+    def record(self, service_ms: float, wait_ms: float) -> None:
+        self.processed += 1
+        self.service_total_ms += service_ms
+        self.service_max_ms = max(self.service_max_ms, service_ms)
+        self.wait_total_ms += wait_ms
+
+    def to_dict(self, wall_ms: float) -> dict:
+        """Convert to dictionary"""
+        processed = self.processed or 1
+        capacity = self.workers * wall_ms
+        return {
+            "workers": self.workers,
+            "queue_size": self.queue_size,
+            "processed": self.processed,
+            "avg_service_ms": round(self.service_total_ms / processed, 2),
+            "max_service_ms": round(self.service_max_ms, 2),
+            "avg_queue_wait_ms": round(self.wait_total_ms / processed, 2),
+            "avg_queue_depth": round(self.depth_total / (self.depth_samples or 1), 2),
+            "max_queue_depth": self.depth_max,
+            "utilization": round(self.service_total_ms / capacity * 100, 1) if capacity else 0.0,
+        }
+
+
+@dataclass
+class _Job:
+    """One target moving through the stages"""
+
+    index: int
+    target: Target
+    start_time: float
+    checks: List[CheckResult] = field(default_factory=list)
+    stopped: bool = False
+    enqueued_at: float = 0.0
+
+
+# End-of-stream marker passed down the queues
+_DONE = object()
+
+
+class StagedPipeline:
+    """Run checks as dns → connect → tls → http stages joined by bounded queues
+
+    Each stage has its own worker pool, so cheap DNS work never waits for a
+    slot held by a slow HTTP request and the bottleneck stage can be sized
+    independently. Queue depth and service time are recorded per stage.
+    """
+
+    def __init__(self, engine, cache: Optional[RunCache] = None):
+        self.engine = engine
+        self.config = engine.config
+        self.cache = cache
+        self.stats: Dict[str, StageStats] = {}
+        self.wall_ms = 0.0
+
+    def _stages(self) -> List[tuple]:
+        """Stages that have at least one configured check"""
+        stages = []
+        for name, checks in STAGES:
+            active = [c for c in self.engine.check_names if c in checks]
+            if active:
+                workers = self.config.stage_workers.get(name, self.config.workers)
+                queue_size = self.config.stage_queue_size or workers * 2
+                stages.append((name, active, max(1, workers), queue_size))
+        return stages
+
+    async def _worker(
+        self,
+        stage: StageStats,
+        check_names: List[str],
+        inbox: asyncio.Queue,
+        outbox: asyncio.Queue,
+    ) -> None:
+        """Take jobs from inbox, run this stage's checks, pass them on"""
+        while True:
+            job = await inbox.get()
+            if job is _DONE:
+                return
+
+            stage.sample_depth(inbox.qsize())
+            started = time.time()
+            wait_ms = (started - job.enqueued_at) * 1000
+
+            if not job.stopped:
+                checkers = self.engine._profile(job.target).checkers
+                for check_name in check_names:
+                    if check_name not in checkers:
+                        # Not part of this target's inventory profile
+                        continue
+                    try:
+                        result = await self.engine._run_one(check_name, job.target, self.cache)
+                    except Exception as e:
+                        logger.debug(f"Stage {stage.name} failed for {job.target}: {e}")
+                        result = CheckResult(
+                            name=self.engine._declaration(check_name).name,
+                            duration_ms=0,
+                            status=Status.FAILURE,
+                            error=str(e),
+                        )
+                    job.checks.append(result)
+
+                    if self.engine._stops_chain(check_name, result):
+                        job.stopped = True
+                        break
+
+            stage.record((time.time() - started) * 1000, wait_ms)
+
+            job.enqueued_at = time.time()
+            await outbox.put(job)
+
+    async def run(self, targets: List[Target]) -> List[TargetResult]:
+        """Run all targets through the pipeline
+
+        Stage stats and wall time accumulate over repeated runs.
+        """
+        stages = self._stages()
+        run_start = time.time()
+
+        queues = [asyncio.Queue(maxsize=queue_size) for _, _, _, queue_size in stages]
+        self._results: asyncio.Queue = asyncio.Queue()
+        for name, _, workers, queue_size in stages:
+            self.stats.setdefault(name, StageStats(name, workers, queue_size))
+
+        pools = []
+        for i, (name, check_names, workers, _) in enumerate(stages):
+            outbox = queues[i + 1] if i + 1 < len(queues) else self._results
+            pools.append(
+                [
+                    asyncio.ensure_future(
+                        self._worker(self.stats[name], check_names, queues[i], outbox)
+                    )
+                    for _ in range(workers)
+                ]
+            )
+
+        async def feed() -> None:
+            for index, target in enumerate(targets):
+                now = time.time()
+                await queues[0].put(_Job(index, target, start_time=now, enqueued_at=now))
+
+        async def drain() -> None:
+            # Close each stage once the previous one has fully finished
+            await feed()
+            for i, pool in enumerate(pools):
+                for _ in pool:
+                    await queues[i].put(_DONE)
+                await asyncio.gather(*pool)
+
+        declared = [self.engine._declaration(n).name for n in self.engine.check_names]
+        order = {name: i for i, name in enumerate(declared)}
+
+        results: List[Optional[TargetResult]] = [None] * len(targets)
+        try:
+            if stages:
+                await drain()
+            while not self._results.empty():
+                job = self._results.get_nowait()
+                job.checks.sort(key=lambda c: order.get(c.name, len(order)))
+                results[job.index] = TargetResult(
+                    target=job.target,
+                    checks=job.checks,
+                    total_duration_ms=(job.enqueued_at - job.start_time) * 1000,
+                )
+        finally:
+            for pool in pools:
+                for task in pool:
+                    task.cancel()
+
+        self.wall_ms += (time.time() - run_start) * 1000
+
+        return [
+            r if r is not None else TargetResult(target=targets[i], checks=[])
+            for i, r in enumerate(results)
+        ]
+
+    def summary(self) -> Dict[str, Any]:
+        """Per-stage metrics for the run summary"""
+        return {
+            "wall_ms": round(self.wall_ms, 2),
+            "stages": {name: stats.to_dict(self.wall_ms) for name, stats in self.stats.items()},
+        }
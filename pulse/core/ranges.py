@@ -0,0 +1,180 @@
+"""Lazy expansion of CIDR blocks, address ranges and port ranges
+
+Supported target syntax (ports default to 443):
+
+    10.20.0.0/16:443          every address in a CIDR block
+    [2001:db8::/120]:443      IPv6 blocks are bracketed when a port follows
+    10.0.0.1-10.0.0.254:22    inclusive address range
+    host:8000-8100            port range on one host
+    host:80,443,8000-8010     port list
+
+Nothing is materialized: a TargetRange maps an index to (address, port)
+arithmetically, and permutation() shuffles indices in constant memory.
+"""
+
+import ipaddress
+import random
+from typing import Iterable, Iterator, List, Optional, Tuple
+
+from .target import Target
+
+
+DEFAULT_PORT = 443
+
+
+def _parse_ports(spec: str) -> Optional[List[int]]:
+    """'80,443,8000-8010' -> ports, None if spec is not a port list"""
+    ports: List[int] = []
+    for part in spec.split(","):
+        low, _, high = part.partition("-")
+        if not low.isdigit() or (high and not high.isdigit()):
+            return None
+        first, last = int(low), int(high or low)
+        if not 0 < first <= last <= 65535:
+            return None
+        ports.extend(range(first, last + 1))
+    return list(dict.fromkeys(ports))
+
+
+def _split_port(spec: str) -> Tuple[str, Optional[str]]:
+    """Split 'host:ports' / '[v6]:ports'; hosts with bare colons keep them"""
+    if spec.startswith("["):
+        host, _, rest = spec[1:].partition("]")
+        return host, rest[1:] if rest.startswith(":") else None
+    if spec.count(":") == 1:
+        host, _, ports = spec.partition(":")
+        return host, ports
+    return spec, None
+
+
+def _address_block(host: str) -> Optional[Tuple[int, int, int]]:
+    """(first address, count, IP version) for a CIDR or a-b range"""
+    if "/" in host:
+        try:
+            network = ipaddress.ip_network(host, strict=False)
+        except ValueError:
+            return None
+        return int(network.network_address), network.num_addresses, network.version
+
+    if "-" in host:
+        low, _, high = host.partition("-")
+        try:
+            first = ipaddress.ip_address(low)
+            last = ipaddress.ip_address(high)
+        except ValueError:
+            # Hostnames with dashes are not ranges
+            return None
+        if first.version != last.version or last < first:
+            return None
+        return int(first), int(last) - int(first) + 1, first.version
+
+    return None
+
+
+class TargetRange:
+    """host-block × port-list expansion of one target spec"""
+
+    def __init__(
+        self,
+        spec: str,
+        ports: List[int],
+        host: Optional[str] = None,
+        block: Optional[Tuple[int, int, int]] = None,
+    ):
+        self.spec = spec
+        self.ports = ports
+        self.host = host
+        self.block = block
+        self.hosts = block[1] if block else 1
+
+    @property
+    def size(self) -> int:
+        """Number of targets (may exceed sys.maxsize for IPv6 blocks)"""
+        return self.hosts * len(self.ports)
+
+    def _address(self, index: int) -> str:
+        if self.block is None:
+            return self.host
+        first, _, version = self.block
+        if version == 6:
+            return str(ipaddress.IPv6Address(first + index))
+        return str(ipaddress.IPv4Address(first + index))
+
+    def target(self, index: int) -> Target:
+        """The index-th target, host-major"""
+        host_index, port_index = divmod(index, len(self.ports))
+        return Target.from_parts(self._address(host_index), self.ports[port_index])
+
+    def __iter__(self) -> Iterator[Target]:
+        return self.iter()
+
+    def iter(self, shuffle: bool = False, seed: Optional[int] = None) -> Iterator[Target]:
+        """Targets in order, or in a seeded pseudo-random order"""
+        indices = permutation(self.size, seed) if shuffle else range(self.size)
+        for index in indices:
+            yield self.target(index)
+
+
+def parse_range(spec: str) -> Optional[TargetRange]:
+    """TargetRange for a range spec, None for plain hosts and URLs"""
+    spec = spec.strip()
+    if "://" in spec:
+        return None
+
+    host, port_spec = _split_port(spec)
+    ports = [DEFAULT_PORT]
+    if port_spec is not None:
+        ports = _parse_ports(port_spec)
+        if ports is None:
+            return None
+
+    block = _address_block(host)
+    if block is not None:
+        return TargetRange(spec, ports, block=block)
+    if len(ports) > 1 or (port_spec and "-" in port_spec):
+        return TargetRange(spec, ports, host=host)
+    return None
+
+
+def _mix(value: int) -> int:
+    # splitmix64 finalizer
+    value = (value ^ (value >> 30)) * 0xBF58476D1CE4E5B9 & 0xFFFFFFFFFFFFFFFF
+    value = (value ^ (value >> 27)) * 0x94D049BB133111EB & 0xFFFFFFFFFFFFFFFF
+    return value ^ (value >> 31)
+
+
+def permutation(count: int, seed: Optional[int] = None) -> Iterator[int]:
+    """Every integer in range(count) exactly once, in pseudo-random order
+
+    A 4-round Feistel network is a bijection on [0, 4**half); walking that
+    domain in order and keeping outputs below count yields a permutation of
+    range(count) with O(1) memory and at most 4x wasted rounds.
+    """
+    if count <= 2:
+        yield from range(count)
+        return
+
+    half = ((count - 1).bit_length() + 1) // 2
+    mask = (1 << half) - 1
+    rng = random.Random(seed)
+    keys = [rng.getrandbits(64) for _ in range(4)]
+
+    for value in range(1 << (2 * half)):
+        left, right = value >> half, value & mask
+        for key in keys:
+            left, right = right, left ^ (_mix(right ^ key) & mask)
+        value = (left << half) | right
+        if value < count:
+            yield value
+
+
+def expand_targets(
+    specs: Iterable[str], shuffle: bool = False, seed: Optional[int] = None
+) -> Iterator[Target]:
+    """Targets for specs, expanding ranges on the fly"""
+    for spec in specs:
+        target_range = parse_range(spec)
+        if target_range is None:
+            yield Target(spec)
+        else:
+            yield from target_range.iter(shuffle, seed)
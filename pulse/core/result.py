@@ -1,10 +1,29 @@
 """Result classes for pulse checks"""
 
+import sys
+import time
+from array import array
 from dataclasses import dataclass, field
-from typing import Optional, Dict, Any, List
+from types import MappingProxyType
+from typing import Optional, Dict, Any, List, Mapping, Tuple
 from datetime import datetime
 from enum import Enum
 
+from ..utils.sketch import DDSketch
+from ..utils.stats import (
+    SKETCH_THRESHOLD,
+    SampleStats,
+    describe,
+    describe_sketch,
+    mdev,
+    mean,
+    percentile,
+)
+
+
+# Sample column of BenchmarkResult holding whole-run durations
+TOTAL = "total"
+
 
 class Status(Enum):
     """Check status enumeration"""
@@ -15,29 +34,77 @@ class Status(Enum):
     SKIPPED = "skipped"
 
 
-@dataclass
+# Shared read-only stand-in for empty metadata and addresses, so results
+# without any do not each carry their own empty dict
+_EMPTY: Mapping[str, Any] = MappingProxyType({})
+
+
+def format_timestamp(epoch: float) -> str:
+    """Local ISO 8601 time for a result's epoch timestamp"""
+    return datetime.fromtimestamp(epoch).isoformat()
+
+
 class CheckResult:
-    """Result of a single check"""
+    """Result of a single check
+
+    Slotted, since large runs hold millions of these until output. The
+    timestamp is epoch seconds and only becomes ISO 8601 in to_dict;
+    metadata is a read-only empty mapping unless the check passed one.
+    """
+
+    __slots__ = ("name", "duration_ms", "status", "details", "error", "metadata", "timestamp")
 
-    name: str
-    duration_ms: float
-    status: Status
-    details: str = ""
-    error: Optional[str] = None
-    metadata: Dict[str, Any] = field(default_factory=dict)
-    timestamp: datetime = field(default_factory=datetime.now)
+    def __init__(
+        self,
+        name: str,
+        duration_ms: float,
+        status: Status,
+        details: str = "",
+        error: Optional[str] = None,
+        metadata: Optional[Dict[str, Any]] = None,
+        timestamp: Optional[float] = None,
+    ):
+        self.name = sys.intern(name)
+        self.duration_ms = duration_ms
+        self.status = status
+        self.details = details
+        self.error = error
+        self.metadata: Mapping[str, Any] = metadata if metadata else _EMPTY
+        self.timestamp = time.time() if timestamp is None else timestamp
 
     @property
     def is_success(self) -> bool:
-        return self.status == Status.SUCCESS
+        return self.status is Status.SUCCESS
 
     @property
     def is_warning(self) -> bool:
-        return self.status == Status.WARNING
+        return self.status is Status.WARNING
 
     @property
     def is_failure(self) -> bool:
-        return self.status == Status.FAILURE
+        return self.status is Status.FAILURE
+
+    def _values(self) -> tuple:
+        return tuple(getattr(self, name) for name in self.__slots__)
+
+    def copy(self, **changes) -> "CheckResult":
+        """Shallow copy with some fields replaced"""
+        fields = dict(zip(self.__slots__, self._values()))
+        fields.update(changes)
+        return CheckResult(**fields)
+
+    def __eq__(self, other) -> bool:
+        if isinstance(other, CheckResult):
+            return self._values() == other._values()
+        return NotImplemented
+
+    __hash__ = None
+
+    def __repr__(self) -> str:
+        return (
+            f"CheckResult(name={self.name!r}, duration_ms={self.duration_ms!r}, "
+            f"status={self.status}, details={self.details!r}, error={self.error!r})"
+        )
 
     def to_dict(self) -> dict:
         """Convert to dictionary"""
@@ -47,47 +114,78 @@ class CheckResult:
             "status": self.status.value,
             "details": self.details,
             "error": self.error,
-            "metadata": self.metadata,
-            "timestamp": self.timestamp.isoformat(),
+            "metadata": self.metadata or {},
+            "timestamp": format_timestamp(self.timestamp),
         }
 
 
-@dataclass
 class TargetResult:
-    """Result of checking a target"""
+    """Result of checking a target
 
-    target: Any  # Target object
-    checks: List[CheckResult] = field(default_factory=list)
-    total_duration_ms: float = 0.0
-    timestamp: datetime = field(default_factory=datetime.now)
+    Status counts are tallied in one pass on first use and cached;
+    appending to checks invalidates them.
+    """
+
+    __slots__ = ("target", "checks", "total_duration_ms", "timestamp", "addresses", "_counts")
+
+    def __init__(
+        self,
+        target: Any,  # Target object
+        checks: Optional[List[CheckResult]] = None,
+        total_duration_ms: float = 0.0,
+        timestamp: Optional[float] = None,
+        addresses: Optional[Dict[str, "TargetResult"]] = None,
+    ):
+        self.target = target
+        self.checks: List[CheckResult] = checks if checks is not None else []
+        self.total_duration_ms = total_duration_ms
+        self.timestamp = time.time() if timestamp is None else timestamp
+        self.addresses: Mapping[str, "TargetResult"] = addresses if addresses else _EMPTY
+        self._counts: Optional[Tuple[int, int, int, int]] = None
 
-    def __post_init__(self):
         if not self.total_duration_ms and self.checks:
             self.total_duration_ms = sum(c.duration_ms for c in self.checks)
 
+    def _tally(self) -> Tuple[int, int, int, int]:
+        """(success, warning, failure, total) over checks"""
+        counts = self._counts
+        if counts is None or counts[3] != len(self.checks):
+            success = warning = failure = 0
+            for check in self.checks:
+                status = check.status
+                if status is Status.SUCCESS:
+                    success += 1
+                elif status is Status.WARNING:
+                    warning += 1
+                elif status is Status.FAILURE:
+                    failure += 1
+            counts = self._counts = (success, warning, failure, len(self.checks))
+        return counts
+
     @property
     def has_failures(self) -> bool:
-        return any(c.is_failure for c in self.checks)
+        return self._tally()[2] > 0
 
     @property
     def has_warnings(self) -> bool:
-        return any(c.is_warning for c in self.checks)
+        return self._tally()[1] > 0
 
     @property
     def is_healthy(self) -> bool:
-        return all(c.is_success for c in self.checks)
+        counts = self._tally()
+        return counts[0] == counts[3]
 
     @property
     def success_count(self) -> int:
-        return sum(1 for c in self.checks if c.is_success)
+        return self._tally()[0]
 
     @property
     def warning_count(self) -> int:
-        return sum(1 for c in self.checks if c.is_warning)
+        return self._tally()[1]
 
     @property
     def failure_count(self) -> int:
-        return sum(1 for c in self.checks if c.is_failure)
+        return self._tally()[2]
 
     def get_check(self, name: str) -> Optional[CheckResult]:
         """Get check by name"""
@@ -96,9 +194,12 @@ class TargetResult:
                 return check
         return None
 
+    def __repr__(self) -> str:
+        return f"TargetResult(target={self.target!r}, checks={self.checks!r})"
+
     def to_dict(self) -> dict:
         """Convert to dictionary"""
-        return {
+        data = {
             "target": str(self.target),
             "address": self.target.address,
             "checks": [c.to_dict() for c in self.checks],
@@ -106,51 +207,609 @@ class TargetResult:
             "is_healthy": self.is_healthy,
             "has_failures": self.has_failures,
             "has_warnings": self.has_warnings,
-            "timestamp": self.timestamp.isoformat(),
+            "timestamp": format_timestamp(self.timestamp),
         }
 
+        if getattr(self.target, "tags", None):
+            data["tags"] = list(self.target.tags)
+
+        if self.addresses:
+            data["addresses"] = {
+                ip: {
+                    "checks": [c.to_dict() for c in result.checks],
+                    "total_duration_ms": round(result.total_duration_ms, 2),
+                    "is_healthy": result.is_healthy,
+                }
+                for ip, result in self.addresses.items()
+            }
+
+        return data
+
 
 @dataclass
 class BenchmarkResult:
-    """Result of benchmark runs"""
+    """Result of benchmark runs
+
+    Each run is reduced to samples in array('d') columns, "total" plus one
+    per check, and a healthy flag, so a long benchmark holds numbers rather
+    than check objects. Full TargetResults are kept in results only when
+    keep_runs is set (or when results are passed in).
+
+    Every phase also feeds a DDSketch. Columns stop growing at
+    sample_limit samples, after which statistics come from the sketch, so
+    an unbounded run uses bounded memory; sketches (and so results) from
+    separate processes or time windows combine with merge().
+    """
 
     target: Any
     iterations: int
     results: List[TargetResult] = field(default_factory=list)
+    keep_runs: bool = False
+    sample_limit: int = SKETCH_THRESHOLD
+    samples: Dict[str, array] = field(default_factory=dict)
+    sketches: Dict[str, DDSketch] = field(default_factory=dict)
+    healthy: array = field(default_factory=lambda: array("B"))
+    runs: int = 0
+    healthy_runs: int = 0
+    _stats: Dict[str, SampleStats] = field(default_factory=dict, repr=False)
+
+    def __post_init__(self):
+        for result in self.results:
+            self._record(result)
+
+    def _sample(self, phase: str, value: float) -> None:
+        sketch = self.sketches.get(phase)
+        if sketch is None:
+            sketch = self.sketches[phase] = DDSketch()
+            self.samples[phase] = array("d")
+        sketch.add(value)
+        column = self.samples[phase]
+        if len(column) < self.sample_limit:
+            column.append(value)
+
+    def _record(self, result: TargetResult) -> None:
+        self._sample(TOTAL, result.total_duration_ms)
+        for check in result.checks:
+            self._sample(check.name, check.duration_ms)
+        if len(self.healthy) < self.sample_limit:
+            self.healthy.append(result.is_healthy)
+        self.runs += 1
+        self.healthy_runs += result.is_healthy
+        self._stats.clear()
+
+    def add(self, result: TargetResult) -> None:
+        """Record one run"""
+        self._record(result)
+        if self.keep_runs:
+            self.results.append(result)
+
+    def merge(self, other: "BenchmarkResult") -> None:
+        """Fold in the runs of another benchmark of the same target"""
+        for phase, sketch in other.sketches.items():
+            if phase not in self.sketches:
+                self.sketches[phase] = DDSketch(sketch.relative_accuracy, sketch.max_bins)
+                self.samples[phase] = array("d")
+            self.sketches[phase].merge(sketch)
+            column = self.samples[phase]
+            column.extend(other.samples[phase][: max(self.sample_limit - len(column), 0)])
+        self.healthy.extend(other.healthy[: max(self.sample_limit - len(self.healthy), 0)])
+        self.iterations += other.iterations
+        self.runs += other.runs
+        self.healthy_runs += other.healthy_runs
+        if self.keep_runs:
+            self.results.extend(other.results)
+        self._stats.clear()
+
+    def stats(self, phase: str = TOTAL) -> SampleStats:
+        """Statistics of one phase, computed once per set of runs
+
+        Exact from the sample column while it holds every sample, from
+        the phase's sketch once runs exceed sample_limit.
+        """
+        if phase not in self._stats:
+            column = self.samples.get(phase, ())
+            sketch = self.sketches.get(phase)
+            if sketch is not None and sketch.count > len(column):
+                self._stats[phase] = describe_sketch(sketch)
+            else:
+                self._stats[phase] = describe(column)
+        return self._stats[phase]
 
     @property
     def avg_duration_ms(self) -> float:
-        if not self.results:
-            return 0.0
-        return sum(r.total_duration_ms for r in self.results) / len(self.results)
+        return self.stats().mean or 0.0
 
     @property
     def min_duration_ms(self) -> float:
-        if not self.results:
-            return 0.0
-        return min(r.total_duration_ms for r in self.results)
+        return self.stats().min or 0.0
 
     @property
     def max_duration_ms(self) -> float:
-        if not self.results:
-            return 0.0
-        return max(r.total_duration_ms for r in self.results)
+        return self.stats().max or 0.0
 
     @property
     def success_rate(self) -> float:
-        if not self.results:
+        if not self.runs:
             return 0.0
-        healthy = sum(1 for r in self.results if r.is_healthy)
-        return (healthy / len(self.results)) * 100
+        return (self.healthy_runs / self.runs) * 100
 
     def to_dict(self) -> dict:
         """Convert to dictionary"""
-        return {
+        data = {
             "target": str(self.target),
             "iterations": self.iterations,
             "avg_duration_ms": round(self.avg_duration_ms, 2),
             "min_duration_ms": round(self.min_duration_ms, 2),
             "max_duration_ms": round(self.max_duration_ms, 2),
             "success_rate": round(self.success_rate, 2),
-            "runs": [r.to_dict() for r in self.results],
+            "phases": {
+                phase: {**self.stats(phase).to_dict(), "sketch": sketch.to_dict()}
+                for phase, sketch in self.sketches.items()
+            },
+        }
+        if self.results:
+            data["runs"] = [r.to_dict() for r in self.results]
+        return data
+
+    def to_rows(self) -> tuple:
+        """CSV header and rows: one row per phase"""
+        header = [
+            "Phase",
+            "Samples",
+            "Mean (ms)",
+            "Stddev (ms)",
+            "p50 (ms)",
+            "p90 (ms)",
+            "p99 (ms)",
+            "CI Low (ms)",
+            "CI High (ms)",
+        ]
+        rows = []
+        for phase in self.samples:
+            data = self.stats(phase).to_dict()
+            rows.append(
+                [
+                    phase,
+                    data["count"],
+                    data["mean"],
+                    data["stddev"],
+                    data["p50"],
+                    data["p90"],
+                    data["p99"],
+                    *data["ci"],
+                ]
+            )
+        return header, rows
+
+
+@dataclass
+class NameserverStats:
+    """Latency and answer statistics for one nameserver"""
+
+    label: str
+    address: str
+    port: int = 53
+    sent: int = 0
+    timeouts: int = 0
+    errors: int = 0
+    latencies_ms: List[float] = field(default_factory=list)
+    consistent: int = 0
+
+    @property
+    def answered(self) -> int:
+        return len(self.latencies_ms)
+
+    @property
+    def timeout_rate(self) -> float:
+        if not self.sent:
+            return 0.0
+        return (self.timeouts / self.sent) * 100
+
+    @property
+    def consistency(self) -> float:
+        """Percent of answers matching the majority answer across servers"""
+        if not self.answered:
+            return 0.0
+        return (self.consistent / self.answered) * 100
+
+    def quantile(self, q: float) -> Optional[float]:
+        return percentile(sorted(self.latencies_ms), q)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        ordered = sorted(self.latencies_ms)
+        p50 = percentile(ordered, 50)
+        p99 = percentile(ordered, 99)
+        return {
+            "label": self.label,
+            "address": self.address,
+            "port": self.port,
+            "sent": self.sent,
+            "answered": self.answered,
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "timeout_rate": round(self.timeout_rate, 2),
+            "p50_ms": round(p50, 2) if p50 is not None else None,
+            "p99_ms": round(p99, 2) if p99 is not None else None,
+            "min_ms": round(ordered[0], 2) if ordered else None,
+            "max_ms": round(ordered[-1], 2) if ordered else None,
+            "consistency": round(self.consistency, 2),
+        }
+
+
+@dataclass
+class ResolverBenchmarkResult:
+    """Result of comparing nameservers on the same queries"""
+
+    queries: List[str]
+    record_type: str
+    samples: int
+    servers: List[NameserverStats] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "queries": self.queries,
+            "record_type": self.record_type,
+            "samples": self.samples,
+            "servers": [s.to_dict() for s in self.servers],
+        }
+
+    def to_rows(self) -> tuple:
+        """CSV header and rows"""
+        header = [
+            "Server",
+            "Address",
+            "Sent",
+            "Timeouts",
+            "Timeout Rate",
+            "p50 (ms)",
+            "p99 (ms)",
+            "Consistency",
+        ]
+        rows = []
+        for data in (s.to_dict() for s in self.servers):
+            rows.append(
+                [
+                    data["label"],
+                    f"{data['address']}:{data['port']}",
+                    data["sent"],
+                    data["timeouts"],
+                    data["timeout_rate"],
+                    data["p50_ms"],
+                    data["p99_ms"],
+                    data["consistency"],
+                ]
+            )
+        return header, rows
+
+
+@dataclass
+class PingSeries:
+    """Handshake samples for one target in TCP ping mode
+
+    samples holds one entry per scheduled probe in send order: the
+    handshake time in ms, or None when no handshake completed. Probes that
+    timed out are counted in timeouts and make up loss; refused or failed
+    connects are counted in errors and are not loss, since the network did
+    answer (or was never reached).
+    """
+
+    target: str
+    address: str
+    port: int
+    samples: List[Optional[float]] = field(default_factory=list)
+    sent_at: List[float] = field(default_factory=list)
+    timeouts: int = 0
+    errors: int = 0
+
+    @property
+    def sent(self) -> int:
+        return len(self.samples)
+
+    @property
+    def received(self) -> List[float]:
+        return [s for s in self.samples if s is not None]
+
+    @property
+    def loss(self) -> float:
+        """Percent of probes that timed out"""
+        if not self.sent:
+            return 0.0
+        return self.timeouts / self.sent * 100
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        received = self.received
+        ordered = sorted(received)
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        return {
+            "target": self.target,
+            "address": self.address,
+            "port": self.port,
+            "sent": self.sent,
+            "received": len(received),
+            "timeouts": self.timeouts,
+            "errors": self.errors,
+            "loss": round(self.loss, 2),
+            "min_ms": ms(ordered[0] if ordered else None),
+            "avg_ms": ms(mean(received)),
+            "max_ms": ms(ordered[-1] if ordered else None),
+            "mdev_ms": ms(mdev(received)),
+            "p50_ms": ms(percentile(ordered, 50)),
+            "p90_ms": ms(percentile(ordered, 90)),
+            "p99_ms": ms(percentile(ordered, 99)),
+            "series": [
+                {"seq": seq, "offset_ms": round(offset, 3), "rtt_ms": ms(rtt)}
+                for seq, (offset, rtt) in enumerate(zip(self.sent_at, self.samples))
+            ],
+        }
+
+
+@dataclass
+class TcpPingResult:
+    """Result of TCP ping mode across one or more targets"""
+
+    count: int
+    interval: float
+    targets: List[PingSeries] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "count": self.count,
+            "interval": self.interval,
+            "targets": [t.to_dict() for t in self.targets],
         }
+
+    def to_rows(self) -> tuple:
+        """CSV header and rows: one row per probe"""
+        header = ["Target", "Address", "Seq", "Offset (ms)", "RTT (ms)"]
+        rows = []
+        for data in (t.to_dict() for t in self.targets):
+            for sample in data["series"]:
+                rows.append(
+                    [
+                        data["target"],
+                        f"{data['address']}:{data['port']}",
+                        sample["seq"],
+                        sample["offset_ms"],
+                        sample["rtt_ms"],
+                    ]
+                )
+        return header, rows
+
+
+@dataclass
+class HistorySeries:
+    """One check on one target over a history query window"""
+
+    target: str
+    check: str
+    sketch: DDSketch = field(default_factory=DDSketch)
+    failures: int = 0
+    # bucket start (epoch seconds) -> [sketch, failures], with --by
+    points: Dict[int, list] = field(default_factory=dict)
+
+    def add(self, bucket: int, failures: int, sketch: DDSketch, by: Optional[float]) -> None:
+        """Fold in one rollup row"""
+        self.sketch.merge(sketch)
+        self.failures += failures
+        if by:
+            start = int(bucket // by * by)
+            point = self.points.get(start)
+            if point is None:
+                self.points[start] = [sketch, failures]
+            else:
+                point[0].merge(sketch)
+                point[1] += failures
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        sketch = self.sketch
+
+        def ms(value: Optional[float]) -> Optional[float]:
+            return round(value, 3) if value is not None else None
+
+        return {
+            "target": self.target,
+            "check": self.check,
+            "count": sketch.count,
+            "failures": self.failures,
+            "mean_ms": ms(sketch.mean),
+            "min_ms": ms(sketch.quantile(0)),
+            "p50_ms": ms(sketch.quantile(50)),
+            "p90_ms": ms(sketch.quantile(90)),
+            "p99_ms": ms(sketch.quantile(99)),
+            "max_ms": ms(sketch.quantile(100)),
+            "points": [
+                {
+                    "time": format_timestamp(start),
+                    "count": point[0].count,
+                    "failures": point[1],
+                    "p50_ms": ms(point[0].quantile(50)),
+                    "p99_ms": ms(point[0].quantile(99)),
+                }
+                for start, point in sorted(self.points.items())
+            ],
+        }
+
+
+@dataclass
+class HistoryReport:
+    """Result of a pulse history query"""
+
+    since: float
+    until: float
+    resolution: int
+    by: Optional[float] = None
+    series: List[HistorySeries] = field(default_factory=list)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "since": format_timestamp(self.since),
+            "until": format_timestamp(self.until),
+            "resolution_s": self.resolution,
+            "series": [s.to_dict() for s in self.series],
+        }
+
+    def to_rows(self) -> tuple:
+        """CSV header and rows: one per series, or per point with --by"""
+        header = ["Target", "Check", "Time", "Samples", "Failures", "p50 (ms)", "p99 (ms)"]
+        rows = []
+        for data in (s.to_dict() for s in self.series):
+            points = data["points"] or [{**data, "time": ""}]
+            for point in points:
+                rows.append(
+                    [
+                        data["target"],
+                        data["check"],
+                        point["time"],
+                        point["count"],
+                        point["failures"],
+                        point["p50_ms"],
+                        point["p99_ms"],
+                    ]
+                )
+        return header, rows
+
+
+def _pct_label(q: float) -> str:
+    """Label for percentile q: 50.0 -> p50, 99.9 -> p99.9"""
+    return f"p{q:g}"
+
+
+@dataclass
+class CheckDiff:
+    """One check's latency and failures in a baseline run against a current run
+
+    target is None for the row covering every target present in both runs.
+    baseline/current map each reported percentile to its value in ms.
+    """
+
+    check: str
+    target: Optional[str] = None
+    baseline_count: int = 0
+    current_count: int = 0
+    baseline: Dict[float, Optional[float]] = field(default_factory=dict)
+    current: Dict[float, Optional[float]] = field(default_factory=dict)
+    p_value: Optional[float] = None  # Mann-Whitney U, current slower
+    baseline_failures: int = 0
+    current_failures: int = 0
+    new_failures: int = 0  # targets failing now that did not fail before
+    regressed: bool = False
+
+    def delta(self, q: float) -> Tuple[Optional[float], Optional[float]]:
+        """(ms, percent) change at percentile q, None where unknown"""
+        before, after = self.baseline.get(q), self.current.get(q)
+        if before is None or after is None:
+            return None, None
+        return after - before, ((after - before) / before * 100 if before else None)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+
+        def r(value: Optional[float], digits: int = 3) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        percentiles = {}
+        for q in self.baseline:
+            delta_ms, delta_pct = self.delta(q)
+            percentiles[_pct_label(q)] = {
+                "baseline_ms": r(self.baseline[q]),
+                "current_ms": r(self.current.get(q)),
+                "delta_ms": r(delta_ms),
+                "delta_pct": r(delta_pct, 2),
+            }
+        return {
+            "check": self.check,
+            "target": self.target,
+            "baseline_count": self.baseline_count,
+            "current_count": self.current_count,
+            "percentiles": percentiles,
+            "p_value": None if self.p_value is None else float(f"{self.p_value:.4g}"),
+            "baseline_failures": self.baseline_failures,
+            "current_failures": self.current_failures,
+            "new_failures": self.new_failures,
+            "regressed": self.regressed,
+        }
+
+
+@dataclass
+class DiffReport:
+    """Result of pulse diff: per-check changes between two runs
+
+    checks holds one row per check over every matched target; targets
+    holds only the per-target rows that regressed or started failing.
+    """
+
+    baseline: str
+    current: str
+    percentiles: Tuple[float, ...]
+    threshold: float  # percent
+    min_delta_ms: float
+    alpha: float
+    matched: int = 0
+    new_targets: int = 0  # only in the current run
+    missing_targets: int = 0  # only in the baseline
+    checks: List[CheckDiff] = field(default_factory=list)
+    targets: List[CheckDiff] = field(default_factory=list)
+
+    @property
+    def regressions(self) -> List[CheckDiff]:
+        return [d for d in self.checks + self.targets if d.regressed]
+
+    @property
+    def new_failures(self) -> int:
+        return sum(d.new_failures for d in self.checks)
+
+    def to_dict(self) -> dict:
+        """Convert to dictionary"""
+        return {
+            "baseline": self.baseline,
+            "current": self.current,
+            "thresholds": {
+                "percentiles": [_pct_label(q) for q in self.percentiles],
+                "regression_pct": self.threshold,
+                "min_delta_ms": self.min_delta_ms,
+                "alpha": self.alpha,
+            },
+            "matched_targets": self.matched,
+            "new_targets": self.new_targets,
+            "missing_targets": self.missing_targets,
+            "regressions": len(self.regressions),
+            "new_failures": self.new_failures,
+            "checks": [d.to_dict() for d in self.checks],
+            "targets": [d.to_dict() for d in self.targets],
+        }
+
+    def to_rows(self) -> tuple:
+        """CSV header and rows: per-check rows first, then per-target ones"""
+        header = ["Target", "Check", "Baseline n", "Current n"]
+        for q in self.percentiles:
+            label = _pct_label(q)
+            header += [f"{label} baseline (ms)", f"{label} current (ms)", f"{label} change (%)"]
+        header += ["p-value", "New failures", "Regressed"]
+
+        rows = []
+        for data in (d.to_dict() for d in self.checks + self.targets):
+            row = [
+                data["target"] or "*",
+                data["check"],
+                data["baseline_count"],
+                data["current_count"],
+            ]
+            for q in self.percentiles:
+                values = data["percentiles"].get(_pct_label(q), {})
+                row += [
+                    values.get("baseline_ms"),
+                    values.get("current_ms"),
+                    values.get("delta_pct"),
+                ]
+            row += [data["p_value"], data["new_failures"], data["regressed"]]
+            rows.append(row)
+        return header, rows
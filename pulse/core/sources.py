@@ -0,0 +1,161 @@
+"""Streaming target ingestion from files, gzip files and stdin"""
+
+import asyncio
+import gzip
+import itertools
+import sys
+import threading
+from typing import AsyncIterator, BinaryIO, Iterable, Iterator, List, Optional, Sequence
+
+from .ranges import expand_targets
+from .target import Target
+
+
+STDIN = "-"
+GZIP_MAGIC = b"\x1f\x8b"
+
+# Bytes per read; a pipe returns whatever is available up to this
+READ_SIZE = 1 << 16
+
+
+def open_source(path: str) -> BinaryIO:
+    """Binary stream for a path or '-' (stdin), transparently gunzipped"""
+    stream = sys.stdin.buffer if path == STDIN else open(path, "rb")
+    if stream.peek(2)[:2] == GZIP_MAGIC:
+        return gzip.GzipFile(fileobj=stream)
+    return stream
+
+
+def _specs(lines: Iterable[bytes]) -> Iterator[str]:
+    for line in lines:
+        spec = line.decode("utf-8", "replace").strip()
+        if spec and not spec.startswith("#"):
+            yield spec
+
+
+def read_specs(paths: Sequence[str]) -> Iterator[str]:
+    """Target specs from every path in turn, one per line"""
+    for path in paths:
+        stream = open_source(path)
+        try:
+            yield from _specs(stream)
+        finally:
+            if path != STDIN:
+                stream.close()
+
+
+def _chunks(stream: BinaryIO) -> Iterator[List[str]]:
+    """Specs per read1() call, so a slow pipe yields lines as they arrive"""
+    partial = b""
+    while True:
+        data = stream.read1(READ_SIZE)
+        if not data:
+            break
+        lines = (partial + data).split(b"\n")
+        partial = lines.pop()
+        yield list(_specs(lines))
+    if partial:
+        yield list(_specs([partial]))
+
+
+# End-of-input marker on the feed queue
+_EOF = object()
+
+
+class TargetFeed:
+    """Target specs read on a background thread into a bounded queue
+
+    The reader thread blocks once queue_size chunks are waiting, so memory
+    stays bounded however long the input is, and the engine can start on
+    the first line while the rest is still being read. Ranges are expanded
+    on the consuming side, lazily.
+    """
+
+    def __init__(
+        self,
+        paths: Sequence[str],
+        specs: Sequence[str] = (),
+        shuffle: bool = False,
+        seed: Optional[int] = None,
+        queue_size: int = 64,
+    ):
+        self.paths = paths
+        self.specs = list(specs)
+        self.shuffle = shuffle
+        self.seed = seed
+        self.queue_size = queue_size
+        self.lines = 0
+        self._queue: Optional[asyncio.Queue] = None
+        self._closed = threading.Event()
+
+    def _read(self, loop: asyncio.AbstractEventLoop) -> None:
+        def put(item) -> None:
+            asyncio.run_coroutine_threadsafe(self._queue.put(item), loop).result()
+
+        try:
+            if self.specs:
+                put(self.specs)
+            for path in self.paths:
+                stream = open_source(path)
+                try:
+                    for chunk in _chunks(stream):
+                        if self._closed.is_set():
+                            return
+                        if chunk:
+                            self.lines += len(chunk)
+                            put(chunk)
+                finally:
+                    if path != STDIN:
+                        stream.close()
+            put(_EOF)
+        except Exception as e:
+            if not self._closed.is_set():
+                put(e)
+
+    def start(self) -> None:
+        """Start reading on a daemon thread (stdin may never close)"""
+        loop = asyncio.get_running_loop()
+        self._queue = asyncio.Queue(maxsize=self.queue_size)
+        threading.Thread(target=self._read, args=(loop,), daemon=True).start()
+
+    def close(self) -> None:
+        """Stop the reader after its current chunk"""
+        self._closed.set()
+        if self._queue is not None:
+            # Unblock a reader waiting for queue space
+            while not self._queue.empty():
+                self._queue.get_nowait()
+
+    async def batches(self, size: int) -> AsyncIterator[List[Target]]:
+        """Lists of up to size targets
+
+        A short batch is handed out whenever no more input is ready yet,
+        so a slow producer on stdin never holds checks back.
+        """
+        if self._queue is None:
+            self.start()
+
+        batch: List[Target] = []
+        expanding: Iterator[Target] = iter(())
+        try:
+            while True:
+                batch.extend(itertools.islice(expanding, size - len(batch)))
+                if len(batch) >= size:
+                    yield batch
+                    batch = []
+                    continue
+                if batch and self._queue.empty():
+                    yield batch
+                    batch = []
+
+                chunk = await self._queue.get()
+                if chunk is _EOF:
+                    break
+                if isinstance(chunk, Exception):
+                    raise chunk
+                expanding = expand_targets(chunk, self.shuffle, self.seed)
+
+            if batch:
+                yield batch
+        finally:
+            self.close()
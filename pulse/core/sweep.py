@@ -0,0 +1,256 @@
+"""Connect-only reachability sweep driven directly by selectors/epoll"""
+
+import errno
+import heapq
+import ipaddress
+import os
+import selectors
+import socket
+import time
+from array import array
+from typing import Iterator, List, Optional, Sequence, Tuple
+
+from .result import CheckResult, Status, TargetResult
+from .target import Target
+
+
+# Per-connect outcome codes stored in SweepResult.status
+PENDING = 0
+OPEN = 1
+REFUSED = 2
+TIMEOUT = 3
+ERROR = 4
+
+# Upper bound on simultaneously open sockets
+MAX_WINDOW = 10000
+
+
+def default_window() -> int:
+    """In-flight window that fits within the process file-descriptor limit"""
+    try:
+        import resource
+
+        soft, _ = resource.getrlimit(resource.RLIMIT_NOFILE)
+        if soft == resource.RLIM_INFINITY:
+            return MAX_WINDOW
+    except (ImportError, ValueError, OSError):
+        soft = 1024
+    return max(1, min(MAX_WINDOW, soft - 64))
+
+
+def ip_family(host: str) -> Optional[int]:
+    """Address family of an IP literal, None for hostnames"""
+    try:
+        address = ipaddress.ip_address(host)
+    except ValueError:
+        return None
+    return socket.AF_INET6 if address.version == 6 else socket.AF_INET
+
+
+class SweepResult:
+    """Outcome of a sweep in parallel compact arrays
+
+    Index i describes targets[i]. CheckResult/TargetResult objects are only
+    built by target_results(), when output needs them.
+    """
+
+    def __init__(self, targets: Sequence[Target], addresses: Sequence[Optional[str]]):
+        count = len(targets)
+        self.targets = targets
+        self.addresses = addresses
+        self.status = array("b", bytes(count))
+        self.errno = array("H", bytes(2 * count))
+        self.started = array("d", bytes(8 * count))
+        self.duration_ms = array("d", bytes(8 * count))
+        self.wall_ms = 0.0
+
+    def __len__(self) -> int:
+        return len(self.status)
+
+    def counts(self) -> dict:
+        """Number of targets per outcome"""
+        names = {OPEN: "open", REFUSED: "refused", TIMEOUT: "timeout", ERROR: "error"}
+        totals = {name: 0 for name in names.values()}
+        for code in self.status:
+            if code in names:
+                totals[names[code]] += 1
+        return totals
+
+    def _check(self, index: int, timeout: float) -> CheckResult:
+        target = self.targets[index]
+        code = self.status[index]
+        duration = self.duration_ms[index]
+        metadata = {"host": target.host, "port": target.port, "timing_source": "wall"}
+        if self.addresses[index] and self.addresses[index] != target.host:
+            metadata["ip"] = self.addresses[index]
+
+        if code == OPEN:
+            if duration < 50:
+                quality = "fast"
+            elif duration < 150:
+                quality = "good"
+            else:
+                quality = "slow"
+            metadata["quality"] = quality
+            return CheckResult(
+                name="TCP",
+                duration_ms=duration,
+                status=Status.SUCCESS,
+                details=f"Connected ({quality})",
+                metadata=metadata,
+            )
+        if code == REFUSED:
+            return CheckResult(
+                name="TCP",
+                duration_ms=duration,
+                status=Status.FAILURE,
+                details="Connection refused",
+                error="Port closed or service not running",
+                metadata=metadata,
+            )
+        if code == TIMEOUT:
+            return CheckResult(
+                name="TCP",
+                duration_ms=duration,
+                status=Status.FAILURE,
+                details="Connection timeout",
+                error=f"Timeout after {timeout}s",
+                metadata=metadata,
+            )
+
+        if self.errno[index]:
+            error = os.strerror(self.errno[index])
+        else:
+            error = "Name resolution failed"
+        return CheckResult(
+            name="TCP",
+            duration_ms=duration,
+            status=Status.FAILURE,
+            details="Connection failed",
+            error=error,
+            metadata=metadata,
+        )
+
+    def target_results(self, timeout: float) -> Iterator[TargetResult]:
+        """Materialize one TargetResult per target, in input order"""
+        for index, target in enumerate(self.targets):
+            yield TargetResult(
+                target=target,
+                checks=[self._check(index, timeout)],
+                total_duration_ms=self.duration_ms[index],
+            )
+
+
+class ConnectSweep:
+    """Non-blocking connect_ex over a selector with a deadline heap
+
+    Keeps up to window connects in flight. Each socket is registered for
+    writability; completion is read from SO_ERROR, and a min-heap of
+    deadlines expires stragglers without per-socket timers.
+    """
+
+    def __init__(self, timeout: float, window: int = 0):
+        self.timeout = timeout
+        self.window = window or default_window()
+
+    def run(self, result: SweepResult, indices: Optional[Sequence[int]] = None) -> SweepResult:
+        """Connect to the resolved addresses in result (blocking)
+
+        indices limits the pass to those targets (used for retries); by
+        default every target is attempted.
+        """
+        order = range(len(result)) if indices is None else indices
+        targets = result.targets
+        addresses = result.addresses
+        status = result.status
+        errnos = result.errno
+        started = result.started
+        durations = result.duration_ms
+
+        selector = selectors.DefaultSelector()
+        deadlines: List[Tuple[float, int]] = []
+        in_flight = {}
+        clock = time.perf_counter
+        timeout = self.timeout
+        window = self.window
+        total = len(order)
+        next_position = 0
+        run_start = clock()
+
+        def finish(index: int, code: int, err: int, now: float) -> None:
+            status[index] = code
+            errnos[index] = err
+            durations[index] = (now - started[index]) * 1000
+            sock = in_flight.pop(index, None)
+            if sock is not None:
+                selector.unregister(sock)
+                sock.close()
+
+        try:
+            while next_position < total or in_flight:
+                # Top up the window
+                while next_position < total and len(in_flight) < window:
+                    index = order[next_position]
+                    next_position += 1
+                    address = addresses[index]
+                    now = clock()
+                    started[index] = now
+                    if address is None:
+                        status[index] = ERROR
+                        continue
+
+                    # EMFILE/ENFILE near the fd limit or EAFNOSUPPORT only
+                    # fail this target, not the whole sweep
+                    family = ip_family(address) or socket.AF_INET
+                    try:
+                        sock = socket.socket(family, socket.SOCK_STREAM)
+                    except OSError as e:
+                        finish(index, ERROR, e.errno or 0, clock())
+                        continue
+                    try:
+                        sock.setblocking(False)
+                        err = sock.connect_ex((address, targets[index].port))
+                    except OSError as e:
+                        sock.close()
+                        finish(index, ERROR, e.errno or 0, clock())
+                        continue
+                    if err == 0:
+                        sock.close()
+                        finish(index, OPEN, 0, clock())
+                    elif err in (errno.EINPROGRESS, errno.EWOULDBLOCK):
+                        in_flight[index] = sock
+                        selector.register(sock, selectors.EVENT_WRITE, index)
+                        heapq.heappush(deadlines, (now + timeout, index))
+                    else:
+                        sock.close()
+                        code = REFUSED if err == errno.ECONNREFUSED else ERROR
+                        finish(index, code, err, clock())
+
+                if not in_flight:
+                    continue
+
+                wait = max(0.0, deadlines[0][0] - clock())
+                for key, _ in selector.select(wait):
+                    index = key.data
+                    err = key.fileobj.getsockopt(socket.SOL_SOCKET, socket.SO_ERROR)
+                    if err == 0:
+                        code = OPEN
+                    elif err == errno.ECONNREFUSED:
+                        code = REFUSED
+                    else:
+                        code = ERROR
+                    finish(index, code, err, clock())
+
+                # Expire deadlines; entries for finished connects are skipped
+                now = clock()
+                while deadlines and deadlines[0][0] <= now:
+                    _, index = heapq.heappop(deadlines)
+                    if index in in_flight:
+                        finish(index, TIMEOUT, errno.ETIMEDOUT, now)
+        finally:
+            for sock in in_flight.values():
+                sock.close()
+            selector.close()
+
+        result.wall_ms += (clock() - run_start) * 1000
+        return result
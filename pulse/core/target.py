@@ -1,69 +1,191 @@
 """Target parsing and representation"""
 
-from dataclasses import dataclass
-from typing import Optional
-from urllib.parse import urlparse
+import socket
+import sys
+from typing import Optional, Tuple
+
+
+_SCHEME_PORTS = {"http": 80, "https": 443}
+_TLS_PORTS = (443, 8443)
+
+
+def is_ip_literal(host: str) -> bool:
+    """Whether host is an IPv4 or IPv6 address rather than a name"""
+    if not host:
+        return False
+    if ":" in host:
+        family = socket.AF_INET6
+    elif host[0].isdigit() and host[-1].isdigit():
+        family = socket.AF_INET
+    else:
+        return False
+    try:
+        socket.inet_pton(family, host)
+    except (OSError, ValueError):
+        return False
+    return True
+
+
+def split_host_port(text: str) -> Tuple[str, Optional[int]]:
+    """'host:port', '[v6]:port', '[v6]' or a bare IPv6 address
+
+    Raises ValueError for a port that is not a number.
+    """
+    if text.startswith("["):
+        host, _, rest = text[1:].partition("]")
+        if rest.startswith(":"):
+            return host, int(rest[1:])
+        return host, None
+    if text.count(":") == 1:
+        host, _, port = text.partition(":")
+        return host, int(port)
+    # No colon, or an unbracketed IPv6 address
+    return text, None
 
 
-@dataclass
 class Target:
-    """Represents a check target"""
+    """Represents a check target
 
-    raw: str
-    host: str = ""
-    port: int = 0
-    scheme: str = "https"
-    path: str = "/"
-    is_url: bool = False
+    Parsed once on construction; address and url are built on first use
+    and cached. Host names are interned, so a large run over a handful of
+    hosts shares their strings, and is_ip marks IP literals that need no
+    DNS lookup.
+    """
 
-    def __post_init__(self):
-        if not self.host:
+    __slots__ = (
+        "raw",
+        "host",
+        "port",
+        "scheme",
+        "path",
+        "is_url",
+        "ip",
+        "profile",
+        "tags",
+        "is_ip",
+        "_address",
+        "_url",
+    )
+
+    def __init__(
+        self,
+        raw: str,
+        host: str = "",
+        port: int = 0,
+        scheme: str = "https",
+        path: str = "/",
+        is_url: bool = False,
+        ip: Optional[str] = None,  # Pinned address to connect to instead of host
+        profile: int = 0,  # Inventory profile index (0 = command-line settings)
+        tags: Tuple[str, ...] = (),
+    ):
+        self.raw = raw
+        self.host = host
+        self.port = port
+        self.scheme = scheme
+        self.path = path
+        self.is_url = is_url
+        self.ip = ip
+        self.profile = profile
+        self.tags = tags
+        self._address: Optional[str] = None
+        self._url: Optional[str] = None
+
+        if not host:
             self._parse()
+        self.host = sys.intern(self.host)
+        self.is_ip = is_ip_literal(self.host)
 
     def _parse(self):
         """Parse target string"""
         target = self.raw.strip()
 
         # Check if it's a URL
-        if target.startswith(("http://", "https://")):
-            parsed = urlparse(target)
-            self.host = parsed.hostname or ""
-            self.port = parsed.port or (443 if parsed.scheme == "https" else 80)
-            self.scheme = parsed.scheme
-            self.path = parsed.path or "/"
-            self.is_url = True
-        elif ":" in target:
-            # Try to parse as host:port
-            parts = target.rsplit(":", 1)
+        scheme, sep, rest = target.partition("://")
+        if sep and scheme in _SCHEME_PORTS:
+            end = len(rest)
+            for mark in "/?#":
+                index = rest.find(mark)
+                if index != -1 and index < end:
+                    end = index
+            netloc, tail = rest[:end], rest[end:]
+            netloc = netloc.rpartition("@")[2]
             try:
-                self.host = parts[0]
-                self.port = int(parts[1])
-                self.scheme = "https" if self.port in [443, 8443] else "http"
+                host, port = split_host_port(netloc)
             except ValueError:
-                # Not a valid port, treat as hostname with colon
-                self.host = target
-                self.port = 443
-                self.scheme = "https"
-        else:
+                host, port = netloc, None
+            self.host = host.lower()
+            self.port = port or _SCHEME_PORTS[scheme]
+            self.scheme = scheme
+            self.path = tail.split("?", 1)[0].split("#", 1)[0] or "/"
+            self.is_url = True
+            return
+
+        try:
+            host, port = split_host_port(target)
+        except ValueError:
+            # Not a valid port, treat as hostname with colon
+            host, port = target, None
+
+        self.host = host
+        if port is None:
             # Simple hostname
-            self.host = target
             self.port = 443
             self.scheme = "https"
+        else:
+            self.port = port
+            self.scheme = "https" if port in _TLS_PORTS else "http"
+
+    @classmethod
+    def from_parts(cls, host: str, port: int) -> "Target":
+        """Target for an already split host and port"""
+        raw = f"[{host}]:{port}" if ":" in host else f"{host}:{port}"
+        scheme = "https" if port in _TLS_PORTS else "http"
+        return cls(raw=raw, host=host, port=port, scheme=scheme)
 
     @property
     def use_tls(self) -> bool:
         """Check if TLS should be used"""
-        return self.scheme == "https" or self.port in [443, 8443]
+        return self.scheme == "https" or self.port in _TLS_PORTS
+
+    @property
+    def connect_host(self) -> str:
+        """Address to open sockets to (SNI and Host stay on host)"""
+        return self.ip or self.host
+
+    def with_ip(self, ip: str) -> "Target":
+        """Copy of this target pinned to one resolved address"""
+        return Target(
+            raw=self.raw,
+            host=self.host,
+            port=self.port,
+            scheme=self.scheme,
+            path=self.path,
+            is_url=self.is_url,
+            ip=ip,
+            profile=self.profile,
+            tags=self.tags,
+        )
+
+    @property
+    def _netloc(self) -> str:
+        if ":" in self.host:
+            return f"[{self.host}]:{self.port}"
+        return f"{self.host}:{self.port}"
 
     @property
     def address(self) -> str:
         """Get host:port string"""
-        return f"{self.host}:{self.port}"
+        if self._address is None:
+            self._address = self._netloc
+        return self._address
 
     @property
     def url(self) -> str:
         """Get full URL"""
-        return f"{self.scheme}://{self.host}:{self.port}{self.path}"
+        if self._url is None:
+            self._url = f"{self.scheme}://{self._netloc}{self.path}"
+        return self._url
 
     def __str__(self) -> str:
         return self.raw
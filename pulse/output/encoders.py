@@ -0,0 +1,180 @@
+"""JSON encoders that write results straight to bytes
+
+get_encoder() picks orjson when it is installed and a compact stdlib
+encoder otherwise. Both produce the same document as json.dumps over
+to_dict(); the stdlib one builds each TargetResult's JSON text directly
+instead of going through the dict tree first.
+"""
+
+import json
+from json.encoder import encode_basestring
+from typing import Any, BinaryIO, Iterable, Optional
+
+from ..core.result import CheckResult, TargetResult, format_timestamp
+
+
+ENCODERS = ("auto", "orjson", "json")
+
+
+def _default(obj: Any) -> Any:
+    """Serialize result objects nested in other data through to_dict"""
+    if hasattr(obj, "to_dict"):
+        return obj.to_dict()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+def _number(value: float) -> str:
+    text = repr(value)
+    # nan/inf need json's spelling (NaN/Infinity)
+    return text if text[-1].isdigit() else json.dumps(value)
+
+
+def _bool(value: bool) -> str:
+    return "true" if value else "false"
+
+
+class JSONEncoder:
+    """Compact stdlib JSON (no indentation, no spaces after separators)"""
+
+    name = "json"
+
+    def __init__(self):
+        self._encode = json.JSONEncoder(
+            ensure_ascii=False, separators=(",", ":"), default=_default
+        ).encode
+
+    def dumps(self, data: Any) -> bytes:
+        """Any JSON-able data (result objects included) as UTF-8"""
+        return self._encode(data).encode("utf-8")
+
+    def _value(self, data: Any) -> str:
+        """Free-form data (metadata, tags) as JSON text"""
+        return self._encode(data)
+
+    def encode_result(self, result: TargetResult) -> bytes:
+        """One TargetResult, as to_dict() would serialize it"""
+        return self._result(result).encode("utf-8")
+
+    def write_results(
+        self,
+        results: Iterable[TargetResult],
+        out: BinaryIO,
+        summary: Optional[dict] = None,
+    ) -> None:
+        """A JSON array of results, or {"results": [...], "summary": ...}"""
+        out.write(b'{"results":[' if summary else b"[")
+        separator = b""
+        for result in results:
+            out.write(separator)
+            out.write(self.encode_result(result))
+            separator = b","
+        out.write(b"]")
+        if summary:
+            out.write(b',"summary":' + self.dumps(summary) + b"}")
+
+    def _check(self, check: CheckResult) -> str:
+        return "".join(
+            (
+                '{"name":',
+                encode_basestring(check.name),
+                ',"duration_ms":',
+                _number(round(check.duration_ms, 2)),
+                ',"status":"',
+                check.status.value,
+                '","details":',
+                encode_basestring(check.details),
+                ',"error":',
+                "null" if check.error is None else encode_basestring(check.error),
+                ',"metadata":',
+                self._value(check.metadata) if check.metadata else "{}",
+                ',"timestamp":"',
+                format_timestamp(check.timestamp),
+                '"}',
+            )
+        )
+
+    def _checks(self, checks: Iterable[CheckResult]) -> str:
+        return "[" + ",".join(map(self._check, checks)) + "]"
+
+    def _result(self, result: TargetResult) -> str:
+        target = result.target
+        parts = [
+            '{"target":',
+            encode_basestring(str(target)),
+            ',"address":',
+            encode_basestring(target.address),
+            ',"checks":',
+            self._checks(result.checks),
+            ',"total_duration_ms":',
+            _number(round(result.total_duration_ms, 2)),
+            ',"is_healthy":',
+            _bool(result.is_healthy),
+            ',"has_failures":',
+            _bool(result.has_failures),
+            ',"has_warnings":',
+            _bool(result.has_warnings),
+            ',"timestamp":"',
+            format_timestamp(result.timestamp),
+            '"',
+        ]
+
+        tags = getattr(target, "tags", None)
+        if tags:
+            parts += (',"tags":', self._value(list(tags)))
+
+        if result.addresses:
+            parts.append(',"addresses":{')
+            parts.append(
+                ",".join(
+                    encode_basestring(ip)
+                    + ':{"checks":'
+                    + self._checks(per_ip.checks)
+                    + ',"total_duration_ms":'
+                    + _number(round(per_ip.total_duration_ms, 2))
+                    + ',"is_healthy":'
+                    + _bool(per_ip.is_healthy)
+                    + "}"
+                    for ip, per_ip in result.addresses.items()
+                )
+            )
+            parts.append("}")
+
+        parts.append("}")
+        return "".join(parts)
+
+
+class OrjsonEncoder(JSONEncoder):
+    """orjson for metadata and other free-form data
+
+    Results keep the direct text path above: handing orjson to_dict()
+    trees is slower than skipping the dicts, and the fixed result fields
+    need no general-purpose encoder.
+    """
+
+    name = "orjson"
+
+    def __init__(self, orjson: Any):
+        self._orjson = orjson
+        # Metadata may be keyed by numbers, which json.dumps stringifies
+        self._option = orjson.OPT_NON_STR_KEYS
+
+    def dumps(self, data: Any) -> bytes:
+        return self._orjson.dumps(data, default=_default, option=self._option)
+
+    def _value(self, data: Any) -> str:
+        return self.dumps(data).decode("utf-8")
+
+
+def get_encoder(name: str = "auto") -> JSONEncoder:
+    """Encoder by name; "auto" prefers orjson when it is installed"""
+    if name not in ENCODERS:
+        raise ValueError(f"Unknown JSON encoder '{name}' (choose from {', '.join(ENCODERS)})")
+    if name != "json":
+        try:
+            import orjson
+        except ImportError:
+            if name == "orjson":
+                raise ValueError("The orjson encoder needs orjson (pip install orjson)")
+        else:
+            return OrjsonEncoder(orjson)
+    return JSONEncoder()
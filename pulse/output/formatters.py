@@ -1,13 +1,24 @@
 """Output formatters for different formats"""
 
-import json
 import csv
 import io
-from typing import List, Any, Union
+import sys
+from html import escape
+from typing import List, Any, Optional, Union
 from datetime import datetime
 
 from ..core.config import Config
-from ..core.result import TargetResult, BenchmarkResult
+from ..core.result import (
+    TargetResult,
+    BenchmarkResult,
+    DiffReport,
+    HistoryReport,
+    ResolverBenchmarkResult,
+    TcpPingResult,
+    format_timestamp,
+)
+from ..core.certs import CertificateIndex
+from .encoders import get_encoder
 from .terminal import TerminalFormatter
 
 
@@ -17,11 +28,37 @@ class OutputFormatter:
     def __init__(self, config: Config):
         self.config = config
         self.terminal = TerminalFormatter(config)
+        self.encoder = get_encoder()
+        self.summary: Optional[dict] = None
+
+    def format(
+        self,
+        results: Union[List[TargetResult], BenchmarkResult],
+        summary: Optional[dict] = None,
+    ) -> str:
+        """Format results based on config format
+
+        summary holds run-level metrics (pipeline stages, ...). The terminal
+        always shows it; structured formats only wrap the output as
+        {"results": ..., "summary": ...} when config.include_summary is set,
+        so their shape does not depend on --pipeline/--metrics.
+        """
+        self.summary = summary
+        if isinstance(results, CertificateIndex):
+            return self._format_certificates(results)
+        elif isinstance(
+            results, (ResolverBenchmarkResult, TcpPingResult, HistoryReport, DiffReport)
+        ):
+            return self._format_report(results, results.to_dict(), *results.to_rows())
+        elif isinstance(results, BenchmarkResult) and not results.results:
+            # Without --keep-runs there are per-phase statistics, not runs
+            return self._format_report(results, results.to_dict(), *results.to_rows())
 
-    def format(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
-        """Format results based on config format"""
         if self.config.format == "terminal":
-            return self.terminal.format(results)
+            output = self.terminal.format(results)
+            if summary:
+                output += self.terminal.format_run_summary(summary)
+            return output
         elif self.config.format == "json":
             return self._format_json(results)
         elif self.config.format == "csv":
@@ -32,19 +69,77 @@ class OutputFormatter:
             return self._format_markdown(results)
         elif self.config.format == "yaml":
             return self._format_yaml(results)
+        elif self.config.format == "ndjson":
+            return self._format_ndjson(results)
         else:
             return self.terminal.format(results)
 
-    def _format_json(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
-        """Format as JSON"""
-        if isinstance(results, BenchmarkResult):
-            data = results.to_dict()
-        elif isinstance(results, list):
-            data = [r.to_dict() for r in results]
+    def write(
+        self,
+        results: Union[List[TargetResult], BenchmarkResult],
+        path: Optional[str] = None,
+        summary: Optional[dict] = None,
+    ) -> None:
+        """Format results into path, or stdout
+
+        A JSON list of results is encoded straight into the byte stream;
+        everything else goes through format().
+        """
+        if self.config.format == "json" and isinstance(results, list):
+            self.summary = summary
+            wrap = self.summary if self.config.include_summary else None
+            if path:
+                with open(path, "wb") as out:
+                    self.encoder.write_results(results, out, wrap)
+                return
+            sys.stdout.flush()
+            self.encoder.write_results(results, sys.stdout.buffer, wrap)
+            sys.stdout.buffer.write(b"\n")
+            sys.stdout.buffer.flush()
+            return
+
+        output = self.format(results, summary=summary)
+        if path:
+            with open(path, "w", encoding="utf-8") as f:
+                f.write(output)
         else:
-            data = results.to_dict()
+            print(output)
 
-        return json.dumps(data, indent=2, ensure_ascii=False)
+    def _format_json(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
+        """Format as JSON"""
+        if isinstance(results, list):
+            out = io.BytesIO()
+            wrap = self.summary if self.config.include_summary else None
+            self.encoder.write_results(results, out, wrap)
+            return out.getvalue().decode("utf-8")
+
+        return self.encoder.dumps(self._with_summary(results.to_dict())).decode("utf-8")
+
+    def encode_line(self, data: Any) -> bytes:
+        """One NDJSON line without the newline, as UTF-8"""
+        if isinstance(data, TargetResult):
+            return self.encoder.encode_result(data)
+        if hasattr(data, "to_dict"):
+            data = data.to_dict()
+        return self.encoder.dumps(data)
+
+    def format_line(self, data: Any) -> str:
+        """One NDJSON line; used directly when results are streamed out"""
+        return self.encode_line(data).decode("utf-8")
+
+    def _format_ndjson(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
+        """Format as newline-delimited JSON, one target per line"""
+        items = results if isinstance(results, list) else [results]
+        lines = [self.format_line(item) for item in items]
+        if self.config.include_summary and self.summary:
+            lines.append(self.format_line({"summary": self.summary}))
+        return "\n".join(lines)
+
+    def _with_summary(self, data: Any) -> Any:
+        """Attach the run summary to structured output when requested"""
+        if not (self.config.include_summary and self.summary):
+            return data
+        return {"results": data, "summary": self.summary}
 
     def _format_csv(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
         """Format as CSV"""
@@ -80,37 +175,32 @@ class OutputFormatter:
                         round(check.duration_ms, 2),
                         check.details,
                         check.error or "",
-                        check.timestamp.isoformat(),
+                        format_timestamp(check.timestamp),
                     ]
                 )
 
         return output.getvalue()
 
-    def _format_html(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
-        """Format as HTML"""
-        if isinstance(results, BenchmarkResult):
-            results = results.results
-        elif not isinstance(results, list):
-            results = [results]
-
-        html = """<!DOCTYPE html>
+    def _html_header(self) -> str:
+        """Document head and title shared by every HTML report"""
+        return """<!DOCTYPE html>
 <html>
 <head>
     <title>Pulse Network Diagnostics Report</title>
     <style>
-        body { font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }
-        h1 { color: #333; }
-        .target { background: white; margin: 20px 0; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }
-        .target-header { font-size: 1.2em; font-weight: bold; margin-bottom: 10px; color: #555; }
-        table { width: 100%; border-collapse: collapse; margin-top: 10px; }
-        th, td { padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }
-        th { background: #f8f8f8; font-weight: bold; }
-        .status-success { color: #28a745; font-weight: bold; }
-        .status-warning { color: #ffc107; font-weight: bold; }
-        .status-failure { color: #dc3545; font-weight: bold; }
-        .status-skipped { color: #6c757d; font-weight: bold; }
-        .error { color: #dc3545; font-size: 0.9em; }
-        .timestamp { color: #999; font-size: 0.85em; margin-top: 10px; }
+        body {{ font-family: Arial, sans-serif; margin: 20px; background: #f5f5f5; }}
+        h1 {{ color: #333; }}
+        .target {{ background: white; margin: 20px 0; padding: 20px; border-radius: 8px; box-shadow: 0 2px 4px rgba(0,0,0,0.1); }}
+        .target-header {{ font-size: 1.2em; font-weight: bold; margin-bottom: 10px; color: #555; }}
+        table {{ width: 100%; border-collapse: collapse; margin-top: 10px; }}
+        th, td {{ padding: 10px; text-align: left; border-bottom: 1px solid #ddd; }}
+        th {{ background: #f8f8f8; font-weight: bold; }}
+        .status-success {{ color: #28a745; font-weight: bold; }}
+        .status-warning {{ color: #ffc107; font-weight: bold; }}
+        .status-failure {{ color: #dc3545; font-weight: bold; }}
+        .status-skipped {{ color: #6c757d; font-weight: bold; }}
+        .error {{ color: #dc3545; font-size: 0.9em; }}
+        .timestamp {{ color: #999; font-size: 0.85em; margin-top: 10px; }}
     </style>
 </head>
 <body>
@@ -118,6 +208,15 @@ class OutputFormatter:
     <p>Generated: {}</p>
 """.format(datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
 
+    def _format_html(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
+        """Format as HTML"""
+        if isinstance(results, BenchmarkResult):
+            results = results.results
+        elif not isinstance(results, list):
+            results = [results]
+
+        html = self._html_header()
+
         for target_result in results:
             html += f'<div class="target">\n'
             html += f'<div class="target-header">{target_result.target.address}</div>\n'
@@ -149,6 +248,12 @@ class OutputFormatter:
 """
         return html
 
+    def _markdown_header(self) -> str:
+        return (
+            "# 🔍 Pulse Network Diagnostics Report\n\n"
+            f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        )
+
     def _format_markdown(
         self, results: Union[List[TargetResult], BenchmarkResult]
     ) -> str:
@@ -158,8 +263,7 @@ class OutputFormatter:
         elif not isinstance(results, list):
             results = [results]
 
-        md = f"# 🔍 Pulse Network Diagnostics Report\n\n"
-        md += f"Generated: {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}\n\n"
+        md = self._markdown_header()
 
         for target_result in results:
             md += f"## {target_result.target.address}\n\n"
@@ -190,6 +294,84 @@ class OutputFormatter:
 
         return md
 
+    def _format_certificates(self, index: CertificateIndex) -> str:
+        """Format a certificate inventory"""
+        data = index.to_dict(
+            expiring_within=self.config.cert_expiring_days,
+            group_by=self.config.cert_group_by,
+        )
+
+        header = [
+            "Common Name",
+            "Issuer",
+            "Not After",
+            "Days Left",
+            "SAN",
+            "Hosts",
+            "Fingerprint",
+        ]
+        rows = [
+            [
+                cert["common_name"],
+                cert["issuer"].get("organizationName") or cert["issuer"].get("commonName", ""),
+                cert["not_after"],
+                cert["days_until_expiry"],
+                " ".join(cert["san"]),
+                " ".join(cert["hosts"]),
+                cert["fingerprint"],
+            ]
+            for cert in data["certificates"]
+        ]
+
+        return self._format_report(index, data, header, rows)
+
+    def _format_report(self, report: Any, data: dict, header: list, rows: list) -> str:
+        """Format a mode-specific report
+
+        The terminal renders the report itself; CSV, HTML and Markdown show
+        rows under header; JSON, YAML and NDJSON dump data.
+        """
+        if self.config.format == "terminal":
+            return self.terminal.format(report)
+
+        if self.config.format == "html":
+            table = "<tr>" + "".join(f"<th>{escape(str(h))}</th>" for h in header) + "</tr>\n"
+            for row in rows:
+                table += "<tr>" + "".join(f"<td>{escape(str(v))}</td>" for v in row) + "</tr>\n"
+            return (
+                self._html_header()
+                + f'<div class="target">\n<table>\n{table}</table>\n</div>\n</body>\n</html>\n'
+            )
+
+        if self.config.format == "markdown":
+            md = self._markdown_header()
+            md += "| " + " | ".join(str(h) for h in header) + " |\n"
+            md += "|" + "|".join("---" for _ in header) + "|\n"
+            for row in rows:
+                cells = (str(v).replace("|", "\\|").replace("\n", " ") for v in row)
+                md += "| " + " | ".join(cells) + " |\n"
+            return md
+
+        if self.config.format == "csv":
+            output = io.StringIO()
+            writer = csv.writer(output)
+            writer.writerow(header)
+            writer.writerows(rows)
+            return output.getvalue()
+
+        if self.config.format == "yaml":
+            try:
+                import yaml
+
+                return yaml.dump(data, default_flow_style=False, allow_unicode=True)
+            except ImportError:
+                pass
+
+        if self.config.format == "ndjson":
+            return self.format_line(data)
+
+        return self.encoder.dumps(data).decode("utf-8")
+
     def _format_yaml(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
         """Format as YAML"""
         try:
@@ -202,7 +384,9 @@ class OutputFormatter:
             else:
                 data = results.to_dict()
 
-            return yaml.dump(data, default_flow_style=False, allow_unicode=True)
+            return yaml.dump(
+                self._with_summary(data), default_flow_style=False, allow_unicode=True
+            )
         except ImportError:
             # Fallback to JSON if PyYAML not available
             return self._format_json(results)
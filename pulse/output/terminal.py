@@ -1,9 +1,21 @@
 """Terminal output formatter with beautiful colors"""
 
+import itertools
 from typing import List, Union
 
 from ..core.config import Config
-from ..core.result import TargetResult, BenchmarkResult, Status
+from ..core.result import (
+    TargetResult,
+    BenchmarkResult,
+    CheckDiff,
+    DiffReport,
+    HistoryReport,
+    ResolverBenchmarkResult,
+    Status,
+    TcpPingResult,
+    TOTAL,
+)
+from ..core.certs import CertificateIndex
 
 
 class Colors:
@@ -70,7 +82,17 @@ class TerminalFormatter:
 
     def format(self, results: Union[List[TargetResult], BenchmarkResult]) -> str:
         """Format results for terminal"""
-        if isinstance(results, BenchmarkResult):
+        if isinstance(results, CertificateIndex):
+            return self._format_certificates(results)
+        elif isinstance(results, ResolverBenchmarkResult):
+            return self._format_resolvers(results)
+        elif isinstance(results, TcpPingResult):
+            return self._format_tcp_ping(results)
+        elif isinstance(results, HistoryReport):
+            return self._format_history(results)
+        elif isinstance(results, DiffReport):
+            return self._format_diff(results)
+        elif isinstance(results, BenchmarkResult):
             return self._format_benchmark(results)
         elif isinstance(results, list) and len(results) == 1:
             return self._format_single(results[0])
@@ -120,6 +142,17 @@ class TerminalFormatter:
 
         lines.append("")
 
+        # Per-address breakdown for --all-ips
+        if result.addresses:
+            for ip, ip_result in result.addresses.items():
+                lines.append(f"  {c.CYAN}▶ {ip}{c.RESET}")
+                for check in ip_result.checks:
+                    lines.append(self._format_check_line(check, indent=True))
+            lines.append("")
+
+        if self.config.deep_mode:
+            lines.extend(self._format_tls_matrix(result))
+
         # Summary box
         lines.extend(self._format_summary(result))
 
@@ -190,6 +223,7 @@ class TerminalFormatter:
         """Format benchmark results"""
         lines = []
         c = self.c
+        total = result.stats()
 
         lines.extend(
             [
@@ -214,11 +248,24 @@ class TerminalFormatter:
                 f"  {c.BRIGHT}Average:{c.RESET}     {c.BOLD_CYAN}{result.avg_duration_ms:>6.1f} ms{c.RESET}",
                 f"  {c.BRIGHT}Minimum:{c.RESET}     {c.GREEN}{result.min_duration_ms:>6.1f} ms{c.RESET}",
                 f"  {c.BRIGHT}Maximum:{c.RESET}     {c.YELLOW}{result.max_duration_ms:>6.1f} ms{c.RESET}",
+                f"  {c.BRIGHT}Std Dev:{c.RESET}     {total.stddev or 0.0:>6.1f} ms",
+                f"  {c.BRIGHT}{total.confidence:.0f}% CI:{c.RESET}      {total.ci_low or 0.0:.1f} – {total.ci_high or 0.0:.1f} ms",
                 f"  {c.BRIGHT}Success Rate:{c.RESET} {c.GREEN if result.success_rate >= 90 else c.YELLOW if result.success_rate >= 50 else c.RED}{result.success_rate:.1f}%{c.RESET}",
                 "",
             ]
         )
 
+        # Per-phase percentiles
+        lines.append(
+            f"  {c.DIM}{'Phase':<8} {'p50':>8} {'p90':>8} {'p99':>8} {'stddev':>8}{c.RESET}"
+        )
+        for phase in result.samples:
+            stats = result.stats(phase)
+            lines.append(
+                f"  {phase:<8} {stats.p50:>8.1f} {stats.p90:>8.1f} {stats.p99:>8.1f} {stats.stddev:>8.1f}"
+            )
+        lines.append("")
+
         # Per-iteration details
         if self.config.verbose >= 1:
             lines.extend(
@@ -230,17 +277,367 @@ class TerminalFormatter:
                 ]
             )
 
-            for i, run in enumerate(result.results, 1):
-                status = "✓" if run.is_healthy else "✗"
-                color = c.GREEN if run.is_healthy else c.RED
+            runs = zip(result.samples.get(TOTAL, ()), result.healthy)
+            for i, (duration_ms, healthy) in enumerate(runs, 1):
+                status = "✓" if healthy else "✗"
+                color = c.GREEN if healthy else c.RED
+                lines.append(f"  {color}{status}{c.RESET} Run {i:2d}: {duration_ms:>6.1f} ms")
+            if result.runs > len(result.healthy):
+                lines.append(f"  {c.DIM}… {result.runs - len(result.healthy)} more runs{c.RESET}")
+
+        lines.append("")
+
+        return "\n".join(lines)
+
+    def _format_resolvers(self, result: ResolverBenchmarkResult) -> str:
+        """Format nameserver comparison"""
+        lines = []
+        c = self.c
+
+        lines.extend(
+            [
+                "",
+                f"{c.MAGENTA}╔════════════════════════════════════════════════════════════╗{c.RESET}",
+                f"{c.MAGENTA}║{c.RESET}  {c.BOLD_MAGENTA}🧭 Resolver Benchmark{c.RESET}{c.MAGENTA}                               ║{c.RESET}",
+                f"{c.MAGENTA}╚════════════════════════════════════════════════════════════╝{c.RESET}",
+                "",
+                f"  {c.BRIGHT}Queries:{c.RESET}  {', '.join(result.queries)} ({result.record_type})",
+                f"  {c.BRIGHT}Samples:{c.RESET}  {result.samples} per name per server",
+                "",
+                f"  {c.BRIGHT}{'Server':<32} {'p50':>8} {'p99':>8} {'Timeouts':>9} {'Consistent':>11}{c.RESET}",
+                f"  {c.GRAY}{'─' * 72}{c.RESET}",
+            ]
+        )
+
+        for server in result.servers:
+            data = server.to_dict()
+            p50 = f"{data['p50_ms']:.1f}" if data["p50_ms"] is not None else "-"
+            p99 = f"{data['p99_ms']:.1f}" if data["p99_ms"] is not None else "-"
+
+            if not server.answered:
+                color = c.RED
+            elif server.timeouts or server.consistency < 100:
+                color = c.YELLOW
+            else:
+                color = c.GREEN
+
+            lines.append(
+                f"  {color}{server.label[:32]:<32}{c.RESET} {p50:>8} {p99:>8} "
+                f"{data['timeout_rate']:>8.1f}% {data['consistency']:>10.1f}%"
+            )
+
+        lines.append("")
+        return "\n".join(lines)
+
+    def _format_history(self, report: HistoryReport) -> str:
+        """Format stored statistics per target and check"""
+        lines = []
+        c = self.c
+        data = report.to_dict()
+
+        lines.extend(
+            [
+                "",
+                f"{c.MAGENTA}╔════════════════════════════════════════════════════════════╗{c.RESET}",
+                f"{c.MAGENTA}║{c.RESET}  {c.BOLD_MAGENTA}🕘 History{c.RESET}{c.MAGENTA}                                          ║{c.RESET}",
+                f"{c.MAGENTA}╚════════════════════════════════════════════════════════════╝{c.RESET}",
+                "",
+                f"  {c.BRIGHT}Window:{c.RESET}  {data['since'][:19]} → {data['until'][:19]}",
+                "",
+            ]
+        )
+
+        if not report.series:
+            lines.append(f"  {c.YELLOW}No history recorded for these targets{c.RESET}")
+            lines.append("")
+            return "\n".join(lines)
+
+        lines.extend(
+            [
+                f"  {c.BRIGHT}{'Target':<28} {'Check':<8} {'Samples':>8} {'Fail':>6} "
+                f"{'p50':>8} {'p90':>8} {'p99':>8}{c.RESET}",
+                f"  {c.GRAY}{'─' * 80}{c.RESET}",
+            ]
+        )
+
+        def ms(value) -> str:
+            return f"{value:.1f}" if value is not None else "-"
+
+        for series in data["series"]:
+            color = c.RED if series["failures"] else c.GREEN
+            lines.append(
+                f"  {series['target'][:28]:<28} {series['check'][:8]:<8} {series['count']:>8} "
+                f"{color}{series['failures']:>6}{c.RESET} {ms(series['p50_ms']):>8} "
+                f"{ms(series['p90_ms']):>8} {ms(series['p99_ms']):>8}"
+            )
+            for point in series["points"]:
                 lines.append(
-                    f"  {color}{status}{c.RESET} Run {i:2d}: {run.total_duration_ms:>6.1f} ms"
+                    f"    {c.GRAY}{point['time'][:16]:<34}{c.RESET} {point['count']:>8} "
+                    f"{point['failures']:>6} {ms(point['p50_ms']):>8} {'':>8} {ms(point['p99_ms']):>8}"
                 )
 
         lines.append("")
+        return "\n".join(lines)
+
+    # Per-target diff rows shown before "… N more"
+    DIFF_TARGET_LIMIT = 20
 
+    def _format_diff(self, report: DiffReport) -> str:
+        """Format per-check latency changes between two runs"""
+        lines = []
+        c = self.c
+        labels = [f"p{q:g}" for q in report.percentiles]
+
+        lines.extend(
+            [
+                "",
+                f"{c.MAGENTA}╔════════════════════════════════════════════════════════════╗{c.RESET}",
+                f"{c.MAGENTA}║{c.RESET}  {c.BOLD_MAGENTA}🔀 Run Diff{c.RESET}{c.MAGENTA}                                         ║{c.RESET}",
+                f"{c.MAGENTA}╚════════════════════════════════════════════════════════════╝{c.RESET}",
+                "",
+                f"  {c.BRIGHT}Baseline:{c.RESET}  {report.baseline}",
+                f"  {c.BRIGHT}Current:{c.RESET}   {report.current}",
+                f"  {c.BRIGHT}Targets:{c.RESET}   {report.matched:,} matched, "
+                f"{report.new_targets:,} new, {report.missing_targets:,} missing",
+                f"  {c.BRIGHT}Regressed:{c.RESET} {'/'.join(labels)} up more than {report.threshold:g}% "
+                f"and {report.min_delta_ms:g} ms, Mann-Whitney p < {report.alpha:g}",
+                "",
+            ]
+        )
+
+        if not report.matched:
+            lines.append(f"  {c.YELLOW}No targets in common between the two runs{c.RESET}")
+            lines.append("")
+            return "\n".join(lines)
+
+        def change(diff: CheckDiff, q: float) -> str:
+            before, after = diff.baseline.get(q), diff.current.get(q)
+            if before is None or after is None:
+                return "-"
+            pct = diff.delta(q)[1]
+            return f"{before:.1f}→{after:.1f}" + (f" ({pct:+.0f}%)" if pct is not None else "")
+
+        def verdict(diff: CheckDiff) -> str:
+            if diff.regressed:
+                return f"{c.RED}REGRESSED{c.RESET}"
+            if diff.new_failures:
+                return f"{c.RED}NEW FAILURES{c.RESET}"
+            return f"{c.GREEN}ok{c.RESET}"
+
+        header = f"  {c.BRIGHT}{'Check':<8} {'Base n':>8} {'Now n':>8}"
+        for label in labels:
+            header += f" {label + ' ms':>22}"
+        header += f" {'p-value':>9} {'New fail':>8}  Verdict{c.RESET}"
+        lines.extend([header, f"  {c.GRAY}{'─' * (46 + 23 * len(labels))}{c.RESET}"])
+
+        for diff in report.checks:
+            row = f"  {diff.check[:8]:<8} {diff.baseline_count:>8} {diff.current_count:>8}"
+            for q in report.percentiles:
+                row += f" {change(diff, q):>22}"
+            p_value = f"{diff.p_value:.2g}" if diff.p_value is not None else "-"
+            row += f" {p_value:>9} {diff.new_failures:>8}  {verdict(diff)}"
+            lines.append(row)
+
+        if report.targets:
+            lines.extend(["", f"  {c.BRIGHT}Targets{c.RESET}"])
+            for diff in report.targets[: self.DIFF_TARGET_LIMIT]:
+                if diff.regressed:
+                    detail = ", ".join(
+                        f"{label} {change(diff, q)}" for label, q in zip(labels, report.percentiles)
+                    )
+                else:
+                    detail = f"failing now ({diff.current_failures}x), not in baseline"
+                lines.append(
+                    f"  {c.RED}▸{c.RESET} {diff.target[:40]:<40} {diff.check[:8]:<8} {detail}"
+                )
+            hidden = len(report.targets) - self.DIFF_TARGET_LIMIT
+            if hidden > 0:
+                lines.append(f"  {c.GRAY}… {hidden} more{c.RESET}")
+
+        lines.append("")
         return "\n".join(lines)
 
+    def _format_tcp_ping(self, result: TcpPingResult) -> str:
+        """Format TCP ping statistics, ping(8) style"""
+        lines = []
+        c = self.c
+
+        lines.extend(
+            [
+                "",
+                f"{c.CYAN}╔════════════════════════════════════════════════════════════╗{c.RESET}",
+                f"{c.CYAN}║{c.RESET}  {c.BOLD_CYAN}📡 TCP Ping{c.RESET}{c.CYAN}                                         ║{c.RESET}",
+                f"{c.CYAN}╚════════════════════════════════════════════════════════════╝{c.RESET}",
+            ]
+        )
+
+        for series in result.targets:
+            data = series.to_dict()
+            if not data["received"]:
+                color = c.RED
+            elif data["loss"] or data["errors"]:
+                color = c.YELLOW
+            else:
+                color = c.GREEN
+
+            lines.extend(
+                [
+                    "",
+                    f"  {c.BRIGHT}{data['target']}{c.RESET} {c.GRAY}({data['address']}:{data['port']}){c.RESET}",
+                    f"  {color}{data['sent']} sent, {data['received']} received, "
+                    f"{data['loss']:.1f}% loss{c.RESET}"
+                    + (f" {c.GRAY}({data['errors']} errors){c.RESET}" if data["errors"] else ""),
+                ]
+            )
+            if data["received"]:
+                lines.append(
+                    f"  rtt min/avg/max/mdev = {data['min_ms']:.3f}/{data['avg_ms']:.3f}/"
+                    f"{data['max_ms']:.3f}/{data['mdev_ms']:.3f} ms"
+                )
+                lines.append(
+                    f"  {c.GRAY}p50 {data['p50_ms']:.3f} • p90 {data['p90_ms']:.3f} • "
+                    f"p99 {data['p99_ms']:.3f} ms{c.RESET}"
+                )
+
+        lines.append("")
+        return "\n".join(lines)
+
+    def format_run_summary(self, summary: dict) -> str:
+        """Format run-level metrics appended after the results"""
+        lines = []
+        c = self.c
+
+        pipeline = summary.get("pipeline")
+        if pipeline:
+            lines.extend(
+                [
+                    "",
+                    f"  {c.BRIGHT}Pipeline{c.RESET} {c.GRAY}({pipeline['wall_ms']:.0f}ms wall){c.RESET}",
+                    f"  {c.BRIGHT}{'Stage':<10} {'Workers':>8} {'Done':>6} {'Avg ms':>8} "
+                    f"{'Wait ms':>8} {'Depth':>6} {'Util':>7}{c.RESET}",
+                    f"  {c.GRAY}{'─' * 60}{c.RESET}",
+                ]
+            )
+            for name, stage in pipeline["stages"].items():
+                lines.append(
+                    f"  {name:<10} {stage['workers']:>8} {stage['processed']:>6} "
+                    f"{stage['avg_service_ms']:>8.1f} {stage['avg_queue_wait_ms']:>8.1f} "
+                    f"{stage['max_queue_depth']:>6} {stage['utilization']:>6.1f}%"
+                )
+            lines.append("")
+
+        runtime = summary.get("runtime")
+        if runtime:
+            lag = runtime["loop_lag_ms"]
+            wait = runtime["semaphore_wait_ms"]
+            lines.extend(
+                [
+                    "",
+                    f"  {c.BRIGHT}Runtime{c.RESET} {c.GRAY}({runtime['samples']} samples "
+                    f"every {runtime['interval_ms']:.0f}ms){c.RESET}",
+                ]
+            )
+            if lag["max"] is not None:
+                lines.append(
+                    f"  Loop lag:          p50 {lag['p50']:.1f}ms  p99 {lag['p99']:.1f}ms  "
+                    f"max {lag['max']:.1f}ms"
+                )
+            if wait["max"] is not None:
+                lines.append(
+                    f"  Worker wait:       p50 {wait['p50']:.1f}ms  p99 {wait['p99']:.1f}ms  "
+                    f"max {wait['max']:.1f}ms"
+                )
+            for name, load in runtime["executors"].items():
+                label = name.replace("_", " ").capitalize() + ":"
+                lines.append(
+                    f"  {label:<18}{load['max_busy']}/{load['threads']} busy, "
+                    f"max {load['max_queued']} queued"
+                )
+            if runtime["in_flight"]:
+                peaks = ", ".join(
+                    f"{stage} {load['max']}" for stage, load in runtime["in_flight"].items()
+                )
+                lines.append(f"  Peak in flight:    {peaks}")
+            if runtime["open_sockets"]:
+                lines.append(f"  Open sockets:      max {runtime['open_sockets']['max']}")
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def _format_certificates(self, index: CertificateIndex) -> str:
+        """Format certificate inventory, soonest expiry first"""
+        lines = []
+        c = self.c
+
+        selected = index.select(self.config.cert_expiring_days)
+
+        lines.extend(
+            [
+                "",
+                f"{c.MAGENTA}╔════════════════════════════════════════════════════════════╗{c.RESET}",
+                f"{c.MAGENTA}║{c.RESET}  {c.BOLD_MAGENTA}🔐 Certificate Inventory{c.RESET}{c.MAGENTA}                            ║{c.RESET}",
+                f"{c.MAGENTA}╚════════════════════════════════════════════════════════════╝{c.RESET}",
+                "",
+                f"  {c.BRIGHT}Handshakes:{c.RESET}   {index.handshakes}",
+                f"  {c.BRIGHT}Unique certs:{c.RESET} {len(index)}",
+                f"  {c.BRIGHT}Errors:{c.RESET}       {len(index.errors)}",
+                "",
+            ]
+        )
+
+        if self.config.cert_group_by:
+            groups = (
+                index.group_by_san()
+                if self.config.cert_group_by == "san"
+                else index.group_by_issuer()
+            )
+            wanted = {info.fingerprint for info in selected}
+            for key, infos in groups.items():
+                infos = [info for info in infos if info.fingerprint in wanted]
+                if not infos:
+                    continue
+                lines.append(f"{c.CYAN}▶ {key}{c.RESET} ({len(infos)})")
+                for info in infos:
+                    lines.append("  " + self._format_certificate_line(info))
+                lines.append("")
+        else:
+            lines.append(
+                f"  {c.BRIGHT}{'Days':>6}  {'Common Name':<32} {'Issuer':<20} {'Hosts'}{c.RESET}"
+            )
+            lines.append(f"  {c.GRAY}{'─' * 70}{c.RESET}")
+            for info in selected:
+                lines.append(self._format_certificate_line(info))
+            lines.append("")
+
+        if index.errors and self.config.verbose >= 1:
+            lines.append(f"{c.RED}Handshake errors:{c.RESET}")
+            for host, error in index.errors.items():
+                lines.append(f"  {c.RED}✗{c.RESET} {host}: {error}")
+            lines.append("")
+
+        return "\n".join(lines)
+
+    def _format_certificate_line(self, info) -> str:
+        """Format one certificate row"""
+        c = self.c
+        days = info.days_until_expiry()
+
+        if days < 0:
+            color = c.BOLD_RED
+        elif days < 30:
+            color = c.BOLD_YELLOW
+        else:
+            color = c.GREEN
+
+        hosts = ", ".join(itertools.islice(info.hosts, 3))
+        if len(info.hosts) > 3:
+            hosts += f" +{len(info.hosts) - 3} more"
+
+        return (
+            f"  {color}{days:>6}{c.RESET}  {info.common_name[:32]:<32} "
+            f"{info.issuer_name[:20]:<20} {c.GRAY}{hosts}{c.RESET}"
+        )
+
     def _format_check_line(self, check, indent: bool = False) -> str:
         """Format a single check line"""
         c = self.c
@@ -267,6 +664,38 @@ class TerminalFormatter:
 
         return line
 
+    def _format_tls_matrix(self, result: TargetResult) -> List[str]:
+        """Format the deep-mode protocol/cipher matrix"""
+        tls = result.get_check("TLS")
+        if not tls or "tls_matrix" not in tls.metadata:
+            return []
+
+        lines = []
+        c = self.c
+        matrix = tls.metadata["tls_matrix"]
+        rating_colors = {
+            "strong": c.GREEN,
+            "good": c.GREEN,
+            "weak": c.YELLOW,
+            "insecure": c.RED,
+        }
+
+        lines.append(
+            f"  {c.BRIGHT}TLS matrix{c.RESET} (grade {c.BOLD_CYAN}{matrix['grade']}{c.RESET}, "
+            f"{matrix['probes']} probes)"
+        )
+        for version, entry in matrix["versions"].items():
+            if not entry["accepted"]:
+                lines.append(f"    {c.GRAY}⊘ {version:<8} not accepted{c.RESET}")
+                continue
+            lines.append(f"    {c.GREEN}✓{c.RESET} {version:<8} {entry['rating']}")
+            for cipher, rating in entry["ciphers"].items():
+                color = rating_colors.get(rating, "")
+                lines.append(f"        {cipher:<40} {color}{rating}{c.RESET}")
+        lines.append("")
+
+        return lines
+
     def _format_summary(self, result: TargetResult) -> List[str]:
         """Format summary box"""
         lines = []
@@ -0,0 +1,256 @@
+"""Mergeable relative-error quantile sketch (DDSketch)
+
+Values are counted in logarithmic buckets: bucket k holds
+(gamma^(k-1), gamma^k] with gamma = (1 + a) / (1 - a), so every quantile
+is answered within relative error a of a real sample, in memory that
+grows with log(max / min) rather than with the number of samples.
+Sketches with the same accuracy merge exactly, which is what lets
+worker processes and time windows be combined after the fact.
+
+Masson, Rim, Lee, "DDSketch: A Fast and Fully-Mergeable Quantile Sketch
+with Relative-Error Guarantees", VLDB 2019.
+"""
+
+import math
+import struct
+import sys
+from array import array
+from typing import Dict, Optional
+
+
+# Values at or below this (ms) are counted in the zero bucket
+MIN_VALUE = 1e-9
+
+DEFAULT_ACCURACY = 0.01
+DEFAULT_MAX_BINS = 2048
+
+# to_bytes header: accuracy, count, sum, sumsq, min, max, zero, offset;
+# little-endian uint32 bucket counts follow
+_HEADER = struct.Struct("<dQddddQi")
+
+
+class DDSketch:
+    """Quantile sketch with relative accuracy a over non-negative values
+
+    At most max_bins consecutive buckets are kept; when the range grows
+    past that the lowest buckets are collapsed into one, which only
+    affects accuracy for the smallest values.
+    """
+
+    __slots__ = (
+        "relative_accuracy",
+        "max_bins",
+        "count",
+        "sum",
+        "sumsq",
+        "min",
+        "max",
+        "zero",
+        "bins",
+        "_gamma",
+        "_log_gamma",
+        "_low",
+        "_high",
+    )
+
+    def __init__(
+        self, relative_accuracy: float = DEFAULT_ACCURACY, max_bins: int = DEFAULT_MAX_BINS
+    ):
+        if not 0 < relative_accuracy < 1:
+            raise ValueError("relative_accuracy must be between 0 and 1")
+        self.relative_accuracy = relative_accuracy
+        self.max_bins = max_bins
+        self.count = 0
+        self.sum = 0.0
+        self.sumsq = 0.0
+        self.min = math.inf
+        self.max = -math.inf
+        self.zero = 0
+        self.bins: Dict[int, int] = {}
+        self._gamma = (1 + relative_accuracy) / (1 - relative_accuracy)
+        self._log_gamma = math.log(self._gamma)
+        self._low: Optional[int] = None  # lowest and highest bucket keys
+        self._high: Optional[int] = None
+
+    def _key(self, value: float) -> int:
+        return math.ceil(math.log(value) / self._log_gamma)
+
+    def _value(self, key: int) -> float:
+        """Estimate for bucket key, within relative_accuracy of its values"""
+        return 2 * self._gamma ** key / (self._gamma + 1)
+
+    def _insert(self, key: int, weight: int) -> None:
+        bins = self.bins
+        if self._low is None:
+            self._low = self._high = key
+        elif key < self._low:
+            # Below a collapsed floor, or a new lowest bucket
+            if self._high - key >= self.max_bins:
+                key = self._low
+            else:
+                self._low = key
+        elif key > self._high:
+            self._high = key
+            if key - self._low >= self.max_bins:
+                self._collapse(key - self.max_bins + 1)
+        bins[key] = bins.get(key, 0) + weight
+
+    def _collapse(self, floor: int) -> None:
+        """Fold every bucket below floor into floor"""
+        folded = 0
+        for key in [k for k in self.bins if k < floor]:
+            folded += self.bins.pop(key)
+        if folded:
+            self.bins[floor] = self.bins.get(floor, 0) + folded
+        self._low = floor
+
+    def add(self, value: float, weight: int = 1) -> None:
+        """Count value weight times"""
+        self.count += weight
+        self.sum += value * weight
+        self.sumsq += value * value * weight
+        if value < self.min:
+            self.min = value
+        if value > self.max:
+            self.max = value
+        if value <= MIN_VALUE:
+            self.zero += weight
+        else:
+            self._insert(self._key(value), weight)
+
+    def merge(self, other: "DDSketch") -> None:
+        """Add every value counted by other (same relative accuracy)"""
+        if other.relative_accuracy != self.relative_accuracy:
+            raise ValueError("Cannot merge sketches with different relative accuracy")
+        if not other.count:
+            return
+        self.count += other.count
+        self.sum += other.sum
+        self.sumsq += other.sumsq
+        self.min = min(self.min, other.min)
+        self.max = max(self.max, other.max)
+        self.zero += other.zero
+        if not other.bins:
+            return
+        if self._low is None or (
+            max(self._high, other._high) - min(self._low, other._low) < self.max_bins
+        ):
+            # Combined range fits: plain bucket sums, nothing to collapse
+            bins = self.bins
+            for key, weight in other.bins.items():
+                bins[key] = bins.get(key, 0) + weight
+            self._low = other._low if self._low is None else min(self._low, other._low)
+            self._high = other._high if self._high is None else max(self._high, other._high)
+            return
+        # Highest buckets first, so collapsing never has to undo an insert
+        for key in sorted(other.bins, reverse=True):
+            self._insert(key, other.bins[key])
+
+    def quantile(self, q: float) -> Optional[float]:
+        """Value at percentile q (0-100), None for an empty sketch"""
+        if not self.count:
+            return None
+        # The extremes are tracked exactly
+        if q <= 0:
+            return self.min
+        if q >= 100:
+            return self.max
+        rank = (self.count - 1) * q / 100.0
+        seen = self.zero
+        if rank < seen:
+            return max(self.min, 0.0)
+        for key in sorted(self.bins):
+            seen += self.bins[key]
+            if rank < seen:
+                return min(max(self._value(key), self.min), self.max)
+        return self.max
+
+    @property
+    def mean(self) -> Optional[float]:
+        return self.sum / self.count if self.count else None
+
+    def buckets(self):
+        """(estimate, count) for every non-empty bucket, ascending"""
+        if self.zero:
+            yield max(self.min, 0.0), self.zero
+        for key in sorted(self.bins):
+            yield min(max(self._value(key), self.min), self.max), self.bins[key]
+
+    def to_dict(self) -> dict:
+        """Compact form: bucket counts as one dense list from offset"""
+        data = {
+            "accuracy": self.relative_accuracy,
+            "count": self.count,
+            "sum": self.sum,
+            "sumsq": self.sumsq,
+            "min": self.min if self.count else None,
+            "max": self.max if self.count else None,
+            "zero": self.zero,
+            "offset": self._low,
+            "bins": [],
+        }
+        if self.bins:
+            data["bins"] = [self.bins.get(k, 0) for k in range(self._low, self._high + 1)]
+        return data
+
+    @classmethod
+    def from_dict(cls, data: dict, max_bins: int = DEFAULT_MAX_BINS) -> "DDSketch":
+        """Rebuild a sketch serialized with to_dict"""
+        sketch = cls(data["accuracy"], max_bins)
+        sketch.count = data["count"]
+        sketch.sum = data["sum"]
+        sketch.sumsq = data["sumsq"]
+        if sketch.count:
+            sketch.min = data["min"]
+            sketch.max = data["max"]
+        sketch.zero = data["zero"]
+        offset = data.get("offset")
+        for i, weight in enumerate(data["bins"]):
+            if weight:
+                sketch._insert(offset + i, weight)
+        return sketch
+
+    def to_bytes(self) -> bytes:
+        """Binary form of to_dict: fixed header plus uint32 bucket counts"""
+        bins = array("I")
+        if self.bins:
+            bins.extend(self.bins.get(k, 0) for k in range(self._low, self._high + 1))
+        header = _HEADER.pack(
+            self.relative_accuracy,
+            self.count,
+            self.sum,
+            self.sumsq,
+            self.min,
+            self.max,
+            self.zero,
+            self._low or 0,
+        )
+        if sys.byteorder == "big":
+            bins.byteswap()
+        return header + bins.tobytes()
+
+    @classmethod
+    def from_bytes(cls, data: bytes, max_bins: int = DEFAULT_MAX_BINS) -> "DDSketch":
+        """Rebuild a sketch serialized with to_bytes"""
+        accuracy, count, total, sumsq, low, high, zero, offset = _HEADER.unpack_from(data)
+        sketch = cls(accuracy, max_bins)
+        sketch.count = count
+        sketch.sum = total
+        sketch.sumsq = sumsq
+        sketch.min = low
+        sketch.max = high
+        sketch.zero = zero
+        bins = array("I")
+        bins.frombytes(data[_HEADER.size :])
+        if sys.byteorder == "big":
+            bins.byteswap()
+        if len(bins) > max_bins:
+            for i, weight in enumerate(bins):
+                if weight:
+                    sketch._insert(offset + i, weight)
+        elif bins:
+            # Already within max_bins: no collapsing to check per bucket
+            sketch.bins = {offset + i: weight for i, weight in enumerate(bins) if weight}
+            sketch._low = offset
+            sketch._high = offset + len(bins) - 1
+        return sketch
@@ -0,0 +1,338 @@
+"""Small statistics helpers shared by benchmark-style modes"""
+
+import itertools
+import math
+import random
+from array import array
+from bisect import bisect_left, bisect_right
+from dataclasses import dataclass, field
+from statistics import NormalDist
+from typing import List, Optional, Sequence, Tuple
+
+from .sketch import DDSketch
+
+
+def percentile(sorted_values: Sequence[float], q: float) -> Optional[float]:
+    """Linear-interpolated percentile of an already sorted sequence
+
+    q is in the 0-100 range. Returns None for an empty sequence.
+    """
+    if not sorted_values:
+        return None
+
+    rank = (len(sorted_values) - 1) * q / 100.0
+    low = math.floor(rank)
+    high = math.ceil(rank)
+    if low == high:
+        return float(sorted_values[int(rank)])
+
+    return sorted_values[low] + (sorted_values[high] - sorted_values[low]) * (rank - low)
+
+
+def mean(values: Sequence[float]) -> Optional[float]:
+    """Arithmetic mean, None for an empty sequence"""
+    if not values:
+        return None
+    return sum(values) / len(values)
+
+
+def mdev(values: Sequence[float]) -> Optional[float]:
+    """Population standard deviation (ping's 'mdev')"""
+    if not values:
+        return None
+    avg = sum(values) / len(values)
+    return math.sqrt(sum((v - avg) ** 2 for v in values) / len(values))
+
+
+# Above this many samples the mean's confidence interval comes from the
+# normal approximation instead of bootstrap resampling (resamples x n work)
+BOOTSTRAP_LIMIT = 10_000
+
+# Sample count past which BenchmarkResult stops keeping raw samples and
+# reports from its quantile sketches instead
+SKETCH_THRESHOLD = 10_000
+
+# Resampled values drawn per NumPy block, to bound bootstrap memory
+_BOOTSTRAP_BLOCK = 1 << 20
+
+
+@dataclass
+class SampleStats:
+    """Summary of one sample column (see describe())"""
+
+    count: int = 0
+    mean: Optional[float] = None
+    stddev: Optional[float] = None  # sample standard deviation (n - 1)
+    min: Optional[float] = None
+    max: Optional[float] = None
+    p50: Optional[float] = None
+    p90: Optional[float] = None
+    p99: Optional[float] = None
+    ci_low: Optional[float] = None  # confidence interval of the mean
+    ci_high: Optional[float] = None
+    confidence: float = 95.0
+    edges: List[float] = field(default_factory=list)  # histogram bin edges
+    counts: List[int] = field(default_factory=list)  # samples per bin
+
+    def to_dict(self, digits: int = 3) -> dict:
+        """Convert to dictionary, rounding values to digits"""
+
+        def r(value: Optional[float]) -> Optional[float]:
+            return round(value, digits) if value is not None else None
+
+        return {
+            "count": self.count,
+            "mean": r(self.mean),
+            "stddev": r(self.stddev),
+            "min": r(self.min),
+            "max": r(self.max),
+            "p50": r(self.p50),
+            "p90": r(self.p90),
+            "p99": r(self.p99),
+            "ci": [r(self.ci_low), r(self.ci_high)],
+            "confidence": self.confidence,
+            "histogram": {"edges": [r(e) for e in self.edges], "counts": self.counts},
+        }
+
+
+def _numpy():
+    try:
+        import numpy
+    except ImportError:
+        return None
+    return numpy
+
+
+def _normal_ci(mean: float, stddev: float, count: int, confidence: float) -> Tuple[float, float]:
+    z = NormalDist().inv_cdf(0.5 + confidence / 200.0)
+    half = z * stddev / math.sqrt(count)
+    return mean - half, mean + half
+
+
+def _histogram_range(low: float, high: float) -> Tuple[float, float]:
+    # A constant column gets a unit-wide range, as numpy.histogram does
+    if low == high:
+        return low - 0.5, high + 0.5
+    return low, high
+
+
+def _describe_numpy(
+    numpy, values: Sequence[float], bins: int, confidence: float, resamples: int, seed: int
+) -> SampleStats:
+    if isinstance(values, array) and values.typecode == "d":
+        data = numpy.frombuffer(values, dtype=numpy.float64)  # no copy
+    else:
+        data = numpy.asarray(values, dtype=numpy.float64)
+    count = data.size
+
+    mean = float(data.mean())
+    stddev = float(data.std(ddof=1)) if count > 1 else 0.0
+    p50, p90, p99 = (float(p) for p in numpy.percentile(data, (50, 90, 99)))
+    counts, edges = numpy.histogram(
+        data, bins=bins, range=_histogram_range(float(data.min()), float(data.max()))
+    )
+
+    if count > BOOTSTRAP_LIMIT:
+        ci = _normal_ci(mean, stddev, count, confidence)
+    else:
+        rng = numpy.random.default_rng(seed)
+        means = numpy.empty(resamples)
+        block = max(1, _BOOTSTRAP_BLOCK // count)
+        for start in range(0, resamples, block):
+            rows = min(block, resamples - start)
+            picks = data[rng.integers(0, count, size=(rows, count))]
+            means[start : start + rows] = picks.mean(axis=1)
+        tail = (100.0 - confidence) / 2
+        ci = tuple(float(v) for v in numpy.percentile(means, (tail, 100.0 - tail)))
+
+    return SampleStats(
+        count=count,
+        mean=mean,
+        stddev=stddev,
+        min=float(data.min()),
+        max=float(data.max()),
+        p50=p50,
+        p90=p90,
+        p99=p99,
+        ci_low=ci[0],
+        ci_high=ci[1],
+        confidence=confidence,
+        edges=[float(e) for e in edges],
+        counts=[int(c) for c in counts],
+    )
+
+
+def _describe_python(
+    values: Sequence[float], bins: int, confidence: float, resamples: int, seed: int
+) -> SampleStats:
+    ordered = sorted(values)
+    count = len(ordered)
+
+    avg = math.fsum(ordered) / count
+    stddev = (
+        math.sqrt(math.fsum((v - avg) ** 2 for v in ordered) / (count - 1)) if count > 1 else 0.0
+    )
+
+    low, high = _histogram_range(ordered[0], ordered[-1])
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value in ordered:
+        counts[min(int((value - low) / width), bins - 1)] += 1
+    edges = [low + i * width for i in range(bins)] + [high]
+
+    if count > BOOTSTRAP_LIMIT:
+        ci = _normal_ci(avg, stddev, count, confidence)
+    else:
+        rng = random.Random(seed)
+        means = sorted(math.fsum(rng.choices(ordered, k=count)) / count for _ in range(resamples))
+        tail = (100.0 - confidence) / 2
+        ci = (percentile(means, tail), percentile(means, 100.0 - tail))
+
+    return SampleStats(
+        count=count,
+        mean=avg,
+        stddev=stddev,
+        min=ordered[0],
+        max=ordered[-1],
+        p50=percentile(ordered, 50),
+        p90=percentile(ordered, 90),
+        p99=percentile(ordered, 99),
+        ci_low=ci[0],
+        ci_high=ci[1],
+        confidence=confidence,
+        edges=edges,
+        counts=counts,
+    )
+
+
+def describe(
+    values: Sequence[float],
+    bins: int = 10,
+    confidence: float = 95.0,
+    resamples: int = 1000,
+    seed: int = 0,
+    use_numpy: Optional[bool] = None,
+) -> SampleStats:
+    """Mean, stddev, percentiles, histogram and a bootstrap CI of the mean
+
+    Uses NumPy when it is installed (an array('d') column is read in place,
+    without copying) and a pure-Python path otherwise; use_numpy forces
+    either. The bootstrap is seeded, so repeated calls agree; columns over
+    BOOTSTRAP_LIMIT samples use the normal approximation instead.
+    """
+    if not len(values):
+        return SampleStats(confidence=confidence)
+
+    numpy = _numpy() if use_numpy is not False else None
+    if use_numpy and numpy is None:
+        raise ValueError("NumPy is not installed")
+    if numpy is not None:
+        return _describe_numpy(numpy, values, bins, confidence, resamples, seed)
+    return _describe_python(values, bins, confidence, resamples, seed)
+
+
+def describe_sketch(sketch: DDSketch, bins: int = 10, confidence: float = 95.0) -> SampleStats:
+    """describe() for values only known through a quantile sketch
+
+    Percentiles are within the sketch's relative accuracy; mean, stddev,
+    min and max are exact, and the confidence interval is the normal
+    approximation.
+    """
+    count = sketch.count
+    if not count:
+        return SampleStats(confidence=confidence)
+
+    avg = sketch.sum / count
+    variance = (sketch.sumsq - count * avg * avg) / (count - 1) if count > 1 else 0.0
+    stddev = math.sqrt(max(variance, 0.0))
+    ci = _normal_ci(avg, stddev, count, confidence)
+
+    low, high = _histogram_range(sketch.min, sketch.max)
+    width = (high - low) / bins
+    counts = [0] * bins
+    for value, weight in sketch.buckets():
+        counts[min(max(int((value - low) / width), 0), bins - 1)] += weight
+    edges = [low + i * width for i in range(bins)] + [high]
+
+    return SampleStats(
+        count=count,
+        mean=avg,
+        stddev=stddev,
+        min=sketch.min,
+        max=sketch.max,
+        p50=sketch.quantile(50),
+        p90=sketch.quantile(90),
+        p99=sketch.quantile(99),
+        ci_low=ci[0],
+        ci_high=ci[1],
+        confidence=confidence,
+        edges=edges,
+        counts=counts,
+    )
+
+
+def _mann_whitney_numpy(
+    numpy, baseline: Sequence[float], current: Sequence[float]
+) -> Tuple[float, float]:
+    def column(values):
+        if isinstance(values, array) and values.typecode == "d":
+            return numpy.frombuffer(values, dtype=numpy.float64)
+        return numpy.asarray(values, dtype=numpy.float64)
+
+    ordered = numpy.sort(column(baseline))
+    values = column(current)
+    low = numpy.searchsorted(ordered, values, "left")
+    high = numpy.searchsorted(ordered, values, "right")
+    u = float(low.sum() + (high - low).sum() / 2)
+
+    _, runs = numpy.unique(numpy.concatenate((ordered, values)), return_counts=True)
+    runs = runs.astype(numpy.float64)
+    return u, float((runs ** 3 - runs).sum())
+
+
+def _mann_whitney_python(
+    baseline: Sequence[float], current: Sequence[float]
+) -> Tuple[float, float]:
+    ordered = sorted(baseline)
+    u = 0.0
+    for value in current:
+        low = bisect_left(ordered, value)
+        u += low + (bisect_right(ordered, value, low) - low) / 2
+
+    ties = 0.0
+    for _, run in itertools.groupby(sorted(itertools.chain(ordered, current))):
+        t = sum(1 for _ in run)
+        ties += t ** 3 - t
+    return u, ties
+
+
+def mann_whitney_u(
+    baseline: Sequence[float], current: Sequence[float], use_numpy: Optional[bool] = None
+) -> Tuple[float, float]:
+    """Mann-Whitney U of current against baseline, with a one-sided p-value
+
+    U counts the (baseline, current) pairs where the current value is the
+    larger one, ties counting half. p is the chance of a U at least this
+    large if both came from the same distribution, so a small p means
+    current is slower. Normal approximation with tie and continuity
+    correction (sound from about 8 samples a side); p is 1.0 when either
+    side is empty or every value is equal. NumPy is used as in describe().
+    """
+    n1, n2 = len(baseline), len(current)
+    if not n1 or not n2:
+        return 0.0, 1.0
+
+    numpy = _numpy() if use_numpy is not False else None
+    if use_numpy and numpy is None:
+        raise ValueError("NumPy is not installed")
+    if numpy is not None:
+        u, ties = _mann_whitney_numpy(numpy, baseline, current)
+    else:
+        u, ties = _mann_whitney_python(baseline, current)
+
+    n = n1 + n2
+    variance = n1 * n2 / 12.0 * ((n + 1) - ties / (n * (n - 1)))
+    if variance <= 0:
+        return u, 1.0
+    z = (u - n1 * n2 / 2.0 - 0.5) / math.sqrt(variance)
+    return u, 0.5 * math.erfc(z / math.sqrt(2))
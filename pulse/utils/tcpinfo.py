@@ -0,0 +1,69 @@
+"""Kernel TCP_INFO metrics for connected sockets (Linux)"""
+
+import os
+import socket
+import struct
+import sys
+from typing import Optional
+
+
+# Leading part of Linux struct tcp_info (include/uapi/linux/tcp.h) up to
+# tcpi_delivery_rate: 8 u8, 24 u32, 4 u64, 6 u32, 1 u64
+_TCP_INFO = struct.Struct("=8B24I4Q6IQ")
+
+# Field positions within the unpacked tuple
+_LOST = 14
+_PMTU = 21
+_RTT = 23
+_RTTVAR = 24
+_SND_CWND = 26
+_TOTAL_RETRANS = 31
+_DELIVERY_RATE = 42
+
+# Older kernels return a shorter struct; everything up to total_retrans
+# has been there since 2.6
+_MIN_LENGTH = 8 + 24 * 4
+
+
+def read_tcp_info(sock: socket.socket) -> Optional[dict]:
+    """Decode TCP_INFO for a connected socket
+
+    Returns rtt/rttvar in milliseconds, retransmits (total for the
+    connection), lost, cwnd (segments), pmtu (bytes) and delivery_rate
+    (bytes/s, None on kernels without it). Returns None when the platform
+    has no TCP_INFO or the socket cannot be queried.
+    """
+    option = getattr(socket, "TCP_INFO", None)
+    if option is None or not sys.platform.startswith("linux"):
+        return None
+
+    try:
+        raw = sock.getsockopt(socket.IPPROTO_TCP, option, _TCP_INFO.size)
+    except (OSError, ValueError):
+        return None
+    if len(raw) < _MIN_LENGTH:
+        return None
+
+    # Zero-pad so older kernels decode with the same layout
+    fields = _TCP_INFO.unpack(raw.ljust(_TCP_INFO.size, b"\0"))
+    return {
+        "rtt_ms": fields[_RTT] / 1000,
+        "rttvar_ms": fields[_RTTVAR] / 1000,
+        "retransmits": fields[_TOTAL_RETRANS],
+        "lost": fields[_LOST],
+        "cwnd": fields[_SND_CWND],
+        "pmtu": fields[_PMTU],
+        "delivery_rate": fields[_DELIVERY_RATE] if len(raw) >= _TCP_INFO.size else None,
+    }
+
+
+def probe_socket(sock) -> Optional[socket.socket]:
+    """Plain socket on a duplicate of sock's descriptor
+
+    Lets TCP_INFO be read from wrapped (TLS) sockets, and after the owner
+    has closed its socket object, until the probe itself is closed.
+    """
+    try:
+        return socket.socket(fileno=os.dup(sock.fileno()))
+    except (OSError, AttributeError, ValueError):
+        return None
@@ -0,0 +1,121 @@
+"""Kernel software TX/RX timestamps via SO_TIMESTAMPING (Linux)
+
+Timestamps are taken by the kernel when a segment is handed to the driver
+(TX) or arrives in the stack (RX), so deltas between them exclude thread
+wakeup and event-loop scheduling delay in pulse itself.
+"""
+
+import select
+import socket
+import struct
+import sys
+import time
+from typing import List, Optional, Tuple
+
+
+# Not exported by the socket module; the value is the same on all
+# mainstream Linux architectures
+SO_TIMESTAMPING = getattr(socket, "SO_TIMESTAMPING", 37)
+
+SOF_TIMESTAMPING_TX_SOFTWARE = 1 << 1
+SOF_TIMESTAMPING_RX_SOFTWARE = 1 << 3
+SOF_TIMESTAMPING_SOFTWARE = 1 << 4
+SOF_TIMESTAMPING_OPT_TSONLY = 1 << 11
+
+_FLAGS = (
+    SOF_TIMESTAMPING_TX_SOFTWARE
+    | SOF_TIMESTAMPING_RX_SOFTWARE
+    | SOF_TIMESTAMPING_SOFTWARE
+    | SOF_TIMESTAMPING_OPT_TSONLY
+)
+
+# struct scm_timestamping: three timespecs, software stamp first
+_TIMESPEC = struct.Struct("@qq")
+_ANCILLARY_SIZE = 512
+
+
+def supported() -> bool:
+    """Whether this platform can provide kernel socket timestamps"""
+    return sys.platform.startswith("linux") and hasattr(socket.socket, "recvmsg")
+
+
+def enable(sock: socket.socket) -> bool:
+    """Turn on software TX/RX timestamping for sock, False if unavailable"""
+    if not supported():
+        return False
+    try:
+        sock.setsockopt(socket.SOL_SOCKET, SO_TIMESTAMPING, _FLAGS)
+    except OSError:
+        return False
+    return True
+
+
+def _decode(ancdata) -> Optional[float]:
+    """Software timestamp (epoch seconds) from recvmsg ancillary data"""
+    for level, kind, data in ancdata:
+        if level == socket.SOL_SOCKET and kind == SO_TIMESTAMPING and len(data) >= 16:
+            seconds, nanoseconds = _TIMESPEC.unpack_from(data)
+            if seconds or nanoseconds:
+                return seconds + nanoseconds / 1e9
+    return None
+
+
+def recv_stamped(
+    sock: socket.socket, bufsize: int, flags: int = 0
+) -> Tuple[bytes, Optional[float]]:
+    """recv() that also returns the kernel RX timestamp of the data"""
+    data, ancdata, _, _ = sock.recvmsg(bufsize, _ANCILLARY_SIZE, flags)
+    return data, _decode(ancdata)
+
+
+def peek_rx_timestamp(sock: socket.socket) -> Optional[float]:
+    """Wait for the next incoming bytes and return their RX timestamp
+
+    The data stays queued for the socket's normal reader.
+    """
+    return recv_stamped(sock, 1, socket.MSG_PEEK)[1]
+
+
+def tx_timestamps(sock: socket.socket, timeout: float = 0.1) -> List[float]:
+    """Drain TX timestamps for earlier sends from the socket error queue
+
+    One stamp per send call, oldest first. Waits up to timeout for the
+    first one, since the kernel reports them asynchronously.
+    """
+    # A socket timeout would make recvmsg wait for POLLIN, which the
+    # error queue never signals
+    previous = sock.gettimeout()
+    sock.setblocking(False)
+    try:
+        return _drain_error_queue(sock, timeout)
+    finally:
+        sock.settimeout(previous)
+
+
+def _drain_error_queue(sock: socket.socket, timeout: float) -> List[float]:
+    stamps: List[float] = []
+    poller = select.poll()
+    poller.register(sock, select.POLLERR)
+    deadline = time.monotonic() + timeout
+
+    while True:
+        try:
+            _, ancdata, _, _ = sock.recvmsg(
+                1, _ANCILLARY_SIZE, socket.MSG_ERRQUEUE | socket.MSG_DONTWAIT
+            )
+        except (BlockingIOError, InterruptedError):
+            if stamps:
+                return stamps
+            remaining = deadline - time.monotonic()
+            if remaining <= 0:
+                return stamps
+            events = poller.poll(remaining * 1000)
+            if not any(mask & select.POLLERR for _, mask in events):
+                return stamps
+            continue
+        except OSError:
+            return stamps
+
+        stamp = _decode(ancdata)
+        if stamp is not None:
+            stamps.append(stamp)
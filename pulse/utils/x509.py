@@ -0,0 +1,191 @@
+"""Minimal DER/X.509 certificate parsing
+
+The stdlib ``ssl`` module only decodes peer certificates that passed
+verification, so handshake-only inventory needs its own reader. Only the
+fields pulse reports are decoded: subject, issuer, validity, serial and
+subjectAltName.
+"""
+
+import calendar
+import hashlib
+from typing import Dict, List, Tuple
+
+
+# Attribute type OIDs mapped to the names used by ssl.getpeercert()
+NAME_OIDS = {
+    "2.5.4.3": "commonName",
+    "2.5.4.5": "serialNumber",
+    "2.5.4.6": "countryName",
+    "2.5.4.7": "localityName",
+    "2.5.4.8": "stateOrProvinceName",
+    "2.5.4.10": "organizationName",
+    "2.5.4.11": "organizationalUnitName",
+}
+
+OID_SUBJECT_ALT_NAME = "2.5.29.17"
+
+
+class CertificateParseError(ValueError):
+    """Raised when a DER certificate cannot be decoded"""
+
+
+def _read_tlv(data: bytes, pos: int) -> Tuple[int, int, int]:
+    """Read a DER TLV at pos, return (tag, value_start, value_end)"""
+    if pos + 2 > len(data):
+        raise CertificateParseError("Truncated DER element")
+
+    tag = data[pos]
+    length = data[pos + 1]
+    pos += 2
+
+    if length & 0x80:
+        num_bytes = length & 0x7F
+        if num_bytes == 0 or pos + num_bytes > len(data):
+            raise CertificateParseError("Invalid DER length")
+        length = int.from_bytes(data[pos : pos + num_bytes], "big")
+        pos += num_bytes
+
+    end = pos + length
+    if end > len(data):
+        raise CertificateParseError("DER element exceeds buffer")
+
+    return tag, pos, end
+
+
+def _children(data: bytes, start: int, end: int) -> List[Tuple[int, int, int]]:
+    """List the TLVs contained in data[start:end]"""
+    items = []
+    pos = start
+    while pos < end:
+        tag, value_start, value_end = _read_tlv(data, pos)
+        items.append((tag, value_start, value_end))
+        pos = value_end
+    return items
+
+
+def _decode_oid(value: bytes) -> str:
+    """Decode an OBJECT IDENTIFIER value"""
+    if not value:
+        return ""
+
+    parts = [value[0] // 40, value[0] % 40]
+    current = 0
+    for byte in value[1:]:
+        current = (current << 7) | (byte & 0x7F)
+        if not byte & 0x80:
+            parts.append(current)
+            current = 0
+
+    return ".".join(str(p) for p in parts)
+
+
+def _decode_string(tag: int, value: bytes) -> str:
+    """Decode one of the ASN.1 string types used in names"""
+    if tag == 0x1E:  # BMPString
+        return value.decode("utf-16-be", errors="replace")
+    if tag == 0x0C:  # UTF8String
+        return value.decode("utf-8", errors="replace")
+    return value.decode("latin-1")
+
+
+def _decode_time(tag: int, value: bytes) -> float:
+    """Decode UTCTime/GeneralizedTime into a UTC epoch timestamp"""
+    text = value.decode("ascii").rstrip("Z")
+
+    if tag == 0x17:  # UTCTime: YYMMDDHHMM[SS]
+        year = int(text[:2])
+        year += 1900 if year >= 50 else 2000
+        rest = text[2:]
+    elif tag == 0x18:  # GeneralizedTime: YYYYMMDDHHMM[SS]
+        year = int(text[:4])
+        rest = text[4:]
+    else:
+        raise CertificateParseError(f"Unexpected time tag 0x{tag:02x}")
+
+    rest = rest.split(".")[0]
+    month, day, hour, minute = (int(rest[i : i + 2]) for i in (0, 2, 4, 6))
+    second = int(rest[8:10]) if len(rest) >= 10 else 0
+
+    return float(calendar.timegm((year, month, day, hour, minute, second)))
+
+
+def _decode_name(data: bytes, start: int, end: int) -> Dict[str, str]:
+    """Decode an X.501 Name into {attribute: value}"""
+    name: Dict[str, str] = {}
+    for _, set_start, set_end in _children(data, start, end):
+        for _, seq_start, seq_end in _children(data, set_start, set_end):
+            attrs = _children(data, seq_start, seq_end)
+            if len(attrs) < 2:
+                continue
+            _, oid_start, oid_end = attrs[0]
+            value_tag, value_start, value_end = attrs[1]
+            oid = _decode_oid(data[oid_start:oid_end])
+            key = NAME_OIDS.get(oid, oid)
+            name[key] = _decode_string(value_tag, data[value_start:value_end])
+    return name
+
+
+def _decode_san(value: bytes) -> List[str]:
+    """Decode the subjectAltName extension value"""
+    _, start, end = _read_tlv(value, 0)
+    names = []
+    for tag, item_start, item_end in _children(value, start, end):
+        raw = value[item_start:item_end]
+        if tag == 0x82:  # dNSName
+            names.append(raw.decode("ascii", errors="replace"))
+        elif tag == 0x87:  # iPAddress
+            if len(raw) == 4:
+                names.append(".".join(str(b) for b in raw))
+            elif len(raw) == 16:
+                names.append(":".join(raw[i : i + 2].hex() for i in range(0, 16, 2)))
+    return names
+
+
+def fingerprint(der: bytes) -> str:
+    """SHA-256 fingerprint of a DER certificate"""
+    return hashlib.sha256(der).hexdigest()
+
+
+def parse_certificate(der: bytes) -> dict:
+    """Parse a DER-encoded X.509 certificate"""
+    try:
+        _, cert_start, cert_end = _read_tlv(der, 0)
+        _, tbs_start, tbs_end = _children(der, cert_start, cert_end)[0]
+        fields = _children(der, tbs_start, tbs_end)
+
+        # Skip the explicit [0] version tag if present
+        if fields and fields[0][0] == 0xA0:
+            fields = fields[1:]
+
+        serial = der[fields[0][1] : fields[0][2]]
+        issuer = _decode_name(der, fields[2][1], fields[2][2])
+        validity = _children(der, fields[3][1], fields[3][2])
+        subject = _decode_name(der, fields[4][1], fields[4][2])
+
+        not_before = _decode_time(validity[0][0], der[validity[0][1] : validity[0][2]])
+        not_after = _decode_time(validity[1][0], der[validity[1][1] : validity[1][2]])
+
+        san: List[str] = []
+        for tag, start, end in fields[5:]:
+            if tag != 0xA3:  # extensions
+                continue
+            _, ext_start, ext_end = _read_tlv(der, start)
+            for _, item_start, item_end in _children(der, ext_start, ext_end):
+                parts = _children(der, item_start, item_end)
+                oid = _decode_oid(der[parts[0][1] : parts[0][2]])
+                if oid == OID_SUBJECT_ALT_NAME:
+                    _, value_start, value_end = parts[-1]
+                    san = _decode_san(der[value_start:value_end])
+    except CertificateParseError:
+        raise
+    except (IndexError, UnicodeDecodeError, ValueError) as e:
+        raise CertificateParseError(f"Malformed certificate: {e}") from e
+
+    return {
+        "subject": subject,
+        "issuer": issuer,
+        "serial": format(int.from_bytes(serial, "big"), "X"),
+        "not_before": not_before,
+        "not_after": not_after,
+        "san": san,
+    }